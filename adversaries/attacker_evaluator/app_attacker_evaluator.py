@@ -2,10 +2,11 @@
 import csv
 import os
 
+from glob import glob
+
 
 # Pip
 import typer
-import pandas as pd
 
 from matplotlib import pyplot as plt
 from rich.console import Console
@@ -14,11 +15,53 @@ from tqdm import tqdm
 
 # Custom
 from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    ARR_CONFIDENCE,
+    ARR_INTERVAL_METHOD,
+    CLASSIFIER,
+    CONTENT_BURST_SEED,
+    CV_WORKERS,
+    FEATURE_MODE,
+    GRID_LANGUAGES,
+    GRID_PROMPTS,
+    GRID_WORKERS,
+    LANGUAGE_CHOICES,
+    PARTIAL_FIT,
+    PREDICT_CHUNK_SIZE,
+    PREDICT_WORKERS,
+    PROMPT_CHOICES,
+    SERVE_HOST,
+    SERVE_PORT,
+)
 from adversaries.settings.constants.natural_order_group import NaturalOrderGroup
 from adversaries.settings.messages.message_keys import MessageKeys as Mk
 
 from adversaries.attacker_evaluator import scoring_functions as sf
-from adversaries.burst_attack.app_burst_attack import generate_content_burst
+from adversaries.attacker_evaluator.arr_grid import (
+    arr_training_file,
+    combo_fingerprint,
+    evaluate_arr_combo,
+    parse_grid_filter,
+    run_arr_grid,
+    select_arr_combos,
+)
+from adversaries.attacker_evaluator.arr_queue import (
+    ArrTaskQueue,
+    collect_queue_results,
+    run_local_queue_workers,
+)
+from adversaries.attacker_evaluator.results_store import ResultsStore
+from adversaries.attacker_evaluator.scoring_benchmark import benchmark_scoring_models
+from adversaries.attacker_evaluator.scoring_service import (
+    create_scoring_server,
+    load_scoring_service,
+)
+from adversaries.burst_attack.burst_tasks import burst_task
+from adversaries.burst_attack.content_burst_generator import (
+    ContentBurstGenerator as Cbg,
+    preload_prompt_nouns,
+)
+from adversaries.docs_processor.multilingual_spacy import warm_up_spacy_models
 from adversaries.settings.logger.basic_logger import (
     catch_and_log_info,
     catch_and_log_error,
@@ -26,8 +69,7 @@ from adversaries.settings.logger.basic_logger import (
 
 from adversaries.attacker_evaluator.arr_score_processor import (
     calculate_score_distribution,
-    find_tsv_files,
-    process_tsv_files,
+    process_scored_sentences,
     plot_score_distribution,
     save_results,
 )
@@ -75,6 +117,31 @@ def generate_singular_arr(
         general_keys.ECHO_SHORT.value,
         help=general_keys.ECHO_HELP.value,
     ),
+    save_burst_file: bool = typer.Option(
+        attk_keys.SAVE_BURST_FILE_DEFAULT.value,
+        attk_keys.SAVE_BURST_FILE_LONG.value,
+        help=attk_keys.SAVE_BURST_FILE_HELP.value,
+    ),
+    cv_workers: int = typer.Option(
+        CV_WORKERS,
+        attk_keys.CV_WORKERS_LONG.value,
+        help=attk_keys.CV_WORKERS_HELP.value,
+    ),
+    feature_mode: str = typer.Option(
+        FEATURE_MODE,
+        attk_keys.FEATURE_MODE_LONG.value,
+        help=attk_keys.FEATURE_MODE_HELP.value,
+    ),
+    classifier: str = typer.Option(
+        CLASSIFIER,
+        attk_keys.CLASSIFIER_LONG.value,
+        help=attk_keys.CLASSIFIER_HELP.value,
+    ),
+    partial_fit: bool = typer.Option(
+        PARTIAL_FIT,
+        attk_keys.PARTIAL_FIT_LONG.value,
+        help=attk_keys.PARTIAL_FIT_HELP.value,
+    ),
 ) -> None:
     """
     It generates the ARR for a specified language and prompt number
@@ -85,6 +152,11 @@ def generate_singular_arr(
         lang (str): The language in which the prompt is given.
         prompt_num (int): The number of the prompt to be used.
         echo_results (bool): Boolean indicating whether to echo the results.
+        save_burst_file (bool): Whether the bursts are also written to a TSV file.
+        cv_workers (int): The number of processes for the cross-validation folds.
+        feature_mode (str): The n-gram features of the scoring model.
+        classifier (str): The classifier of the scoring model.
+        partial_fit (bool): Whether the scoring model is fitted chunk by chunk.
 
     Returns:
         None
@@ -93,73 +165,38 @@ def generate_singular_arr(
 
     catch_and_log_info(custom_message=echo_msg, echo_msg=True)
 
-    # die Dateien orig300 und orig werden als 'en' behandelt.
-    english_file_variant = "en" in lang and lang != "en"
-
-    if english_file_variant:
-        content_burst_base_file = f"results/prompt_txt/Prompt{prompt_num}_en.txt"
-    else:
-        content_burst_base_file = f"results/prompt_txt/Prompt{prompt_num}_{lang}.txt"
-
-    training_prompt = f"resources/data/monolingual_ASAP_data_with_scores/ASAP_{lang}_prompt{prompt_num}.tsv"
-    adversarial = f"results/burst_attack_txt/Prompt{prompt_num}_{lang}_burst_result.tsv"
-
-    # Es wird nicht getestet, ob die Adversarial-datei exisitiert,
-    # da sie erst spaeter erzeugt wird
-
-    try:
-        if english_file_variant:
-            add_on = lang.replace("en_", "")
-
-            # Die orig300 und orig werden abgeschnitten damit Spacy nur "EN"
-            # also die Sprache waehlt.
-            lang = lang[:2]
-
-            generate_content_burst(
-                spacy_tagger_language=lang,  # check language,
-                file_name=content_burst_base_file,
-                extend_file_save_name=add_on,
-            )
-        else:
-            generate_content_burst(
-                file_name=content_burst_base_file,
-                spacy_tagger_language=lang,
-                extend_file_save_name="",
-            )
-
-    except Exception as e:
-
-        error_msg = (
-            f"Error: The combination lang: '{lang}' prompt_num: '{prompt_num}' is "
-            "is not valid. \nThe languages 'en, fr, de, es' and "
-            "prompt numbers '1, 2, 10' are valid."
-            "Or\n"
-            "There could be a problem with the encoding of the prompt files. "
-            "Please check them."
+    options = {
+        "save_burst_file": save_burst_file,
+        "cv_workers": cv_workers,
+        "feature_mode": feature_mode,
+        "classifier": classifier,
+        "partial_fit": partial_fit,
+    }
+    arr_data_results, cv_results = evaluate_arr_combo(lang, prompt_num, **options)
+    cross_valid_qwk = cv_results.get("QWK")
+
+    combo = (lang, int(prompt_num))
+    with ResultsStore() as results_store:
+        results_store.record_combo(
+            results_store.start_run(attk_keys.SINGULAR_ARR.value, options),
+            combo,
+            (arr_data_results, cross_valid_qwk),
+            fingerprint=combo_fingerprint(combo, options),
+            scores_file=sf.arr_sentences_file(arr_training_file(*combo)),
         )
-        catch_and_log_error(e, custom_message=error_msg, echo_msg=True,echo_traceback=True)
-        raise SystemExit()
 
-    # Hier wird jetzt ein Modell auf einem Prompt trainiert
-    # und dann auf die Adversarials angewendet
-    # Ganz wichtig: train_file und adversarial_file muessen sich auf den
-    # gleichen Datensatz + Prompt beziehen!
-    catch_and_log_info(custom_message=attk_keys.RATE_ATTACK.value, echo_msg=True)
-
-    swm_model = sf.construct_svm_scoring_model()
-    cross_valid_qwk = sf.cross_validation_qwk(swm_model, training_prompt)
-
-    y_pred, arr = sf.arr_for_trained_model(swm_model, training_prompt, adversarial)
-    PROMPT = os.path.basename(training_prompt).replace(".tsv", "")
-    METHOD = "CONTENT_BURST"
-
-    arr_data_results = {
-        "METHOD": METHOD,
-        "PROMPT": PROMPT,
-        "PROMPT_NUMBER": prompt_num,
-        "LANGUAGE": lang,
-        "ARR": arr,
-    }
+    fold_summary = ", ".join(
+        f"{qwk:.2f}/{fit:.2f}s/{predict:.2f}s"
+        for qwk, fit, predict in zip(
+            cv_results.get("FOLD_QWK"),
+            cv_results.get("FIT_TIME"),
+            cv_results.get("PREDICT_TIME"),
+        )
+    )
+    catch_and_log_info(
+        custom_message=f"{attk_keys.CROSS_VALIDATION_FOLDS.value} {fold_summary}",
+        echo_msg=echo_results,
+    )
 
     catch_and_log_info(custom_message=attk_keys.SAVE_ATTACK.value, echo_msg=True)
 
@@ -189,116 +226,579 @@ def generate_singular_arr(
     name=Mk.AttackerEvaluator.MULTI_ARR_NAME.value,
     help=Mk.AttackerEvaluator.MULTI_ARR_HELP.value,
 )
-def generate_multi_arr() -> None:
+def generate_multi_arr(
+    cv_workers: int = typer.Option(
+        CV_WORKERS,
+        attk_keys.CV_WORKERS_LONG.value,
+        help=attk_keys.CV_WORKERS_HELP.value,
+    ),
+    feature_mode: str = typer.Option(
+        FEATURE_MODE,
+        attk_keys.FEATURE_MODE_LONG.value,
+        help=attk_keys.FEATURE_MODE_HELP.value,
+    ),
+    classifier: str = typer.Option(
+        CLASSIFIER,
+        attk_keys.CLASSIFIER_LONG.value,
+        help=attk_keys.CLASSIFIER_HELP.value,
+    ),
+    partial_fit: bool = typer.Option(
+        PARTIAL_FIT,
+        attk_keys.PARTIAL_FIT_LONG.value,
+        help=attk_keys.PARTIAL_FIT_HELP.value,
+    ),
+    workers: int = typer.Option(
+        GRID_WORKERS,
+        attk_keys.GRID_WORKERS_LONG.value,
+        attk_keys.GRID_WORKERS_SHORT.value,
+        help=attk_keys.GRID_WORKERS_HELP.value,
+    ),
+    resume: bool = typer.Option(
+        False,
+        attk_keys.RESUME_LONG.value,
+        help=attk_keys.RESUME_HELP.value,
+    ),
+    languages: str = typer.Option(
+        GRID_LANGUAGES,
+        attk_keys.GRID_LANGUAGES_LONG.value,
+        help=attk_keys.GRID_LANGUAGES_HELP.value,
+    ),
+    prompts: str = typer.Option(
+        GRID_PROMPTS,
+        attk_keys.GRID_PROMPTS_LONG.value,
+        help=attk_keys.GRID_PROMPTS_HELP.value,
+    ),
+) -> None:
     """
     This generates the ARR for all the languages (en, es, fr, de) and saves the results.
 
+    :param cv_workers: The number of processes for the cross-validation folds.
+    :param feature_mode: The n-gram features of the scoring model.
+    :param classifier: The classifier of the scoring model.
+    :param partial_fit: Whether the scoring model is fitted chunk by chunk.
+    :param workers: The number of processes which evaluate the combinations.
+    :param resume: Skip the combinations with a checkpoint of the same inputs.
+    :param languages: Comma separated languages, empty for all discovered ones.
+    :param prompts: Comma separated prompt numbers, empty for all discovered ones.
     :return:
         None
     """
-    LANGUAGE_CHOICES = ["en", "en_orig300", "en_orig", "es", "fr", "de"]
-    #LANGUAGE_CHOICES = ["fr"]
-
-    PROMPT_CHOICES = [1, 2, 10]
+    # Die Kombinationen werden aus den vorhandenen Dateien ermittelt
+    combos = select_arr_combos(languages, prompts)
 
-    # Header fuer Ergebniss-Datei
-    ARR_HEADER = Gp.RESULT_ARR_HEADER.value
+    # Die SpaCy-Modelle nur einmal pro Prozess laden
+    warm_up_spacy_models(sorted({choice[:2] for choice, _ in combos}))
 
-    with open(ARR_HEADER) as arr_header_file:
-        csv_reader = csv.reader(arr_header_file)
-        arr_header_data = [row for row in csv_reader][0]
-        arr_evaluation_result = {
-            header_entry: dict() for header_entry in arr_header_data
+    # Die Nomen aller Prompts gebuendelt pro Sprache taggen
+    preload_prompt_nouns(
+        {
+            f"results/prompt_txt/Prompt{num}_{choice[:2]}.txt": choice[:2]
+            for choice, num in combos
         }
+    )
+
+    options = {
+        "save_burst_file": True,
+        "cv_workers": cv_workers,
+        "feature_mode": feature_mode,
+        "classifier": classifier,
+        "partial_fit": partial_fit,
+    }
 
     # Fortschrittsbalken aufstellen
-    total_iterations = len(LANGUAGE_CHOICES) * len(PROMPT_CHOICES)
-    progress_bar = tqdm(total=total_iterations, desc="Processing Multi-Arr")
+    progress_bar = tqdm(total=len(combos), desc="Processing Multi-Arr")
+
+    results_store = ResultsStore()
+    run_id = results_store.start_run(attk_keys.MULTI_ARR_NAME.value, options)
+
+    def record_result(combo, result) -> None:
+        # Nur der Hauptprozess schreibt in die Datenbank
+        results_store.record_combo(
+            run_id,
+            combo,
+            result,
+            fingerprint=combo_fingerprint(combo, options),
+            scores_file=sf.arr_sentences_file(arr_training_file(*combo)),
+        )
+        progress_bar.update(1)
 
-    arr_result = dict()
-    cross_valid_qwk_result = dict()
+    try:
+        run_arr_grid(
+            combos,
+            workers=workers,
+            options=options,
+            on_result=record_result,
+            resume=resume,
+        )
+
+        # Die Ergebnisdateien aus der Datenbank exportieren
+        results_store.export_multi_arr_results(run_id=run_id)
+    finally:
+        progress_bar.close()  # Close the progress bar when done
+        results_store.close()
 
-    arr_result[attk_keys.EVALUATION_METRIC.value] = (
-        attk_keys.EVALUATION_METRIC_ARR.value
+
+@app_attack_evaluator.command(
+    name=attk_keys.QUEUE_ENQUEUE_NAME.value,
+    help=attk_keys.QUEUE_ENQUEUE_HELP.value,
+)
+def enqueue_arr_tasks(
+    queue_dir: str = typer.Option(
+        Gp.RESULT_ARR_QUEUE.value,
+        attk_keys.QUEUE_DIR_LONG.value,
+        help=attk_keys.QUEUE_DIR_HELP.value,
+    ),
+    languages: str = typer.Option(
+        GRID_LANGUAGES,
+        attk_keys.GRID_LANGUAGES_LONG.value,
+        help=attk_keys.GRID_LANGUAGES_HELP.value,
+    ),
+    prompts: str = typer.Option(
+        GRID_PROMPTS,
+        attk_keys.GRID_PROMPTS_LONG.value,
+        help=attk_keys.GRID_PROMPTS_HELP.value,
+    ),
+    seeds: str = typer.Option(
+        str(CONTENT_BURST_SEED),
+        attk_keys.QUEUE_SEEDS_LONG.value,
+        help=attk_keys.QUEUE_SEEDS_HELP.value,
+    ),
+    feature_mode: str = typer.Option(
+        FEATURE_MODE,
+        attk_keys.FEATURE_MODE_LONG.value,
+        help=attk_keys.FEATURE_MODE_HELP.value,
+    ),
+    classifier: str = typer.Option(
+        CLASSIFIER,
+        attk_keys.CLASSIFIER_LONG.value,
+        help=attk_keys.CLASSIFIER_HELP.value,
+    ),
+    partial_fit: bool = typer.Option(
+        PARTIAL_FIT,
+        attk_keys.PARTIAL_FIT_LONG.value,
+        help=attk_keys.PARTIAL_FIT_HELP.value,
+    ),
+) -> None:
+    """
+    This adds a task for every language, prompt and seed to a shared queue.
+
+    :param queue_dir: The queue directory on a shared filesystem.
+    :param languages: Comma separated languages, empty for all discovered ones.
+    :param prompts: Comma separated prompt numbers, empty for all discovered ones.
+    :param seeds: Comma separated seeds of the bursts.
+    :param feature_mode: The n-gram features of the scoring model.
+    :param classifier: The classifier of the scoring model.
+    :param partial_fit: Whether the scoring model is fitted chunk by chunk.
+    :return:
+        None
+    """
+    added = ArrTaskQueue(queue_dir).enqueue(
+        select_arr_combos(languages, prompts),
+        [int(seed) for seed in parse_grid_filter(seeds)],
+        {
+            "save_burst_file": True,
+            "feature_mode": feature_mode,
+            "classifier": classifier,
+            "partial_fit": partial_fit,
+        },
     )
-    cross_valid_qwk_result[attk_keys.EVALUATION_METRIC.value] = (
-        attk_keys.EVALUATION_METRIC_CROSS_VALID.value
+
+    catch_and_log_info(
+        custom_message=f"{attk_keys.QUEUE_TASKS_ADDED.value} {len(added)}",
+        echo_msg=True,
     )
 
-    # Alle Sprachen analysieren
-    for num in PROMPT_CHOICES:
-        for choice in LANGUAGE_CHOICES:
-            # Die Adversarials des enstsprechenden Prompts austesten
-            # Das Ergebniss als int zurueck geben.
-            lang_arr_result, cross_valid_qwk = generate_singular_arr(
-                choice, num, echo_results=False
-            )
 
-            lang_prompt_description = lang_arr_result.get("PROMPT").replace("ASAP_", "")
-            arr_result[lang_prompt_description] = lang_arr_result.get("ARR")
-            cross_valid_qwk_result[lang_prompt_description] = round(cross_valid_qwk, 2)
+@app_attack_evaluator.command(
+    name=attk_keys.QUEUE_WORKER_NAME.value,
+    help=attk_keys.QUEUE_WORKER_HELP.value,
+)
+def run_arr_queue_worker(
+    queue_dir: str = typer.Option(
+        Gp.RESULT_ARR_QUEUE.value,
+        attk_keys.QUEUE_DIR_LONG.value,
+        help=attk_keys.QUEUE_DIR_HELP.value,
+    ),
+    processes: int = typer.Option(
+        1,
+        attk_keys.GRID_WORKERS_LONG.value,
+        attk_keys.GRID_WORKERS_SHORT.value,
+        help=attk_keys.QUEUE_PROCESSES_HELP.value,
+    ),
+    cv_workers: int = typer.Option(
+        CV_WORKERS,
+        attk_keys.CV_WORKERS_LONG.value,
+        help=attk_keys.CV_WORKERS_HELP.value,
+    ),
+) -> None:
+    """
+    This claims and evaluates tasks of a shared queue until it is empty. Every
+    machine of a cluster runs the same command on the same queue directory.
 
-            # Ergebnisse zwischenspeichern
-            arr_evaluation_result[lang_prompt_description] = lang_arr_result
+    :param queue_dir: The queue directory on a shared filesystem.
+    :param processes: The number of worker processes on this machine.
+    :param cv_workers: The number of processes for the cross-validation folds.
+    :return:
+        None
+    """
+    completed = run_local_queue_workers(
+        queue_dir, processes, cv_workers=cv_workers
+    )
 
-            progress_bar.update(1)
+    catch_and_log_info(
+        custom_message=f"{attk_keys.QUEUE_WORKER_DONE.value} {completed}",
+        echo_msg=True,
+    )
 
-    progress_bar.close()  # Close the progress bar when done
 
-    # Die Ergebnisse speichern
-    file_standard = Gp.RESULT_MULTI_ARR_SAVE.value
-    file_pivoted = Gp.RESULT_MULTI_ARR_SAVE.value.replace(
-        "arr_results", "pivoted_arr_results"
-    )
+@app_attack_evaluator.command(
+    name=attk_keys.QUEUE_COLLECT_NAME.value,
+    help=attk_keys.QUEUE_COLLECT_HELP.value,
+)
+def collect_arr_queue(
+    queue_dir: str = typer.Option(
+        Gp.RESULT_ARR_QUEUE.value,
+        attk_keys.QUEUE_DIR_LONG.value,
+        help=attk_keys.QUEUE_DIR_HELP.value,
+    ),
+) -> None:
+    """
+    This merges the results of a shared queue into the standard ARR files.
 
-    """ Example
-    Standard output
-    EVALUATION METRIC,en_prompt1,en_prompt2,en_prompt10
-    ARR,0.999,1.0,0.999
-    QWK,0.52,0.15,0.56
+    :param queue_dir: The queue directory on a shared filesystem.
+    :return:
+        None
     """
+    collect_queue_results(queue_dir)
 
-    with open(file_standard, mode="w+", encoding="UTF-8", newline="") as save_arr_file:
 
-        field_names = list(arr_result.keys())
+@app_attack_evaluator.command(
+    name=attk_keys.CHUNKED_ARR_NAME.value,
+    help=attk_keys.CHUNKED_ARR_HELP.value,
+)
+def generate_chunked_arr(
+    lang: str = typer.Option(
+        attk_keys.SINGULAR_ARR_LANG_DEFAULT.value,
+        attk_keys.SINGULAR_ARR_LANG_LONG.value,
+        attk_keys.SINGULAR_ARR_LANG_SHORT.value,
+        help=attk_keys.SINGULAR_ARR_LANG_HELP.value,
+    ),
+    prompt_num: str = typer.Option(
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_DEFAULT.value,
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_LONG.value,
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_SHORT.value,
+        help=attk_keys.SINGULAR_ARR_PROMPT_NUM_HELP.value,
+    ),
+    burst_files: str = typer.Option(
+        attk_keys.BURST_FILES_DEFAULT.value,
+        attk_keys.BURST_FILES_LONG.value,
+        help=attk_keys.BURST_FILES_HELP.value,
+    ),
+    burst_amount: int = typer.Option(
+        Mk.ContentBurstGenerator.BURST_AMOUNT_DEFAULT.value,
+        Mk.ContentBurstGenerator.BURST_AMOUNT_LONG.value,
+        Mk.ContentBurstGenerator.BURST_AMOUNT_SHORT.value,
+        help=Mk.ContentBurstGenerator.BURST_AMOUNT_HELP.value,
+    ),
+    chunk_size: int = typer.Option(
+        PREDICT_CHUNK_SIZE,
+        attk_keys.PREDICT_CHUNK_SIZE_LONG.value,
+        help=attk_keys.PREDICT_CHUNK_SIZE_HELP.value,
+    ),
+    workers: int = typer.Option(
+        PREDICT_WORKERS,
+        attk_keys.PREDICT_WORKERS_LONG.value,
+        attk_keys.PREDICT_WORKERS_SHORT.value,
+        help=attk_keys.PREDICT_WORKERS_HELP.value,
+    ),
+    target_width: float = typer.Option(
+        attk_keys.TARGET_WIDTH_DEFAULT.value,
+        attk_keys.TARGET_WIDTH_LONG.value,
+        help=attk_keys.TARGET_WIDTH_HELP.value,
+    ),
+    confidence: float = typer.Option(
+        ARR_CONFIDENCE,
+        attk_keys.CONFIDENCE_LONG.value,
+        help=attk_keys.CONFIDENCE_HELP.value,
+    ),
+    interval_method: str = typer.Option(
+        ARR_INTERVAL_METHOD,
+        attk_keys.INTERVAL_METHOD_LONG.value,
+        help=attk_keys.INTERVAL_METHOD_HELP.value,
+    ),
+    feature_mode: str = typer.Option(
+        FEATURE_MODE,
+        attk_keys.FEATURE_MODE_LONG.value,
+        help=attk_keys.FEATURE_MODE_HELP.value,
+    ),
+    classifier: str = typer.Option(
+        CLASSIFIER,
+        attk_keys.CLASSIFIER_LONG.value,
+        help=attk_keys.CLASSIFIER_HELP.value,
+    ),
+    partial_fit: bool = typer.Option(
+        PARTIAL_FIT,
+        attk_keys.PARTIAL_FIT_LONG.value,
+        help=attk_keys.PARTIAL_FIT_HELP.value,
+    ),
+) -> dict:
+    """
+    Generates the ARR for a language and prompt number from burst files or from
+    bursts generated on the fly. The bursts are scored chunk by chunk, so the
+    memory needed does not depend on the number of bursts. With a target width,
+    the scoring stops as soon as the confidence interval of the ARR is narrower.
+
+    Args:
+        lang (str): The language, e.g. 'de' or 'en_orig300'.
+        prompt_num (str): The number of the prompt.
+        burst_files (str): Glob pattern of the burst files, e.g. sharded or
+            compressed files. If empty, the bursts are generated on the fly.
+        burst_amount (int): The number of bursts generated on the fly.
+        chunk_size (int): The number of bursts scored at once.
+        workers (int): The number of processes which score the chunks.
+        target_width (float): The interval width at which the scoring stops,
+            0 scores all bursts.
+        confidence (float): The confidence level of the ARR interval.
+        interval_method (str): 'wilson' or 'clopper_pearson'.
+        feature_mode (str): The n-gram features of the scoring model.
+        classifier (str): The classifier of the scoring model.
+        partial_fit (bool): Whether the scoring model is fitted chunk by chunk.
+
+    Returns:
+        dict: The ARR results.
+    """
+    catch_and_log_info(custom_message=attk_keys.CHUNKED_ARR_HELP.value, echo_msg=True)
+
+    # Das gleiche Modell wie bei multiple
+    training_prompt = arr_training_file(lang, prompt_num)
+    model = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(
+            feature_mode=feature_mode,
+            classifier=classifier,
+            partial_fit=partial_fit,
+        ),
+        training_prompt,
+    )
 
-        csvDictWriter = csv.DictWriter(save_arr_file, field_names)
-        csvDictWriter.writeheader()
+    if burst_files:
+        # Die Shards werden in ihrer Reihenfolge gelesen (part0000, part0001, ...)
+        chunks = sf.iter_adversarial_chunks(sorted(glob(burst_files)), chunk_size)
+    else:
+        prompt_text, language, variant = burst_task(lang, prompt_num)
+        generator = Cbg(
+            prompt_text=prompt_text,
+            language=language,
+            burst_amount=burst_amount,
+            variant=variant,
+        )
+        chunks = generator.iter_burst_chunks(chunk_size=chunk_size)
+
+    estimate = sf.estimate_arr_in_chunks(
+        model,
+        training_prompt,
+        chunks,
+        target_width=target_width or None,
+        confidence=confidence,
+        interval_method=interval_method,
+        n_jobs=workers,
+        # Eine frueh beendete Schaetzung ersetzt nicht die vollstaendigen Ergebnisse
+        scores_file=sf.arr_sentences_file(training_prompt, chunked=True),
+    )
+
+    arr_data_results = {
+        "PROMPT": os.path.basename(training_prompt).replace(".tsv", ""),
+        "LANGUAGE": lang,
+        "BURSTS": estimate.get("ADVERSARIALS"),
+        "SCORES": dict(sorted(estimate.get("SCORES").items())),
+        "ARR": estimate.get("ARR"),
+        "ARR_INTERVAL": (round(estimate.get("LOW"), 4), round(estimate.get("HIGH"), 4)),
+        "STOPPED_EARLY": estimate.get("STOPPED_EARLY"),
+    }
+
+    table = Table("Key", "Value")
+    for entry in arr_data_results:
+        table.add_row(entry, str(arr_data_results.get(entry)))
+    CONSOLE.print(table)
+
+    catch_and_log_info(custom_message=attk_keys.SAVE_ARR.value, echo_msg=True)
+    return arr_data_results
 
-        csvDictWriter.writerow(arr_result)
-        csvDictWriter.writerow(cross_valid_qwk_result)
 
-    """ Example
-    # Output - pivoted table 
-    Language Prompt,ARR,QWK
-    en_prompt1,0.999,0.52
-    en_prompt2,1.0,0.15
-    en_prompt10,0.999,0.56
+@app_attack_evaluator.command(
+    name=attk_keys.SERVE_NAME.value,
+    help=attk_keys.SERVE_HELP.value,
+)
+def serve_scoring_models(
+    languages: str = typer.Option(
+        ",".join(LANGUAGE_CHOICES),
+        attk_keys.SERVE_LANGUAGES_LONG.value,
+        help=attk_keys.SERVE_LANGUAGES_HELP.value,
+    ),
+    prompts: str = typer.Option(
+        ",".join(str(num) for num in PROMPT_CHOICES),
+        attk_keys.SERVE_PROMPTS_LONG.value,
+        help=attk_keys.SERVE_PROMPTS_HELP.value,
+    ),
+    host: str = typer.Option(
+        SERVE_HOST,
+        attk_keys.SERVE_HOST_LONG.value,
+        help=attk_keys.SERVE_HOST_HELP.value,
+    ),
+    port: int = typer.Option(
+        SERVE_PORT,
+        attk_keys.SERVE_PORT_LONG.value,
+        help=attk_keys.SERVE_PORT_HELP.value,
+    ),
+    feature_mode: str = typer.Option(
+        FEATURE_MODE,
+        attk_keys.FEATURE_MODE_LONG.value,
+        help=attk_keys.FEATURE_MODE_HELP.value,
+    ),
+    classifier: str = typer.Option(
+        CLASSIFIER,
+        attk_keys.CLASSIFIER_LONG.value,
+        help=attk_keys.CLASSIFIER_HELP.value,
+    ),
+    partial_fit: bool = typer.Option(
+        PARTIAL_FIT,
+        attk_keys.PARTIAL_FIT_LONG.value,
+        help=attk_keys.PARTIAL_FIT_HELP.value,
+    ),
+) -> None:
     """
-    prompt_files = list(arr_result.keys())
+    Loads or fits the scoring models of the chosen languages and prompts once and
+    serves them until the process is stopped. Concurrent scoring requests of the
+    same model are predicted together.
 
-    arr_qwk_pivoted_data = {"EVALUATION METRIC": ["ARR", "QWK"]}
+    POST /score   {"language": "de", "prompt": 1, "texts": [...]}
+    POST /bursts  {"language": "de", "prompt": 1, "amount": 100}
+    GET  /health
 
-    for row in prompt_files:
-        arr_qwk_pivoted_data[row.replace("_", " ")] = list()
+    Args:
+        languages (str): Comma separated languages, e.g. 'de,fr'.
+        prompts (str): Comma separated prompt numbers, e.g. '1,10'.
+        host (str): The host the service listens on.
+        port (int): The port the service listens on.
+        feature_mode (str): The n-gram features of the scoring models.
+        classifier (str): The classifier of the scoring models.
+        partial_fit (bool): Whether the scoring models are fitted chunk by chunk.
 
-    for row1, row2 in zip(arr_result, cross_valid_qwk_result):
-        arr_qwk_pivoted_data[row1.replace("_", " ")].append(arr_result.get(row1))
-        arr_qwk_pivoted_data[row2.replace("_", " ")].append(
-            cross_valid_qwk_result.get(row2)
-        )
+    Returns:
+        None
+    """
+    catch_and_log_info(custom_message=attk_keys.SERVE_HELP.value, echo_msg=True)
+
+    pairs = [
+        (lang.strip(), num.strip())
+        for num in prompts.split(",")
+        if num.strip()
+        for lang in languages.split(",")
+        if lang.strip()
+    ]
+    server = create_scoring_server(
+        load_scoring_service(pairs, feature_mode, classifier, partial_fit),
+        host,
+        port,
+    )
+
+    catch_and_log_info(
+        custom_message=f"{attk_keys.SERVE_READY.value} http://{host}:{server.server_port}",
+        echo_msg=True,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        catch_and_log_info(custom_message=attk_keys.SERVE_STOPPED.value, echo_msg=True)
+
+
+@app_attack_evaluator.command(
+    name=attk_keys.BENCHMARK_SCORING_NAME.value,
+    help=attk_keys.BENCHMARK_SCORING_HELP.value,
+)
+def benchmark_scoring(
+    lang: str = typer.Option(
+        attk_keys.SINGULAR_ARR_LANG_DEFAULT.value,
+        attk_keys.SINGULAR_ARR_LANG_LONG.value,
+        attk_keys.SINGULAR_ARR_LANG_SHORT.value,
+        help=attk_keys.SINGULAR_ARR_LANG_HELP.value,
+    ),
+    prompt_num: str = typer.Option(
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_DEFAULT.value,
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_LONG.value,
+        attk_keys.SINGULAR_ARR_PROMPT_NUM_SHORT.value,
+        help=attk_keys.SINGULAR_ARR_PROMPT_NUM_HELP.value,
+    ),
+    feature_modes: str = typer.Option(
+        attk_keys.BENCHMARK_FEATURE_MODES_DEFAULT.value,
+        attk_keys.BENCHMARK_FEATURE_MODES_LONG.value,
+        help=attk_keys.BENCHMARK_FEATURE_MODES_HELP.value,
+    ),
+    classifiers: str = typer.Option(
+        attk_keys.BENCHMARK_CLASSIFIERS_DEFAULT.value,
+        attk_keys.BENCHMARK_CLASSIFIERS_LONG.value,
+        help=attk_keys.BENCHMARK_CLASSIFIERS_HELP.value,
+    ),
+    cv_workers: int = typer.Option(
+        CV_WORKERS,
+        attk_keys.CV_WORKERS_LONG.value,
+        help=attk_keys.CV_WORKERS_HELP.value,
+    ),
+) -> list:
+    """
+    Compares the QWK, ARR and speed of scoring model configurations on the
+    bursts of one language and prompt. The first configuration is the baseline.
 
-    df = pd.DataFrame(arr_qwk_pivoted_data)
+    Args:
+        lang (str): The language, e.g. 'de' or 'en_orig300'.
+        prompt_num (str): The number of the prompt.
+        feature_modes (str): Comma separated feature modes, e.g. 'count,hashing'.
+        classifiers (str): Comma separated classifiers, e.g. 'svc,sgd'.
+        cv_workers (int): The number of processes for the cross-validation folds.
 
-    # Pivot the DataFrame
-    pivot_df = (
-        df.set_index("EVALUATION METRIC")
-        .T.reset_index()
-        .rename(columns={"index": "Language Prompt"})
+    Returns:
+        list: The benchmark results.
+    """
+    catch_and_log_info(
+        custom_message=attk_keys.BENCHMARK_SCORING_HELP.value, echo_msg=True
     )
 
-    # Save to CSV
-    pivot_df.to_csv(file_pivoted, index=False)
+    prompt_text, language, variant = burst_task(lang, prompt_num)
+    bursts = Cbg(
+        prompt_text=prompt_text, language=language, variant=variant
+    ).generate_bursts()
+
+    training_prompt = arr_training_file(lang, prompt_num)
+
+    # Jede Kombination aus Merkmalen und Klassifikator wird verglichen,
+    # PARTIAL_FIT gilt nur fuer die Kombination, die es unterstuetzt
+    configurations = {
+        f"{mode}/{clf}": {
+            "feature_mode": mode,
+            "classifier": clf,
+            "partial_fit": PARTIAL_FIT
+            and mode == sf.HASHING_FEATURES
+            and clf == sf.SGD_CLASSIFIER,
+        }
+        for mode in [mode.strip() for mode in feature_modes.split(",") if mode.strip()]
+        for clf in [clf.strip() for clf in classifiers.split(",") if clf.strip()]
+    }
+    results = benchmark_scoring_models(
+        training_prompt, bursts, configurations, n_jobs=cv_workers
+    )
+
+    table = Table(*results[0].keys()) if results else Table()
+    for result in results:
+        table.add_row(*[str(value) for value in result.values()])
+    CONSOLE.print(table)
+
+    catch_and_log_info(
+        custom_message=attk_keys.BENCHMARK_SCORING_COMPLETE.value, echo_msg=True
+    )
+    return results
 
 
 @app_attack_evaluator.command(
@@ -307,9 +807,9 @@ def generate_multi_arr() -> None:
 )
 def visualize_arr_results():
     """
-    Visualizes data from a CSV file containing languages and rejection rates.
+    Visualizes the languages and rejection rates of the results database.
     It also creates a digram for the noun/none-noun distribution
-    Reads data from a CSV file, extracts languages and rejection rates,
+    Reads the latest ARR and QWK of every combination from the database,
     and creates a bar plot visualizing rejection rates for each language.
 
     Args:
@@ -365,36 +865,36 @@ def visualize_arr_results():
         plt.savefig(f"{title}_{metric_label}.png")
         catch_and_log_info(custom_message=Mk.General.SAVE_DATA.value, echo_msg=True)
 
-    data_file = Gp.RESULT_MULTI_ARR_SAVE.value
+    # Die letzte Auswertung jeder Kombination aus der Datenbank
+    with ResultsStore() as results_store:
+        results = results_store.multi_arr_results()
 
     ###################################################################################
 
-    with open(data_file, mode="r") as csv_data:
-        csv_reader = csv.reader(csv_data)
-        data = list(csv_reader)
-
-        labels = [i[0] for i in data][1:]
-        prompt_labels = data[0][1:]
-        arr_label, arr = labels[0], data[1:][0][1:]
-        qwk_label, qwk = labels[1], data[2:][0][1:]
-
-        arr_rates = [float(rate) for rate in arr]  # Convert rates to float
-        qwk_rates = [float(rate) for rate in qwk]  # Convert rates to float
-
-        ## Creating colors for the labels
-        color_mapping = {
-            "en": "darkblue",
-            "es": "darkred",
-            "fr": "darkorange",
-            "de": "gold",
-        }
-        labels = [col.split("_")[0] for col in prompt_labels]
-        colors = [
-            color_mapping.get(label, "gray") for label in labels
-        ]  # Default to gray if label not found in mapping
+    arr_label = attk_keys.EVALUATION_METRIC_ARR.value
+    qwk_label = attk_keys.EVALUATION_METRIC_CROSS_VALID.value
+
+    prompt_labels = [
+        arr_data_results.get("PROMPT").replace("ASAP_", "")
+        for arr_data_results, _ in results.values()
+    ]
+    arr_rates = [arr_data_results.get("ARR") for arr_data_results, _ in results.values()]
+    qwk_rates = [round(qwk, 2) for _, qwk in results.values()]
+
+    ## Creating colors for the labels
+    color_mapping = {
+        "en": "darkblue",
+        "es": "darkred",
+        "fr": "darkorange",
+        "de": "gold",
+    }
+    labels = [col.split("_")[0] for col in prompt_labels]
+    colors = [
+        color_mapping.get(label, "gray") for label in labels
+    ]  # Default to gray if label not found in mapping
 
-        __create_chart(arr_label, prompt_labels, arr_rates, color=colors)
-        __create_chart(qwk_label, prompt_labels, qwk_rates, color=colors)
+    __create_chart(arr_label, prompt_labels, arr_rates, color=colors)
+    __create_chart(qwk_label, prompt_labels, qwk_rates, color=colors)
 
     catch_and_log_info(
         custom_message=Mk.AttackerEvaluator.VISUALIZE_ARR_HELP.value, echo_msg=True
@@ -413,8 +913,8 @@ def visualize_arr_results():
 )
 def generate_excerpts():
     """
-    Excerpts are taken the from the generated content burst files to see
-    which sentences were given which scores. The results are then saved in the
+    Excerpts are taken from the scored content bursts of the results database to
+    see which sentences were given which scores. The results are then saved in the
     arr_sentence_result_excerpt folder. Also, the total distribution of all of the scores
     is saved as a total sum. A visualization of this score distribution can be found in
     visualization folder.
@@ -422,8 +922,10 @@ def generate_excerpts():
     :return:
         None
     """
-    tsv_files = find_tsv_files()
-    prompt_results, count_results = process_tsv_files(tsv_files)
+    with ResultsStore() as results_store:
+        scored_sentences = results_store.sentence_scores()
+
+    prompt_results, count_results = process_scored_sentences(scored_sentences)
     save_results(prompt_results)
     score_distribution = calculate_score_distribution(count_results)
     plot_score_distribution(score_distribution)
@@ -431,4 +933,13 @@ def generate_excerpts():
 
 if __name__ == "__main__":
     #app_attack_evaluator()
-    generate_multi_arr()
\ No newline at end of file
+    generate_multi_arr(
+        cv_workers=CV_WORKERS,
+        feature_mode=FEATURE_MODE,
+        classifier=CLASSIFIER,
+        partial_fit=PARTIAL_FIT,
+        workers=GRID_WORKERS,
+        resume=False,
+        languages=GRID_LANGUAGES,
+        prompts=GRID_PROMPTS,
+    )
\ No newline at end of file
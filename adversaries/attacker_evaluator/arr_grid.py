@@ -0,0 +1,666 @@
+# Standard
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Pip
+import pandas as pd
+import sklearn
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator.scoring_model_store import file_hash
+from adversaries.burst_attack.burst_tasks import burst_task
+from adversaries.burst_attack.content_burst_generator import (
+    ContentBurstGenerator as Cbg,
+)
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    CLASSIFIER,
+    CONTENT_BURST_SEED,
+    CV_WORKERS,
+    FEATURE_MODE,
+    GRID_LANGUAGES,
+    GRID_PROMPTS,
+    GRID_WORKERS,
+    LANGUAGE_CHOICES,
+    PARTIAL_FIT,
+    PROMPT_CHOICES,
+    SCORING_PIPELINE_MEMORY,
+)
+from adversaries.settings.logger.basic_logger import (
+    catch_and_log_error,
+    catch_and_log_info,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+from adversaries.settings.messages.message_keys import MessageKeys as Mk
+
+attk_keys = Mk.AttackerEvaluator
+
+# Eine Kombination besteht aus Sprache (z.B. 'en_orig300') und Prompt-Nummer
+ArrCombo = Tuple[str, int]
+
+TRAINING_FILE_PATTERN = re.compile(
+    r"^ASAP_(?P<language>\w+?)_prompt(?P<prompt>\d+)\.tsv$"
+)
+PROMPT_TEXT_PATTERN = re.compile(r"^Prompt(?P<prompt>\d+)_(?P<language>\w+)\.txt$")
+
+
+def arr_combos(
+    language_choices: list = LANGUAGE_CHOICES, prompt_choices: list = PROMPT_CHOICES
+) -> List[ArrCombo]:
+    """
+    Returns the language and prompt combinations of the grid in the order of the
+    result files.
+
+    Args:
+        language_choices (list, optional): The languages to be evaluated.
+        prompt_choices (list, optional): The prompt numbers to be evaluated.
+
+    Returns:
+        list: The (language, prompt number) combinations.
+    """
+    return [
+        (language_choice, prompt_num)
+        for prompt_num in prompt_choices
+        for language_choice in language_choices
+    ]
+
+
+def grid_order(combo: ArrCombo) -> tuple:
+    """
+    Returns the sort key of a combination: the prompts by number, the languages
+    in the order of LANGUAGE_CHOICES, further languages alphabetically after them.
+
+    Args:
+        combo (tuple): The language and the prompt number.
+
+    Returns:
+        tuple: The sort key.
+    """
+    language_choice, prompt_num = combo
+
+    if language_choice in LANGUAGE_CHOICES:
+        language_rank = (LANGUAGE_CHOICES.index(language_choice), "")
+    else:
+        language_rank = (len(LANGUAGE_CHOICES), language_choice)
+
+    return int(prompt_num), language_rank
+
+
+def discover_arr_combos(
+    training_dir: str = Gp.ASAP_TRAINING_DATA_DIR.value,
+    prompt_texts: Optional[Iterable[str]] = None,
+) -> List[ArrCombo]:
+    """
+    Finds every combination with a training file ASAP_{lang}_prompt{n}.tsv and a
+    prompt text Prompt{n}_{lang}.txt. The English variants such as 'en_orig300'
+    use the prompt text of their language 'en'.
+
+    Both directories are listed once and indexed by language and prompt number,
+    so new corpora are found without changes to the code.
+
+    Args:
+        training_dir (str, optional): The directory of the training files.
+        prompt_texts (Iterable[str], optional): The prompt text files. Defaults to
+            the files in the prompt text directory.
+
+    Returns:
+        list: The (language, prompt number) combinations in grid order.
+    """
+    if prompt_texts is None:
+        prompt_texts = glob(f"{Gp.RESULT_PROMPT_TXT.value}/Prompt*_*.txt")
+
+    prompt_index = set()
+    for prompt_text in prompt_texts:
+        match = PROMPT_TEXT_PATTERN.match(os.path.basename(prompt_text))
+        if match:
+            prompt_index.add((match.group("language"), int(match.group("prompt"))))
+
+    combos = list()
+    for training_file in os.listdir(training_dir):
+        match = TRAINING_FILE_PATTERN.match(training_file)
+        if match is None:
+            continue
+
+        language_choice = match.group("language")
+        prompt_num = int(match.group("prompt"))
+        _, language, _ = burst_task(language_choice, prompt_num)
+
+        if (language, prompt_num) in prompt_index:
+            combos.append((language_choice, prompt_num))
+
+    return sorted(combos, key=grid_order)
+
+
+def parse_grid_filter(choices) -> List[str]:
+    """
+    Splits a comma separated filter such as 'de,fr' into its values.
+
+    Args:
+        choices: A comma separated string, a list or None.
+
+    Returns:
+        list: The values, empty if nothing is filtered.
+    """
+    if choices is None:
+        return list()
+
+    if isinstance(choices, (list, tuple)):
+        return [str(choice).strip() for choice in choices if str(choice).strip()]
+
+    return [choice.strip() for choice in str(choices).split(",") if choice.strip()]
+
+
+def filter_arr_combos(
+    combos: List[ArrCombo], languages=None, prompts=None
+) -> List[ArrCombo]:
+    """
+    Keeps the combinations of the chosen languages and prompts.
+
+    Args:
+        combos (list): The (language, prompt number) combinations.
+        languages (optional): The languages, e.g. 'de,fr'. Empty keeps all.
+        prompts (optional): The prompt numbers, e.g. '1,10'. Empty keeps all.
+
+    Returns:
+        list: The chosen combinations.
+
+    Raises:
+        Cem.ArrGridFilterError: If no combination matches the filters.
+    """
+    languages = parse_grid_filter(languages)
+    prompts = parse_grid_filter(prompts)
+
+    chosen = [
+        (language_choice, prompt_num)
+        for language_choice, prompt_num in combos
+        if (not languages or language_choice in languages)
+        and (not prompts or str(prompt_num) in prompts)
+    ]
+
+    if not chosen:
+        raise Cem.ArrGridFilterError(
+            languages, prompts, [arr_combo_name(*combo) for combo in combos]
+        )
+
+    return chosen
+
+
+def select_arr_combos(
+    languages=GRID_LANGUAGES,
+    prompts=GRID_PROMPTS,
+    prompt_texts: Optional[Iterable[str]] = None,
+) -> List[ArrCombo]:
+    """
+    Returns the discovered combinations of the chosen languages and prompts.
+
+    Args:
+        languages (optional): The languages, e.g. 'de,fr'. Empty keeps all.
+        prompts (optional): The prompt numbers, e.g. '1,10'. Empty keeps all.
+        prompt_texts (Iterable[str], optional): The prompt text files, see
+            discover_arr_combos.
+
+    Returns:
+        list: The (language, prompt number) combinations in grid order.
+    """
+    return filter_arr_combos(
+        discover_arr_combos(prompt_texts=prompt_texts), languages, prompts
+    )
+
+
+def arr_combo_name(language_choice: str, prompt_num) -> str:
+    return f"{language_choice}_prompt{prompt_num}"
+
+
+def arr_training_file(language_choice: str, prompt_num) -> str:
+    return f"{Gp.ASAP_TRAINING_DATA_DIR.value}/ASAP_{language_choice}_prompt{prompt_num}.tsv"
+
+
+def order_largest_first(combos: List[ArrCombo]) -> List[ArrCombo]:
+    """
+    Orders the combinations by the size of their training file, the largest first,
+    so the longest tasks do not start last and leave the other workers idle.
+
+    Args:
+        combos (list): The (language, prompt number) combinations.
+
+    Returns:
+        list: The combinations, ties keep their order.
+    """
+
+    def training_file_size(combo: ArrCombo) -> int:
+        training_file = arr_training_file(*combo)
+        return os.path.getsize(training_file) if os.path.exists(training_file) else 0
+
+    return sorted(combos, key=training_file_size, reverse=True)
+
+
+def evaluate_arr_combo(
+    language_choice: str,
+    prompt_num,
+    save_burst_file: bool = True,
+    cv_workers: int = CV_WORKERS,
+    feature_mode: str = FEATURE_MODE,
+    classifier: str = CLASSIFIER,
+    random_seed: int = CONTENT_BURST_SEED,
+    partial_fit: bool = PARTIAL_FIT,
+) -> Tuple[dict, dict]:
+    """
+    Generates the bursts of a language and prompt and scores them with a model
+    trained on the prompt.
+
+    Args:
+        language_choice (str): The language, e.g. 'de' or 'en_orig300'.
+        prompt_num: The number of the prompt.
+        save_burst_file (bool, optional): Whether the bursts are also written to
+            a TSV file.
+        cv_workers (int, optional): The number of processes for the folds.
+        feature_mode (str, optional): The n-gram features of the scoring model.
+        classifier (str, optional): The classifier of the scoring model.
+        random_seed (int, optional): The seed of the bursts.
+        partial_fit (bool, optional): Whether the scoring model is fitted chunk by
+            chunk.
+
+    Returns:
+        tuple: The ARR result row and the results of evaluate_scoring_model.
+
+    Raises:
+        Cem.ArrComboError: If the bursts of the combination cannot be generated.
+    """
+    # die Dateien orig300 und orig werden als 'en' behandelt.
+    prompt_text, lang, variant = burst_task(language_choice, prompt_num)
+    training_prompt = arr_training_file(language_choice, prompt_num)
+
+    burst_file_writer = None
+
+    try:
+        # Die Bursts werden direkt im Speicher an das Scoring uebergeben,
+        # die TSV-Datei wird nur optional im Hintergrund geschrieben.
+        generator = Cbg(
+            prompt_text=prompt_text,
+            language=lang,
+            random_seed=random_seed,
+            variant=variant,
+        )
+        bursts = generator.generate_bursts()
+
+        if save_burst_file:
+            burst_file_writer = generator.save_bursts(
+                extend_file_save_name=variant, bursts=bursts, asynchronous=True
+            )
+
+    except Exception as e:
+        # Die gueltigen Kombinationen ergeben sich aus den vorhandenen Dateien
+        combo_error = Cem.ArrComboError(
+            language_choice,
+            prompt_num,
+            [arr_combo_name(*combo) for combo in discover_arr_combos()],
+        )
+        catch_and_log_error(
+            e, custom_message=str(combo_error), echo_msg=True, echo_traceback=True
+        )
+        raise combo_error from e
+
+    # Hier wird jetzt ein Modell auf einem Prompt trainiert
+    # und dann auf die Adversarials angewendet
+    # Ganz wichtig: train_file und adversarial_file muessen sich auf den
+    # gleichen Datensatz + Prompt beziehen!
+    catch_and_log_info(custom_message=attk_keys.RATE_ATTACK.value, echo_msg=True)
+
+    # Die Trainingsdaten werden nur einmal gelesen und fuer die
+    # Kreuzvalidierung und das finale Modell verwendet.
+    cv_results = sf.evaluate_scoring_model(
+        training_prompt,
+        adversarials=bursts,
+        n_jobs=cv_workers,
+        memory=Gp.RESULT_PIPELINE_CACHE.value if SCORING_PIPELINE_MEMORY else None,
+        feature_mode=feature_mode,
+        classifier=classifier,
+        scores_file=sf.arr_sentences_file(training_prompt, random_seed),
+        partial_fit=partial_fit,
+    )
+
+    if burst_file_writer is not None:
+        burst_file_writer.result()  # Fehler beim Schreiben nicht verschlucken
+
+    arr_data_results = {
+        "METHOD": "CONTENT_BURST",
+        "PROMPT": os.path.basename(training_prompt).replace(".tsv", ""),
+        "PROMPT_NUMBER": prompt_num,
+        "LANGUAGE": lang,
+        "ARR": cv_results.get("ARR"),
+    }
+
+    return arr_data_results, cv_results
+
+
+def run_arr_combo(combo: ArrCombo, options: dict) -> Tuple[dict, float]:
+    """
+    Evaluates one combination of the grid, also inside a worker process.
+
+    Args:
+        combo (tuple): The language and the prompt number.
+        options (dict): The keyword arguments of evaluate_arr_combo.
+
+    Returns:
+        tuple: The ARR result row and the cross-validated QWK.
+    """
+    arr_data_results, cv_results = evaluate_arr_combo(*combo, **options)
+
+    return arr_data_results, cv_results.get("QWK")
+
+
+def write_json_atomically(json_file: str, data: dict) -> None:
+    """
+    Writes a JSON file through a temporary file in the same directory, so other
+    processes, also on other machines of a shared filesystem, never read a half
+    written file.
+
+    Args:
+        json_file (str): The path of the JSON file.
+        data (dict): The data to be written.
+
+    Returns:
+        None
+    """
+    json_dir = os.path.dirname(json_file) or "."
+    os.makedirs(json_dir, exist_ok=True)
+
+    file_descriptor, temp_file = tempfile.mkstemp(dir=json_dir, suffix=".tmp")
+
+    try:
+        with os.fdopen(file_descriptor, mode="w", encoding="utf-8") as save_file:
+            json.dump(data, save_file, indent=2, default=float)
+        os.replace(temp_file, json_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def combo_result_file(combo: ArrCombo) -> str:
+    return f"{Gp.RESULT_ARR_COMBOS.value}/{arr_combo_name(*combo)}.json"
+
+
+def combo_fingerprint(combo: ArrCombo, options: dict) -> str:
+    """
+    Returns the fingerprint of the inputs of one combination: the content of the
+    prompt text and the training file, the options, the seed of the bursts and
+    the scikit-learn version.
+
+    Args:
+        combo (tuple): The language and the prompt number.
+        options (dict): The keyword arguments of evaluate_arr_combo.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    prompt_text, _, _ = burst_task(*combo)
+
+    inputs = {
+        "files": {
+            path: file_hash(path) if os.path.exists(path) else None
+            for path in (prompt_text, arr_training_file(*combo))
+        },
+        # Die Anzahl der Prozesse aendert das Ergebnis nicht
+        "options": {
+            key: value for key, value in options.items() if key != "cv_workers"
+        },
+        "seed": CONTENT_BURST_SEED,
+        "sklearn": sklearn.__version__,
+    }
+    serialized = json.dumps(inputs, sort_keys=True, default=str)
+
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def save_combo_result(
+    combo: ArrCombo, result: Tuple[dict, float], fingerprint: str = None
+) -> str:
+    """
+    Saves the result of one combination as a checkpoint. The file is replaced
+    atomically, so a crash never leaves a half written result.
+
+    Args:
+        combo (tuple): The language and the prompt number.
+        result (tuple): The ARR result row and the QWK of the combination.
+        fingerprint (str, optional): The fingerprint of the inputs.
+
+    Returns:
+        str: The path of the result file.
+    """
+    arr_data_results, cross_valid_qwk = result
+    result_file = combo_result_file(combo)
+
+    write_json_atomically(
+        result_file,
+        {
+            "ARR_RESULT": arr_data_results,
+            "QWK": float(cross_valid_qwk),
+            "FINGERPRINT": fingerprint,
+        },
+    )
+
+    return result_file
+
+
+def load_combo_result(
+    combo: ArrCombo, fingerprint: str = None
+) -> Optional[Tuple[dict, float]]:
+    """
+    Loads the saved result of one combination.
+
+    Args:
+        combo (tuple): The language and the prompt number.
+        fingerprint (str, optional): If given, the result is only returned if it
+            was computed from inputs with this fingerprint.
+
+    Returns:
+        tuple: The ARR result row and the QWK, or None if it was not saved.
+    """
+    result_file = combo_result_file(combo)
+
+    if not os.path.exists(result_file):
+        return None
+
+    try:
+        with open(result_file, mode="r", encoding="utf-8") as saved_file:
+            saved = json.load(saved_file)
+    except ValueError:
+        # Ein kaputter Checkpoint wird einfach neu berechnet
+        return None
+
+    if fingerprint is not None and saved.get("FINGERPRINT") != fingerprint:
+        return None
+
+    return saved.get("ARR_RESULT"), saved.get("QWK")
+
+
+def run_arr_grid(
+    combos: List[ArrCombo],
+    workers: int = GRID_WORKERS,
+    options: Optional[dict] = None,
+    on_result: Optional[Callable[[ArrCombo, Tuple[dict, float]], None]] = None,
+    resume: bool = False,
+) -> Dict[ArrCombo, Tuple[dict, float]]:
+    """
+    Evaluates the combinations of the grid, with several workers in a process pool.
+
+    The tasks are started largest first, the results are returned in the order of
+    the combinations regardless of the order in which they finish. Every
+    combination has its own burst stream, so the results do not depend on the
+    number of workers.
+
+    The result of every finished combination is saved as a checkpoint right away.
+    If a combination fails, the others are still evaluated and saved before the
+    first error is raised. With resume, combinations whose checkpoint was computed
+    from the same inputs are not evaluated again.
+
+    Args:
+        combos (list): The (language, prompt number) combinations.
+        workers (int, optional): The number of processes. With 1, the combinations
+            are evaluated in the current process.
+        options (dict, optional): The keyword arguments of evaluate_arr_combo.
+        on_result (callable, optional): Called with every finished combination
+            and its result, e.g. to update a progress bar.
+        resume (bool, optional): Whether matching checkpoints are reused.
+
+    Returns:
+        dict: The ARR result row and the QWK of every combination.
+    """
+    options = options or dict()
+    results = dict()
+    errors = list()
+
+    fingerprints = {combo: combo_fingerprint(combo, options) for combo in combos}
+
+    def finish(combo: ArrCombo, result: Tuple[dict, float]) -> None:
+        results[combo] = result
+        if on_result is not None:
+            on_result(combo, result)
+
+    def fail(combo: ArrCombo, error: BaseException) -> None:
+        errors.append(error)
+        failed_msg = f"{attk_keys.COMBO_FAILED.value} {arr_combo_name(*combo)}"
+        catch_and_log_error(error, custom_message=failed_msg, echo_msg=True)
+
+    pending = list()
+    for combo in combos:
+        checkpoint = load_combo_result(combo, fingerprints[combo]) if resume else None
+
+        if checkpoint is None:
+            pending.append(combo)
+        else:
+            resumed_msg = f"{attk_keys.COMBO_RESUMED.value} {arr_combo_name(*combo)}"
+            catch_and_log_info(custom_message=resumed_msg, echo_msg=True)
+            finish(combo, checkpoint)
+
+    if workers <= 1 or len(pending) <= 1:
+        for combo in pending:
+            try:
+                result = run_arr_combo(combo, options)
+            except Exception as e:
+                fail(combo, e)
+                continue
+
+            save_combo_result(combo, result, fingerprints[combo])
+            finish(combo, result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_arr_combo, combo, options): combo
+                for combo in order_largest_first(pending)
+            }
+
+            for future in as_completed(futures):
+                combo = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail(combo, e)
+                    continue
+
+                save_combo_result(combo, result, fingerprints[combo])
+                finish(combo, result)
+
+    if errors:
+        raise errors[0]
+
+    return {combo: results[combo] for combo in combos}
+
+
+def pivoted_results_file(file_standard: str = Gp.RESULT_MULTI_ARR_SAVE.value) -> str:
+    return os.path.join(
+        os.path.dirname(file_standard),
+        os.path.basename(file_standard).replace("arr_results", "pivoted_arr_results"),
+    )
+
+
+def write_multi_arr_results(
+    results: Dict[ArrCombo, Tuple[dict, float]],
+    file_standard: str = Gp.RESULT_MULTI_ARR_SAVE.value,
+) -> Tuple[str, str]:
+    """
+    Saves the ARR and QWK of the combinations in the standard and the pivoted
+    result file, in the order of the results.
+
+    Args:
+        results (dict): The ARR result row and the QWK of every combination.
+        file_standard (str, optional): The path of the standard result file, the
+            pivoted file is saved next to it.
+
+    Returns:
+        tuple: The paths of the standard and the pivoted result file.
+    """
+    file_pivoted = pivoted_results_file(file_standard)
+
+    arr_result = dict()
+    cross_valid_qwk_result = dict()
+
+    arr_result[attk_keys.EVALUATION_METRIC.value] = (
+        attk_keys.EVALUATION_METRIC_ARR.value
+    )
+    cross_valid_qwk_result[attk_keys.EVALUATION_METRIC.value] = (
+        attk_keys.EVALUATION_METRIC_CROSS_VALID.value
+    )
+
+    for lang_arr_result, cross_valid_qwk in results.values():
+        lang_prompt_description = lang_arr_result.get("PROMPT").replace("ASAP_", "")
+        arr_result[lang_prompt_description] = lang_arr_result.get("ARR")
+        cross_valid_qwk_result[lang_prompt_description] = round(cross_valid_qwk, 2)
+
+    """ Example
+    Standard output
+    EVALUATION METRIC,en_prompt1,en_prompt2,en_prompt10
+    ARR,0.999,1.0,0.999
+    QWK,0.52,0.15,0.56
+    """
+
+    with open(file_standard, mode="w+", encoding="UTF-8", newline="") as save_arr_file:
+
+        field_names = list(arr_result.keys())
+
+        csvDictWriter = csv.DictWriter(save_arr_file, field_names)
+        csvDictWriter.writeheader()
+
+        csvDictWriter.writerow(arr_result)
+        csvDictWriter.writerow(cross_valid_qwk_result)
+
+    """ Example
+    # Output - pivoted table
+    Language Prompt,ARR,QWK
+    en_prompt1,0.999,0.52
+    en_prompt2,1.0,0.15
+    en_prompt10,0.999,0.56
+    """
+    arr_qwk_pivoted_data = {
+        row.replace("_", " "): [arr_result.get(row), cross_valid_qwk_result.get(row)]
+        for row in arr_result
+    }
+
+    df = pd.DataFrame(arr_qwk_pivoted_data)
+
+    # Pivot the DataFrame
+    pivot_df = (
+        df.set_index(attk_keys.EVALUATION_METRIC.value)
+        .T.reset_index()
+        .rename(columns={"index": "Language Prompt"})
+    )
+
+    # Save to CSV
+    pivot_df.to_csv(file_pivoted, index=False)
+
+    return file_standard, file_pivoted
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,520 @@
+# Standard
+import json
+import os
+import re
+import socket
+import threading
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from typing import Dict, List, Optional, Tuple
+
+# Pip
+# None
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator.arr_grid import (
+    ArrCombo,
+    arr_combo_name,
+    arr_training_file,
+    combo_fingerprint,
+    order_largest_first,
+    run_arr_combo,
+    write_json_atomically,
+)
+from adversaries.attacker_evaluator.results_store import ResultsStore
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    CONTENT_BURST_SEED,
+    CV_WORKERS,
+    QUEUE_HEARTBEAT_SECONDS,
+    QUEUE_MAX_ATTEMPTS,
+    QUEUE_STALE_SECONDS,
+)
+from adversaries.settings.logger.basic_logger import (
+    catch_and_log_error,
+    catch_and_log_info,
+)
+from adversaries.settings.messages.message_keys import MessageKeys as Mk
+
+attk_keys = Mk.AttackerEvaluator
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+RESULTS = "results"
+
+# z.B. 0003_de_prompt1_seed42.attempt1.json, die Nummer legt die Reihenfolge fest
+TASK_FILE_PATTERN = re.compile(
+    r"^(?P<rank>\d+)_(?P<task_id>.+)\.attempt(?P<attempt>\d+)\.json$"
+)
+
+
+def task_id(combo: ArrCombo, random_seed: int) -> str:
+    return f"{arr_combo_name(*combo)}_seed{random_seed}"
+
+
+def task_file_name(rank: int, task: str, attempt: int) -> str:
+    return f"{rank:04}_{task}.attempt{attempt}.json"
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ArrTaskQueue:
+    """
+    A work queue of ARR tasks in a directory, which can be shared by several
+    machines over a common filesystem.
+
+    Every task is a JSON file which moves between the directories pending,
+    claimed, done and failed. A task is claimed by renaming it from pending to
+    claimed, the rename is atomic, so only one worker gets it. The worker touches
+    the claimed file regularly as a heartbeat; a claimed file without heartbeat
+    is put back to pending by any worker, a task is failed after too many
+    attempts. The results are written to the directory results.
+
+    Attributes:
+        queue_dir (str): The directory of the queue.
+
+    Methods:
+        enqueue(combos, seeds, options): Adds the tasks of a grid.
+        claim(): Claims the next pending task.
+        heartbeat(claimed_file): Marks a claimed task as alive.
+        complete(claimed_file, task, result, worker): Saves the result of a task.
+        fail(claimed_file, error, max_attempts): Retries or fails a task.
+        requeue_stale(stale_seconds, max_attempts): Returns lost tasks to pending.
+        counts(): The number of tasks per state.
+        results(): The results of the finished tasks.
+    """
+
+    def __init__(self, queue_dir: str = Gp.RESULT_ARR_QUEUE.value):
+        """
+        Initialize the ArrTaskQueue object and create its directories.
+
+        Args:
+            queue_dir (str, optional): The directory of the queue.
+        """
+        self.queue_dir = queue_dir
+
+        for state in (PENDING, CLAIMED, DONE, FAILED, RESULTS):
+            os.makedirs(self._state_dir(state), exist_ok=True)
+
+    def _state_dir(self, state: str) -> str:
+        return os.path.join(self.queue_dir, state)
+
+    def _task_files(self, state: str) -> List[str]:
+        return sorted(
+            file
+            for file in os.listdir(self._state_dir(state))
+            if TASK_FILE_PATTERN.match(file)
+        )
+
+    def _move(self, file: str, source: str, target: str, target_file: str = None):
+        # os.rename ist atomar: nur ein Prozess kann eine Datei verschieben
+        os.rename(
+            os.path.join(self._state_dir(source), file),
+            os.path.join(self._state_dir(target), target_file or file),
+        )
+
+    def result_file(self, task: str) -> str:
+        return os.path.join(self._state_dir(RESULTS), f"{task}.json")
+
+    def enqueue(
+        self, combos: List[ArrCombo], seeds: List[int], options: dict
+    ) -> List[str]:
+        """
+        Adds a task for every combination and seed, the largest training files
+        first. Tasks which are already queued or finished are not added again.
+
+        Args:
+            combos (list): The (language, prompt number) combinations.
+            seeds (list): The seeds of the bursts.
+            options (dict): The keyword arguments of evaluate_arr_combo.
+
+        Returns:
+            list: The ids of the added tasks.
+        """
+        known_tasks = {
+            TASK_FILE_PATTERN.match(file).group("task_id")
+            for state in (PENDING, CLAIMED, DONE, FAILED)
+            for file in self._task_files(state)
+        }
+        rank = len(known_tasks)
+        added = list()
+
+        for combo in order_largest_first(combos):
+            for random_seed in seeds:
+                task = task_id(combo, random_seed)
+
+                if task in known_tasks or os.path.exists(self.result_file(task)):
+                    continue
+
+                task_options = dict(options, random_seed=random_seed)
+                # Die Burst-Datei gibt es nur einmal pro Kombination
+                task_options["save_burst_file"] = (
+                    options.get("save_burst_file", False)
+                    and random_seed == CONTENT_BURST_SEED
+                )
+
+                write_json_atomically(
+                    os.path.join(
+                        self._state_dir(PENDING), task_file_name(rank, task, 1)
+                    ),
+                    {
+                        "TASK": task,
+                        "LANGUAGE_CHOICE": combo[0],
+                        "PROMPT_NUMBER": combo[1],
+                        "SEED": random_seed,
+                        "OPTIONS": task_options,
+                    },
+                )
+                rank += 1
+                added.append(task)
+
+        return added
+
+    def claim(self) -> Optional[Tuple[str, dict]]:
+        """
+        Claims the next pending task.
+
+        Returns:
+            tuple: The name of the claimed file and the task, or None if no task
+            is pending.
+        """
+        for file in self._task_files(PENDING):
+            try:
+                # Der erste Heartbeat vor dem Verschieben: sonst haette die Datei
+                # in claimed die alte Zeit und wuerde sofort als verloren gelten
+                os.utime(os.path.join(self._state_dir(PENDING), file))
+                self._move(file, PENDING, CLAIMED)
+            except FileNotFoundError:
+                # Ein anderer Worker war schneller
+                continue
+
+            claimed_file = os.path.join(self._state_dir(CLAIMED), file)
+
+            with open(claimed_file, mode="r", encoding="utf-8") as task_file:
+                return file, json.load(task_file)
+
+        return None
+
+    def heartbeat(self, claimed_file: str) -> bool:
+        """
+        Marks a claimed task as alive by updating the time of its file.
+
+        Args:
+            claimed_file (str): The name of the claimed file.
+
+        Returns:
+            bool: False if the task is no longer claimed.
+        """
+        try:
+            os.utime(os.path.join(self._state_dir(CLAIMED), claimed_file))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(
+        self, claimed_file: str, task: dict, result: Tuple[dict, float], worker: str
+    ) -> None:
+        """
+        Saves the result of a task and moves it to done.
+
+        Args:
+            claimed_file (str): The name of the claimed file.
+            task (dict): The task.
+            result (tuple): The ARR result row and the QWK.
+            worker (str): The name of the worker.
+
+        Returns:
+            None
+        """
+        arr_data_results, cross_valid_qwk = result
+        combo = (task.get("LANGUAGE_CHOICE"), task.get("PROMPT_NUMBER"))
+
+        write_json_atomically(
+            self.result_file(task.get("TASK")),
+            {
+                "LANGUAGE_CHOICE": combo[0],
+                "PROMPT_NUMBER": combo[1],
+                "SEED": task.get("SEED"),
+                "ARR_RESULT": arr_data_results,
+                "QWK": float(cross_valid_qwk),
+                "FINGERPRINT": combo_fingerprint(combo, task.get("OPTIONS")),
+                "WORKER": worker,
+            },
+        )
+
+        try:
+            self._move(claimed_file, CLAIMED, DONE)
+        except FileNotFoundError:
+            # Die Aufgabe wurde zwischenzeitlich neu vergeben, das Ergebnis
+            # ist deterministisch und bleibt gueltig.
+            pass
+
+    def _retry_or_fail(self, file: str, source: str, max_attempts: int) -> str:
+        match = TASK_FILE_PATTERN.match(file)
+        attempt = int(match.group("attempt"))
+
+        if attempt < max_attempts:
+            retry_file = task_file_name(
+                int(match.group("rank")), match.group("task_id"), attempt + 1
+            )
+            self._move(file, source, PENDING, retry_file)
+            return PENDING
+
+        self._move(file, source, FAILED)
+        return FAILED
+
+    def fail(
+        self, claimed_file: str, error: BaseException, max_attempts: int
+    ) -> Optional[str]:
+        """
+        Returns a failed task to pending or moves it to failed after the last
+        attempt. The traceback is saved next to the task.
+
+        Args:
+            claimed_file (str): The name of the claimed file.
+            error (BaseException): The error of the task.
+            max_attempts (int): The number of attempts of a task.
+
+        Returns:
+            str: The new state of the task, None if it was no longer claimed.
+        """
+        with open(
+            os.path.join(self._state_dir(FAILED), f"{claimed_file}.error.txt"),
+            mode="w",
+            encoding="utf-8",
+        ) as error_file:
+            error_file.write(
+                "".join(traceback.format_exception(type(error), error, error.__traceback__))
+            )
+
+        try:
+            return self._retry_or_fail(claimed_file, CLAIMED, max_attempts)
+        except FileNotFoundError:
+            return None
+
+    def requeue_stale(
+        self,
+        stale_seconds: float = QUEUE_STALE_SECONDS,
+        max_attempts: int = QUEUE_MAX_ATTEMPTS,
+    ) -> List[str]:
+        """
+        Returns claimed tasks without a heartbeat since stale_seconds to pending,
+        e.g. after a machine was preempted.
+
+        Args:
+            stale_seconds (float, optional): The time after which a claimed task
+                is considered lost.
+            max_attempts (int, optional): The number of attempts of a task.
+
+        Returns:
+            list: The names of the requeued or failed files.
+        """
+        now = time.time()
+        requeued = list()
+
+        for file in self._task_files(CLAIMED):
+            try:
+                last_heartbeat = os.path.getmtime(
+                    os.path.join(self._state_dir(CLAIMED), file)
+                )
+                if now - last_heartbeat < stale_seconds:
+                    continue
+
+                self._retry_or_fail(file, CLAIMED, max_attempts)
+                requeued.append(file)
+            except FileNotFoundError:
+                # Fertig geworden oder von einem anderen Worker neu vergeben
+                continue
+
+        return requeued
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            state: len(self._task_files(state))
+            for state in (PENDING, CLAIMED, DONE, FAILED)
+        }
+
+    def results(self) -> List[dict]:
+        results = list()
+
+        for result_file in sorted(glob(os.path.join(self._state_dir(RESULTS), "*.json"))):
+            with open(result_file, mode="r", encoding="utf-8") as saved_file:
+                results.append(json.load(saved_file))
+
+        return results
+
+
+def _keep_alive(
+    queue: ArrTaskQueue, claimed_file: str, interval: float, stop: threading.Event
+) -> None:
+    while not stop.wait(interval):
+        if not queue.heartbeat(claimed_file):
+            break
+
+
+def run_queue_worker(
+    queue_dir: str = Gp.RESULT_ARR_QUEUE.value,
+    cv_workers: int = CV_WORKERS,
+    heartbeat_seconds: float = QUEUE_HEARTBEAT_SECONDS,
+    stale_seconds: float = QUEUE_STALE_SECONDS,
+    max_attempts: int = QUEUE_MAX_ATTEMPTS,
+) -> int:
+    """
+    Claims and evaluates tasks until no task is pending or claimed any more.
+
+    While other workers still hold claimed tasks, the worker waits, so it can take
+    over their tasks if their heartbeat stops.
+
+    Args:
+        queue_dir (str, optional): The directory of the queue.
+        cv_workers (int, optional): The number of processes for the folds.
+        heartbeat_seconds (float, optional): The interval of the heartbeat.
+        stale_seconds (float, optional): The time after which a claimed task
+            without heartbeat is taken over.
+        max_attempts (int, optional): The number of attempts of a task.
+
+    Returns:
+        int: The number of tasks this worker completed.
+    """
+    queue = ArrTaskQueue(queue_dir)
+    worker = worker_name()
+    completed = 0
+
+    while True:
+        queue.requeue_stale(stale_seconds, max_attempts)
+        claimed = queue.claim()
+
+        if claimed is None:
+            if queue.counts().get(CLAIMED) == 0 and queue.counts().get(PENDING) == 0:
+                return completed
+
+            time.sleep(min(heartbeat_seconds, stale_seconds))
+            continue
+
+        claimed_file, task = claimed
+        catch_and_log_info(
+            custom_message=f"{attk_keys.QUEUE_TASK_CLAIMED.value} {task.get('TASK')} ({worker})",
+            echo_msg=True,
+        )
+
+        stop = threading.Event()
+        threading.Thread(
+            target=_keep_alive,
+            args=(queue, claimed_file, heartbeat_seconds, stop),
+            daemon=True,
+        ).start()
+
+        try:
+            options = dict(task.get("OPTIONS"), cv_workers=cv_workers)
+            combo = (task.get("LANGUAGE_CHOICE"), task.get("PROMPT_NUMBER"))
+            result = run_arr_combo(combo, options)
+        except Exception as e:
+            catch_and_log_error(
+                e,
+                custom_message=f"{attk_keys.QUEUE_TASK_FAILED.value} {task.get('TASK')}",
+                echo_msg=True,
+            )
+            queue.fail(claimed_file, e, max_attempts)
+            continue
+        finally:
+            # Der Heartbeat endet auch bei KeyboardInterrupt
+            stop.set()
+
+        queue.complete(claimed_file, task, result, worker)
+        completed += 1
+
+
+def run_local_queue_workers(
+    queue_dir: str = Gp.RESULT_ARR_QUEUE.value, processes: int = 1, **worker_options
+) -> int:
+    """
+    Runs several queue workers as processes of this machine. They share the
+    queue directory exactly like workers on different machines.
+
+    Args:
+        queue_dir (str, optional): The directory of the queue.
+        processes (int, optional): The number of worker processes.
+        **worker_options: Further keyword arguments of run_queue_worker.
+
+    Returns:
+        int: The number of completed tasks.
+    """
+    if processes <= 1:
+        return run_queue_worker(queue_dir, **worker_options)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(run_queue_worker, queue_dir, **worker_options)
+            for _ in range(processes)
+        ]
+        return sum(future.result() for future in futures)
+
+
+def collect_queue_results(
+    queue_dir: str = Gp.RESULT_ARR_QUEUE.value,
+    file_standard: str = Gp.RESULT_MULTI_ARR_SAVE.value,
+    db_file: str = Gp.RESULT_DATABASE.value,
+) -> Dict[ArrCombo, Tuple[dict, float]]:
+    """
+    Records the results of the queue as a new run of the results database and
+    exports them to the standard and the pivoted ARR file.
+
+    The results are ordered like the grid of multiple. If a combination was
+    evaluated with several seeds, its ARR and QWK are the means over the seeds.
+
+    Args:
+        queue_dir (str, optional): The directory of the queue.
+        file_standard (str, optional): The path of the standard result file.
+        db_file (str, optional): The path of the results database.
+
+    Returns:
+        dict: The ARR result row and the QWK of every combination.
+    """
+    queue = ArrTaskQueue(queue_dir)
+    saved_results = queue.results()
+
+    unfinished = {
+        state: count
+        for state, count in queue.counts().items()
+        if state in (PENDING, CLAIMED, FAILED) and count
+    }
+    if unfinished:
+        catch_and_log_info(
+            custom_message=f"{attk_keys.QUEUE_UNFINISHED.value} {unfinished}",
+            echo_msg=True,
+        )
+
+    if not saved_results:
+        return dict()
+
+    with ResultsStore(db_file) as results_store:
+        run_id = results_store.start_run(attk_keys.QUEUE_COLLECT_NAME.value)
+
+        for saved in saved_results:
+            combo = (saved.get("LANGUAGE_CHOICE"), saved.get("PROMPT_NUMBER"))
+            results_store.record_combo(
+                run_id,
+                combo,
+                (saved.get("ARR_RESULT"), saved.get("QWK")),
+                seed=saved.get("SEED"),
+                fingerprint=saved.get("FINGERPRINT"),
+                scores_file=sf.arr_sentences_file(
+                    arr_training_file(*combo), saved.get("SEED")
+                ),
+            )
+
+        results_store.export_multi_arr_results(file_standard, run_id)
+
+        return results_store.multi_arr_results(run_id)
+
+
+if __name__ == "__main__":
+    pass
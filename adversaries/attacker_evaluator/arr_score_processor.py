@@ -39,6 +39,29 @@ def process_tsv_files(files) -> tuple:
     Args:
         files (list): A list containing the paths to TSV files.
 
+    Returns:
+        tuple: The `prompt_results` and `count_results` of process_scored_sentences.
+    """
+
+    scored_sentences = {}
+
+    for tsv_file in files:
+        with open(tsv_file, mode="r", encoding="utf-8") as file:
+            csv_reader = csv.reader(file, delimiter="\t")
+            scored_sentences[tsv_file] = [(sentence, score) for sentence, score in csv_reader]
+
+    return process_scored_sentences(scored_sentences)
+
+
+def process_scored_sentences(scored_sentences: dict) -> tuple:
+    """
+    This function extracts prompt and score data from scored sentences, e.g. from
+    the results database.
+
+    Args:
+        scored_sentences (dict): A dictionary where keys are the names of the ARR
+            sentence files and values are lists of (sentence, score) pairs.
+
     Returns:
         tuple: A tuple containing two dictionaries, `prompt_results` and `count_results`.
             - prompt_results (dict): A dictionary where keys are file paths and values are
@@ -52,26 +75,22 @@ def process_tsv_files(files) -> tuple:
     prompt_results = {}
     count_results = {}
 
-    for tsv_file in files:
+    for tsv_file, sentences in scored_sentences.items():
         prompt_results[tsv_file] = {str(i): [] for i in range(4)}
         count_results[tsv_file] = {str(i): [] for i in range(4)}
 
-        with open(tsv_file, mode="r", encoding="utf-8") as file:
-            csv_reader = csv.reader(file, delimiter="\t")
-            sentences = list(csv_reader)
-
-            # Basically, from each content burst file, two sentences are collected
-            # and stored in a separate file
-            for row in sentences:
-                sentence, score = row
+        # Basically, from each content burst file, two sentences are collected
+        # and stored in a separate file
+        for sentence, score in sentences:
+            score = str(score)
 
-                count_results[tsv_file][score].append(sentence)
-                # Ignore sentences with numbers
-                if pattern.search(sentence) is None:
+            count_results[tsv_file][score].append(sentence)
+            # Ignore sentences with numbers
+            if pattern.search(sentence) is None:
 
-                    # Only add two sentences from each file to the excerpt file
-                    if len(prompt_results[tsv_file][score]) < 2:
-                        prompt_results[tsv_file][score].append(sentence)
+                # Only add two sentences from each file to the excerpt file
+                if len(prompt_results[tsv_file][score]) < 2:
+                    prompt_results[tsv_file][score].append(sentence)
 
     catch_and_log_info(
         custom_message=attk_keys.TSV_FILES_PROCESSED.value, echo_msg=True
@@ -13,7 +13,11 @@ from tqdm import tqdm
 
 # Custom
 from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
-from adversaries.docs_processor.multilingual_spacy import MultiLingualSpacy as Mls
+from adversaries.docs_processor.multilingual_spacy import (
+    MultiLingualSpacy as Mls,
+    pipe_documents,
+    warm_up_spacy_models,
+)
 from adversaries.settings.logger.basic_logger import (
     catch_and_log_info,
     catch_and_log_error,
@@ -99,24 +103,36 @@ def get_pos_count(incoming_files: dict) -> dict:
     prompt_pos_count = dict()
     total_files = len(incoming_files)
 
+    # Each model is loaded once and then shared by all prompts of the language
+    warm_up_spacy_models(sorted({lang for lang, _ in incoming_files.values()}))
+
+    def report_error(file: str, error: Exception) -> None:
+        _, file_path = incoming_files[file]
+        catch_and_log_error(
+            error, f"Error processing file '{file_path}': {str(error)}", echo_msg=True
+        )
+
+    # The prompts are grouped by language and tagged in batches
     with tqdm(total=total_files, desc=attk_keys.PROMPT_FILES.value) as pbar:
-        for file, (lang, file_path) in incoming_files.items():
+        for file, doc in pipe_documents(incoming_files, on_error=report_error):
             try:
-                mulit_spacy = Mls(language=lang, incoming_document=file_path)
-
-                tags = mulit_spacy.spacy_multi_tagger(
-                    return_pos_count=True, process_document=True
-                )
+                tags = Mls.analyse_doc(doc, return_pos_count=True)
 
                 spacy_pos_count = sum_pos_counts(tags)
-                file = file.replace(".txt", "").replace("_", " ")
-                prompt_pos_count[file] = spacy_pos_count
+                prompt = file.replace(".txt", "").replace("_", " ")
+                prompt_pos_count[prompt] = spacy_pos_count
                 pbar.update(1)  # Update progress bar for each file processed
 
             except Exception as e:
-                catch_and_log_error(
-                    e, f"Error processing file '{file_path}': {str(e)}", echo_msg=True
-                )
+                report_error(file, e)
+
+    # Keep the order of the incoming files, the batches are grouped by language
+    prompt_order = [file.replace(".txt", "").replace("_", " ") for file in incoming_files]
+    prompt_pos_count = {
+        prompt: prompt_pos_count.get(prompt)
+        for prompt in prompt_order
+        if prompt in prompt_pos_count
+    }
 
     return prompt_pos_count
 
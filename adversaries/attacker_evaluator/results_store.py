@@ -0,0 +1,377 @@
+# Standard
+import csv
+import json
+import os
+import socket
+import sqlite3
+
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Pip
+# None
+
+# Custom
+from adversaries.attacker_evaluator.arr_grid import (
+    ArrCombo,
+    grid_order,
+    write_multi_arr_results,
+)
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    CONTENT_BURST_SEED,
+    PREDICT_CHUNK_SIZE,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+RESULT_TABLES = ("runs", "combos", "metrics", "predictions")
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    command TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    options TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS combos (
+    combo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    language TEXT NOT NULL,
+    prompt_number INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    language_code TEXT NOT NULL,
+    fingerprint TEXT,
+    scores_file TEXT
+);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    combo_id INTEGER NOT NULL REFERENCES combos (combo_id),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (combo_id, metric)
+);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    combo_id INTEGER NOT NULL REFERENCES combos (combo_id),
+    position INTEGER NOT NULL,
+    sentence TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (combo_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS combos_by_grid
+    ON combos (language, prompt_number, seed, combo_id);
+CREATE INDEX IF NOT EXISTS combos_by_run ON combos (run_id);
+CREATE INDEX IF NOT EXISTS predictions_by_score ON predictions (combo_id, score);
+
+-- Eine Zeile pro ausgewerteter Kombination mit ARR und QWK
+CREATE VIEW IF NOT EXISTS combo_metrics AS
+SELECT
+    combos.*,
+    (SELECT value FROM metrics
+     WHERE metrics.combo_id = combos.combo_id AND metric = 'ARR') AS arr,
+    (SELECT value FROM metrics
+     WHERE metrics.combo_id = combos.combo_id AND metric = 'QWK') AS qwk
+FROM combos;
+
+-- Nur die letzte Auswertung jeder Sprache, jedes Prompts und jedes Seeds
+CREATE VIEW IF NOT EXISTS latest_combo_metrics AS
+SELECT * FROM combo_metrics
+WHERE combo_id = (
+    SELECT MAX(latest.combo_id) FROM combos AS latest
+    WHERE latest.language = combo_metrics.language
+        AND latest.prompt_number = combo_metrics.prompt_number
+        AND latest.seed = combo_metrics.seed
+);
+
+-- content_bursts_arr_results.csv, gemittelt ueber die Seeds
+CREATE VIEW IF NOT EXISTS multi_arr_results AS
+SELECT
+    language, prompt_number, method, prompt, language_code,
+    AVG(arr) AS arr, AVG(qwk) AS qwk, COUNT(seed) AS seeds
+FROM latest_combo_metrics
+GROUP BY language, prompt_number;
+
+-- arr_sentences_results/*.tsv
+CREATE VIEW IF NOT EXISTS arr_sentences_results AS
+SELECT
+    latest_combo_metrics.language, latest_combo_metrics.prompt_number,
+    latest_combo_metrics.seed, latest_combo_metrics.scores_file,
+    predictions.position, predictions.sentence, predictions.score
+FROM latest_combo_metrics
+JOIN predictions ON predictions.combo_id = latest_combo_metrics.combo_id;
+"""
+
+# Die Ergebnisse werden nur angehaengt, nie geaendert oder geloescht
+APPEND_ONLY_TRIGGERS = "\n".join(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {table}_no_{action}
+    BEFORE {action.upper()} ON {table}
+    BEGIN SELECT RAISE(ABORT, 'The results store is append-only'); END;
+    """
+    for table in RESULT_TABLES
+    for action in ("update", "delete")
+)
+
+
+def read_scored_sentences(scores_file: str) -> Iterator[Tuple[int, str, int]]:
+    """
+    Reads the scored sentences of an ARR sentence file.
+
+    Args:
+        scores_file (str): The TSV file of the sentences and their scores.
+
+    Yields:
+        tuple: The position, the sentence and the score.
+    """
+    with open(scores_file, mode="r", encoding="utf-8", newline="") as file:
+        for position, (sentence, score) in enumerate(
+            csv.reader(file, delimiter="\t")
+        ):
+            yield position, sentence, int(score)
+
+
+class ResultsStore:
+    """
+    An SQLite database of every evaluation: the runs, the combinations with their
+    ARR and QWK and the predicted score of every sentence.
+
+    The tables are append-only, a new evaluation of a combination is added next
+    to the old ones and the views show the latest of them. The CSV files of the
+    results are exported from the views.
+
+    Attributes:
+        db_file (str): The path of the database.
+        connection (sqlite3.Connection): The connection to the database.
+
+    Methods:
+        start_run(command, options): Records a new run.
+        record_combo(run_id, combo, result, ...): Records an evaluated combination.
+        multi_arr_results(run_id): The ARR and QWK of the combinations.
+        export_multi_arr_results(file_standard, run_id): Writes the ARR CSVs.
+        sentence_scores(seed): The scored sentences of the latest evaluations.
+    """
+
+    def __init__(self, db_file: str = Gp.RESULT_DATABASE.value):
+        """
+        Initialize the ResultsStore object and create the tables and views.
+
+        Args:
+            db_file (str, optional): The path of the database.
+        """
+        self.db_file = db_file
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Mehrere Prozesse koennen warten, bis die Datenbank frei ist
+        self.connection = sqlite3.connect(db_file, timeout=60)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(RESULTS_SCHEMA + APPEND_ONLY_TRIGGERS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def start_run(self, command: str, options: Optional[dict] = None) -> int:
+        """
+        Records a new run, e.g. of the command multiple.
+
+        Args:
+            command (str): The name of the command.
+            options (dict, optional): The options of the run.
+
+        Returns:
+            int: The id of the run.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (command, started_at, worker, options) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    command,
+                    datetime.now().isoformat(timespec="seconds"),
+                    f"{socket.gethostname()}-{os.getpid()}",
+                    json.dumps(options or dict(), sort_keys=True, default=str),
+                ),
+            )
+
+        return cursor.lastrowid
+
+    def record_combo(
+        self,
+        run_id: int,
+        combo: ArrCombo,
+        result: Tuple[dict, float],
+        seed: int = CONTENT_BURST_SEED,
+        fingerprint: Optional[str] = None,
+        scores_file: Optional[str] = None,
+        batch_size: int = PREDICT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Records an evaluated combination, its ARR and QWK and its scored sentences
+        in one transaction. The sentences are inserted in batches.
+
+        Args:
+            run_id (int): The id of the run.
+            combo (tuple): The language and the prompt number.
+            result (tuple): The ARR result row and the QWK.
+            seed (int, optional): The seed of the bursts.
+            fingerprint (str, optional): The fingerprint of the inputs.
+            scores_file (str, optional): The TSV file of the scored sentences, it
+                is skipped if it does not exist.
+            batch_size (int, optional): The number of sentences per insert.
+
+        Returns:
+            int: The id of the recorded combination.
+        """
+        arr_data_results, cross_valid_qwk = result
+        language_choice, prompt_num = combo
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO combos (run_id, language, prompt_number, seed, method, "
+                "prompt, language_code, fingerprint, scores_file) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    language_choice,
+                    int(prompt_num),
+                    seed,
+                    arr_data_results.get("METHOD"),
+                    arr_data_results.get("PROMPT"),
+                    arr_data_results.get("LANGUAGE"),
+                    fingerprint,
+                    scores_file,
+                ),
+            )
+            combo_id = cursor.lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO metrics (combo_id, metric, value) VALUES (?, ?, ?)",
+                [
+                    (combo_id, "ARR", float(arr_data_results.get("ARR"))),
+                    (combo_id, "QWK", float(cross_valid_qwk)),
+                ],
+            )
+
+            if scores_file is not None and os.path.exists(scores_file):
+                sentences = read_scored_sentences(scores_file)
+                while batch := list(islice(sentences, batch_size)):
+                    self.connection.executemany(
+                        "INSERT INTO predictions (combo_id, position, sentence, score) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(combo_id, *sentence) for sentence in batch],
+                    )
+
+        return combo_id
+
+    def multi_arr_results(
+        self, run_id: Optional[int] = None
+    ) -> Dict[ArrCombo, Tuple[dict, float]]:
+        """
+        Returns the ARR and the QWK of every combination in the order of the grid.
+        Several seeds of a combination are averaged.
+
+        Args:
+            run_id (int, optional): Only the combinations of this run. Without a
+                run, the latest evaluation of every combination.
+
+        Returns:
+            dict: The ARR result row and the QWK of every combination.
+        """
+        if run_id is None:
+            rows = self.connection.execute("SELECT * FROM multi_arr_results")
+        else:
+            rows = self.connection.execute(
+                "SELECT language, prompt_number, method, prompt, language_code, "
+                "AVG(arr) AS arr, AVG(qwk) AS qwk, COUNT(seed) AS seeds "
+                "FROM combo_metrics WHERE run_id = ? "
+                "GROUP BY language, prompt_number",
+                (run_id,),
+            )
+
+        results = dict()
+        for row in rows:
+            arr_data_results = {
+                "METHOD": row["method"],
+                "PROMPT": row["prompt"],
+                "PROMPT_NUMBER": row["prompt_number"],
+                "LANGUAGE": row["language_code"],
+                "ARR": row["arr"] if row["seeds"] == 1 else round(row["arr"], 3),
+            }
+            results[(row["language"], row["prompt_number"])] = (
+                arr_data_results,
+                row["qwk"],
+            )
+
+        if not results:
+            raise Cem.ResultsStoreEmptyError(self.db_file)
+
+        return {combo: results[combo] for combo in sorted(results, key=grid_order)}
+
+    def export_multi_arr_results(
+        self,
+        file_standard: str = Gp.RESULT_MULTI_ARR_SAVE.value,
+        run_id: Optional[int] = None,
+    ) -> Tuple[str, str]:
+        """
+        Exports the ARR and QWK of the combinations to the standard and the
+        pivoted result file.
+
+        Args:
+            file_standard (str, optional): The path of the standard result file.
+            run_id (int, optional): Only the combinations of this run.
+
+        Returns:
+            tuple: The paths of the standard and the pivoted result file.
+        """
+        return write_multi_arr_results(self.multi_arr_results(run_id), file_standard)
+
+    def sentence_scores(
+        self, seed: int = CONTENT_BURST_SEED
+    ) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Returns the scored sentences of the latest evaluation of every combination.
+
+        Args:
+            seed (int, optional): The seed of the bursts.
+
+        Returns:
+            dict: The sentences and their scores, by the name of their ARR
+            sentence file.
+        """
+        scored_sentences = dict()
+
+        for row in self.connection.execute(
+            "SELECT scores_file, sentence, score FROM arr_sentences_results "
+            "WHERE seed = ? ORDER BY language, prompt_number, position",
+            (seed,),
+        ):
+            scored_sentences.setdefault(row["scores_file"], list()).append(
+                (row["sentence"], row["score"])
+            )
+
+        if not scored_sentences:
+            raise Cem.ResultsStoreEmptyError(self.db_file)
+
+        return scored_sentences
+
+
+if __name__ == "__main__":
+    pass
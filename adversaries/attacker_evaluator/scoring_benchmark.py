@@ -0,0 +1,85 @@
+# Standard
+import time
+
+from typing import Iterable, List
+
+# Pip
+import numpy as np
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.settings.constants.constant_vars import CV_WORKERS
+
+
+def benchmark_scoring_models(
+    training_file: str,
+    adversarials: Iterable[str],
+    configurations: dict,
+    n_jobs: int = CV_WORKERS,
+) -> List[dict]:
+    """
+    Compares scoring model configurations on the same training data and adversarials.
+
+    Every configuration is cross-validated and fitted on the full training data,
+    the fitted model is never taken from the model store, so the fit time is
+    measured. The first configuration is the baseline the others are compared to.
+
+    Args:
+        training_file (str): Path to the training data file.
+        adversarials (Iterable[str]): The adversarial answers.
+        configurations (dict): The name and the keyword arguments of
+            construct_svm_scoring_model of every configuration.
+        n_jobs (int, optional): The number of processes used for the folds.
+
+    Returns:
+        List[dict]: The QWK, ARR, fit time, prediction throughput and the share of
+        predictions which agree with the baseline of every configuration.
+    """
+    training_data = sf.load_training_data(training_file)
+    adversarials = list(adversarials)
+
+    results = list()
+    baseline_pred = None
+
+    for name, model_arguments in configurations.items():
+        cv_results = sf.cross_validation_folds(
+            sf.construct_svm_scoring_model(**model_arguments),
+            training_file,
+            n_jobs,
+            training_data,
+        )
+
+        start = time.perf_counter()
+        model = sf.fit_scoring_model(
+            sf.construct_svm_scoring_model(**model_arguments),
+            training_file,
+            use_model_store=False,
+            training_data=training_data,
+        )
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(adversarials)
+        predict_seconds = time.perf_counter() - start
+
+        if baseline_pred is None:
+            baseline_pred = y_pred
+
+        results.append(
+            {
+                "MODEL": name,
+                "QWK": round(cv_results.get("QWK"), 3),
+                "ARR": round(float(np.mean(y_pred == 0)), 3),
+                "FIT_SECONDS": round(fit_seconds, 3),
+                "PREDICTIONS_PER_SECOND": round(
+                    len(adversarials) / max(predict_seconds, 1e-9)
+                ),
+                "AGREEMENT": round(float(np.mean(y_pred == baseline_pred)), 3),
+            }
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    pass
@@ -7,7 +7,9 @@ import csv
 
 # Standard
 import os
-from typing import Tuple
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
 
 # https://scikit-learn.org/stable/tutorial/text_analytics/working_with_text_data.html
 # https://scikit-learn.org/stable/common_pitfalls.html
@@ -15,44 +17,237 @@ from typing import Tuple
 # Pip
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+from scipy import stats
+from joblib import Parallel, delayed, effective_n_jobs
 from pathlib import Path
 
 from sklearn import svm
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDClassifier
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from sklearn.metrics import cohen_kappa_score, make_scorer
-from sklearn.model_selection import KFold, cross_val_score
+from sklearn.model_selection import KFold, cross_validate
 from sklearn.pipeline import Pipeline, FeatureUnion
-from sklearn.preprocessing import FunctionTransformer, MinMaxScaler
+from sklearn.preprocessing import MinMaxScaler
+
+# Custom
+from adversaries.attacker_evaluator.scoring_model_store import SCORING_MODEL_STORE
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    ARR_CONFIDENCE,
+    ARR_INTERVAL_METHOD,
+    CLASSIFIER,
+    CONTENT_BURST_SEED,
+    CV_WORKERS,
+    FEATURE_CHUNK_SIZE,
+    FEATURE_MODE,
+    FEATURE_WORKERS,
+    HASHING_N_FEATURES,
+    NYSTROEM_COMPONENTS,
+    PARTIAL_FIT,
+    PREDICT_CHUNK_SIZE,
+    PREDICT_WORKERS,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+# Merkmalsextraktion: Vokabular zaehlen oder zustandslos hashen
+COUNT_FEATURES = "count"
+HASHING_FEATURES = "hashing"
+FEATURE_MODES = (COUNT_FEATURES, HASHING_FEATURES)
+
+# Klassifikatoren: SVC ist die Baseline, die anderen skalieren linear
+SVC_CLASSIFIER = "svc"
+LINEAR_SVC_CLASSIFIER = "linear_svc"
+SGD_CLASSIFIER = "sgd"
+NYSTROEM_CLASSIFIER = "nystroem"
+CLASSIFIERS = (
+    SVC_CLASSIFIER,
+    LINEAR_SVC_CLASSIFIER,
+    SGD_CLASSIFIER,
+    NYSTROEM_CLASSIFIER,
+)
+
+# Konfidenzintervalle der ARR
+WILSON_INTERVAL = "wilson"
+CLOPPER_PEARSON_INTERVAL = "clopper_pearson"
+ARR_INTERVAL_METHODS = (WILSON_INTERVAL, CLOPPER_PEARSON_INTERVAL)
+
+
+# see https://stackoverflow.com/questions/39121104/how-to-add-another-feature-length-of-text-to-current-bag-of-words-classificati
+# Antwortlänge (hier sehr simpel als Anzahl der Zeichen)
+def answer_length(x):
+    # reshape(-1, 1) is nötig, damit das Array die richtige Form für die Weiterverarbeitung hat
+    return np.array([len(answer) for answer in x]).reshape(-1, 1)
+
+
+class AnswerLengthScaler(TransformerMixin, BaseEstimator):
+    """
+    The answer length as a feature, rescaled to the range of the training answers.
 
+    The minimum and maximum length are learned in fit, so the feature of an answer
+    does not depend on the other answers it is transformed with. Chunked, parallel
+    and cached predictions are therefore identical.
 
-def construct_svm_scoring_model():
+    Methods:
+        fit(X, y): Learns the minimum and maximum length of the answers.
+        transform(X): Returns the rescaled lengths of the answers.
+    """
+
+    def fit(self, X, y=None):
+        """
+        Learns the minimum and maximum length of the training answers.
+
+        Args:
+            X (Iterable[str]): The training answers.
+            y: Ignored.
+
+        Returns:
+            AnswerLengthScaler: The fitted transformer.
+        """
+        # re-scalen, damit Werte zwischen 0 und 1 liegen, so wie bei TF-IDF
+        self.scaler_ = MinMaxScaler().fit(answer_length(X))
+        return self
+
+    def transform(self, X):
+        """
+        Returns the lengths of the answers rescaled with the training range.
+        Answers longer than the longest training answer get values above 1.
+
+        Args:
+            X (Iterable[str]): The answers.
+
+        Returns:
+            np.ndarray: The rescaled lengths as a column.
+        """
+        return self.scaler_.transform(answer_length(X))
+
+
+def construct_ngram_vectorizers(
+    feature_mode: str = COUNT_FEATURES, n_features: int = HASHING_N_FEATURES
+) -> tuple:
+    """
+    Constructs the vectorizers of the character and word n-grams.
+
+    In the 'count' mode, the vocabulary of all n-grams is built and pruned to the
+    10000 most frequent ones. In the 'hashing' mode, the n-grams are hashed into
+    n_features columns. No vocabulary is kept, so the memory is bounded and the
+    transform is stateless.
+
+    Args:
+        feature_mode (str, optional): 'count' or 'hashing' (default is 'count').
+        n_features (int, optional): The number of columns per vectorizer in the
+            'hashing' mode.
+
+    Returns:
+        tuple: The character and the word n-gram vectorizer.
+    """
+    if feature_mode == COUNT_FEATURES:
+        char_tfidf = CountVectorizer(
+            analyzer="char", ngram_range=(2, 5), max_features=10000
+        )
+        word_tfidf = CountVectorizer(
+            analyzer="word", ngram_range=(1, 5), max_features=10000
+        )
+    elif feature_mode == HASHING_FEATURES:
+        # Wie beim CountVectorizer: rohe Haeufigkeiten ohne Vorzeichen
+        char_tfidf = HashingVectorizer(
+            analyzer="char",
+            ngram_range=(2, 5),
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+        )
+        word_tfidf = HashingVectorizer(
+            analyzer="word",
+            ngram_range=(1, 5),
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+        )
+    else:
+        raise Cem.FeatureModeError(feature_mode, FEATURE_MODES)
+
+    return char_tfidf, word_tfidf
+
+
+def construct_classifier(
+    classifier: str = SVC_CLASSIFIER, n_components: int = NYSTROEM_COMPONENTS
+):
+    """
+    Constructs the classifier of the scoring model.
+
+    'svc' is the RBF kernel SVC whose fit time grows superlinearly with the
+    number of answers. 'linear_svc' and 'sgd' (which supports partial_fit) are
+    linear models. 'nystroem' approximates the RBF kernel with n_components
+    samples and trains a LinearSVC on the approximated features.
+
+    Args:
+        classifier (str, optional): The name of the classifier (default is 'svc').
+        n_components (int, optional): The number of Nystroem samples.
+
+    Returns:
+        The unfitted classifier.
+    """
+    if classifier == SVC_CLASSIFIER:
+        return svm.SVC(random_state=123)
+
+    if classifier == LINEAR_SVC_CLASSIFIER:
+        return svm.LinearSVC(random_state=123)
+
+    if classifier == SGD_CLASSIFIER:
+        return SGDClassifier(loss="hinge", random_state=123)
+
+    if classifier == NYSTROEM_CLASSIFIER:
+        return Pipeline(
+            [
+                ("kernel", Nystroem(n_components=n_components, random_state=123)),
+                ("svm", svm.LinearSVC(random_state=123)),
+            ]
+        )
+
+    raise Cem.ClassifierError(classifier, CLASSIFIERS)
+
+
+def construct_svm_scoring_model(
+    memory: str = None,
+    feature_mode: str = FEATURE_MODE,
+    n_features: int = HASHING_N_FEATURES,
+    classifier: str = CLASSIFIER,
+    partial_fit: bool = PARTIAL_FIT,
+):
     """
     Constructs an SVM-based scoring model for text data.
 
+    Args:
+        memory (str, optional): Directory in which the fitted features
+            (vectorizer vocabularies) are cached by the Pipeline (default is None).
+        feature_mode (str, optional): 'count' or 'hashing' n-gram features
+            (default is FEATURE_MODE).
+        n_features (int, optional): The number of hashed columns per vectorizer
+            in the 'hashing' mode (default is HASHING_N_FEATURES).
+        classifier (str, optional): 'svc', 'linear_svc', 'sgd' or 'nystroem'
+            (default is CLASSIFIER).
+        partial_fit (bool, optional): Whether the model is fitted chunk by chunk,
+            which needs the 'hashing' feature mode and the 'sgd' classifier
+            (default is PARTIAL_FIT).
+
     Returns:
         Pipeline: SVM-based scoring model pipeline.
+
+    Raises:
+        Cem.PartialFitError: If partial_fit is set for other features or
+            classifiers.
     """
     ##########################################
     # Feature Extraction
-
-    # see https://stackoverflow.com/questions/39121104/how-to-add-another-feature-length-of-text-to-current-bag-of-words-classificati
-    # Antwortlänge (hier sehr simpel als Anzahl der Zeichen)
-    def answer_length(x):
-        # reshape(-1, 1) is nötig, damit das Array die richtige Form für die Weiterverarbeitung hat
-        lengths = np.array([len(answer) for answer in x]).reshape(-1, 1)
-        # re-scalen, damit Werte zwischen 0 und 1 liegen, so wie bei TF-IDF
-        rescaled = MinMaxScaler().fit_transform(lengths)
-        return rescaled
-
-    answer_length_feature = FunctionTransformer(answer_length)
+    answer_length_feature = AnswerLengthScaler()
 
     # Wort- und Buchstaben-N-Gramme extrahieren
-    char_tfidf = CountVectorizer(
-        analyzer="char", ngram_range=(2, 5), max_features=10000
-    )
-    word_tfidf = CountVectorizer(
-        analyzer="word", ngram_range=(1, 5), max_features=10000
-    )
+    char_tfidf, word_tfidf = construct_ngram_vectorizers(feature_mode, n_features)
 
     features = FeatureUnion(
         [
@@ -64,64 +259,330 @@ def construct_svm_scoring_model():
 
     ##########################################
     # Pipeline bauen
-    model = Pipeline([("features", features), ("clf", svm.SVC(random_state=123))])
+    steps = [("features", features), ("clf", construct_classifier(classifier))]
+
+    if partial_fit:
+        if feature_mode != HASHING_FEATURES or classifier != SGD_CLASSIFIER:
+            raise Cem.PartialFitError(
+                type(char_tfidf).__name__, type(steps[-1][1]).__name__
+            )
+        return ChunkedFitPipeline(steps, memory=memory)
+
+    model = Pipeline(steps, memory=memory)
     return model
 
 
-def cross_validation_qwk(model: Pipeline, training_file: str) -> float:
+def transform_in_chunks(
+    transformer,
+    texts: Iterable[str],
+    chunk_size: int = FEATURE_CHUNK_SIZE,
+    n_jobs: int = 1,
+) -> sp.csr_matrix:
     """
-    Performs cross-validation using Quadratic Weighted Kappa (QWK) as the scoring metric.
+    Transforms texts chunk by chunk, optionally in several processes.
+
+    This is only equivalent to transformer.transform(texts) if the transformer
+    handles every text independently, e.g. a fitted or hashing vectorizer.
+
+    Args:
+        transformer: A fitted or stateless transformer.
+        texts (Iterable[str]): The texts to be transformed.
+        chunk_size (int, optional): The number of texts per chunk.
+        n_jobs (int, optional): The number of processes (default is 1).
+
+    Returns:
+        sp.csr_matrix: The stacked features of all chunks.
+    """
+    texts = list(texts)
+    chunks = [
+        texts[start : start + chunk_size] for start in range(0, len(texts), chunk_size)
+    ]
+
+    matrices = Parallel(n_jobs=n_jobs)(
+        delayed(transformer.transform)(chunk) for chunk in chunks
+    )
+
+    return sp.vstack(matrices, format="csr")
+
+
+def load_training_data(training_file: str) -> Tuple[pd.Series, pd.Series]:
+    """
+    Reads the answers and scores of a training file.
 
     Args:
-        model (Pipeline): Scoring model pipeline.
         training_file (str): Path to the training data file.
 
     Returns:
-        float: Mean QWK score across all folds.
+        tuple: The answers and the scores.
     """
-    # Fun
     training_file = Path(training_file)
     # NAs must not be filtered, otherwise answer "None" is interpreted as NA value
     training_data = pd.read_csv(training_file, sep="\t", na_filter=False)
 
-    X = training_data["text"]  # "Features"
+    return training_data["text"], training_data["score"]
 
-    y = training_data["score"]  # Target variable
+
+def fit_scoring_model(
+    model: Pipeline,
+    training_file: str,
+    use_model_store: bool = True,
+    training_data: Tuple[pd.Series, pd.Series] = None,
+) -> Pipeline:
+    """
+    Fits a scoring model on the full training data. If the same model has already
+    been fitted on the same training file, it is loaded from the model store.
+
+    Args:
+        model (Pipeline): Scoring model pipeline.
+        training_file (str): Path to the training data file.
+        use_model_store (bool, optional): Whether fitted models are loaded from and
+            saved to the model store (default is True).
+        training_data (tuple, optional): The answers and scores of the training
+            file, if they have already been read.
+
+    Returns:
+        Pipeline: The fitted model. This is a loaded copy if the model was stored.
+    """
+    if use_model_store:
+        key = SCORING_MODEL_STORE.cache_key(model, training_file)
+        stored_model = SCORING_MODEL_STORE.load(key)
+
+        if stored_model is not None:
+            return stored_model
+
+    X, y = training_data or load_training_data(training_file)
+    model.fit(X, y)  # auf ganzem Datenset trainieren
+
+    if use_model_store:
+        SCORING_MODEL_STORE.save(key, model)
+
+    return model
+
+
+def partial_fit_scoring_model(
+    model: Pipeline,
+    training_data: Tuple[pd.Series, pd.Series],
+    chunk_size: int = FEATURE_CHUNK_SIZE,
+    epochs: int = 5,
+    n_jobs: int = FEATURE_WORKERS,
+) -> Pipeline:
+    """
+    Fits a scoring model chunk by chunk with partial_fit, so the features of the
+    whole training data never have to be in memory at once.
+
+    This needs stateless features ('hashing') and a classifier with partial_fit
+    ('sgd'). The features of n_jobs chunks are computed in parallel with
+    transform_in_chunks, the classifier learns them one chunk after another.
+
+    Args:
+        model (Pipeline): Scoring model pipeline.
+        training_data (tuple): The answers and the scores.
+        chunk_size (int, optional): The number of answers per chunk.
+        epochs (int, optional): How often the training data is passed (default is 5).
+        n_jobs (int, optional): The number of processes computing the features
+            (default is FEATURE_WORKERS).
+
+    Returns:
+        Pipeline: The fitted model.
+    """
+    features, clf = model["features"], model["clf"]
+    char_tfidf = features.get_params()["char"]
+
+    if not isinstance(char_tfidf, HashingVectorizer) or not hasattr(
+        clf, "partial_fit"
+    ):
+        raise Cem.PartialFitError(type(char_tfidf).__name__, type(clf).__name__)
+
+    X, y = training_data
+    classes = np.unique(y)
+
+    # Die N-Gramme sind zustandslos, aber die Antwortlaenge lernt ihr Minimum und
+    # Maximum: beides muss aus allen Antworten kommen, nicht nur aus dem ersten
+    # Chunk. Dafuer wird nur die Laenge jeder Antwort gebraucht.
+    features.fit(X)
+
+    # Es sind hoechstens n_jobs Chunks gleichzeitig im Speicher
+    block_size = chunk_size * effective_n_jobs(n_jobs)
+
+    for _ in range(epochs):
+        for block_start in range(0, len(X), block_size):
+            X_block = transform_in_chunks(
+                features,
+                X.iloc[block_start : block_start + block_size],
+                chunk_size,
+                n_jobs,
+            )
+            y_block = y.iloc[block_start : block_start + block_size]
+
+            for start in range(0, X_block.shape[0], chunk_size):
+                clf.partial_fit(
+                    X_block[start : start + chunk_size],
+                    y_block.iloc[start : start + chunk_size],
+                    classes=classes,
+                )
+
+    return model
+
+
+class ChunkedFitPipeline(Pipeline):
+    """
+    A scoring model pipeline whose fit uses partial_fit_scoring_model. Cross
+    validation, fit_scoring_model and the model store treat it like any Pipeline.
+
+    Args:
+        steps (list): The steps of the Pipeline.
+        memory (str, optional): Passed on to the Pipeline (default is None).
+        verbose (bool, optional): Passed on to the Pipeline (default is False).
+        chunk_size (int, optional): The number of answers per chunk
+            (default is FEATURE_CHUNK_SIZE).
+        epochs (int, optional): How often the training data is passed (default is 5).
+        n_jobs (int, optional): The number of processes computing the features
+            (default is FEATURE_WORKERS).
+    """
+
+    def __init__(
+        self,
+        steps,
+        *,
+        memory=None,
+        verbose=False,
+        chunk_size: int = FEATURE_CHUNK_SIZE,
+        epochs: int = 5,
+        n_jobs: int = FEATURE_WORKERS,
+    ):
+        super().__init__(steps, memory=memory, verbose=verbose)
+        self.chunk_size = chunk_size
+        self.epochs = epochs
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y=None, **fit_params):
+        # cross_validate uebergibt die Folds je nach Eingabe als Liste oder Series
+        training_data = (pd.Series(X), pd.Series(y))
+        return partial_fit_scoring_model(
+            self, training_data, self.chunk_size, self.epochs, self.n_jobs
+        )
+
+
+def cross_validation_folds(
+    model: Pipeline,
+    training_file: str,
+    n_jobs: int = CV_WORKERS,
+    training_data: Tuple[pd.Series, pd.Series] = None,
+) -> dict:
+    """
+    Performs 10-fold cross-validation using Quadratic Weighted Kappa (QWK) as the
+    scoring metric. The folds are independent and can be run in several processes.
+
+    Args:
+        model (Pipeline): Scoring model pipeline.
+        training_file (str): Path to the training data file.
+        n_jobs (int, optional): The number of processes, -1 uses all cores
+            (default is CV_WORKERS).
+        training_data (tuple, optional): The answers and scores of the training
+            file, if they have already been read.
+
+    Returns:
+        dict: The mean QWK ('QWK') and the QWK ('FOLD_QWK'), fit time
+        ('FIT_TIME') and predict time ('PREDICT_TIME') of every fold.
+    """
+    X, y = training_data or load_training_data(training_file)
 
     cv = KFold(n_splits=10, shuffle=True, random_state=42)
     qwk_scorer = make_scorer(cohen_kappa_score, weights="quadratic")
-    cv_scores = cross_val_score(model, X, y, cv=cv, scoring=qwk_scorer)
-    return cv_scores.mean()
+
+    # joblib fuehrt die Folds in eigenen Prozessen aus (loky backend)
+    cv_results = cross_validate(
+        model, X, y, cv=cv, scoring=qwk_scorer, n_jobs=n_jobs
+    )
+
+    return {
+        "QWK": cv_results["test_score"].mean(),
+        "FOLD_QWK": cv_results["test_score"].tolist(),
+        "FIT_TIME": cv_results["fit_time"].tolist(),
+        "PREDICT_TIME": cv_results["score_time"].tolist(),
+    }
+
+
+def cross_validation_qwk(
+    model: Pipeline, training_file: str, n_jobs: int = CV_WORKERS
+) -> float:
+    """
+    Performs cross-validation using Quadratic Weighted Kappa (QWK) as the scoring metric.
+
+    Args:
+        model (Pipeline): Scoring model pipeline.
+        training_file (str): Path to the training data file.
+        n_jobs (int, optional): The number of processes used for the folds
+            (default is CV_WORKERS).
+
+    Returns:
+        float: Mean QWK score across all folds.
+    """
+    return cross_validation_folds(model, training_file, n_jobs)["QWK"]
 
 
 def arr_for_trained_model(
-    model: Pipeline, training_file: str, adversarial_file: str
+    model: Pipeline,
+    training_file: str,
+    adversarial_file: str = None,
+    adversarials: Iterable[str] = None,
+    use_model_store: bool = True,
 ) -> Tuple[np.ndarray, float]:
     """
     Computes Adversarial Rejection Rate (ARR) for a trained scoring model.
 
+    The adversarials are either passed directly, e.g. as generated by the
+    ContentBurstGenerator, or read from the adversarial file.
+
     Args:
         model (Pipeline): Trained scoring model pipeline.
         training_file (str): Path to the training data file.
-        adversarial_file (str): Path to the adversarial data file.
+        adversarial_file (str, optional): Path to the adversarial data file.
+        adversarials (Iterable[str], optional): The adversarial answers.
+        use_model_store (bool, optional): Whether a stored fitted model is used
+            instead of fitting the model again (default is True).
 
     Returns:
         tuple: Predicted scores for adversarial data and Adversarial Rejection Rate.
     """
     training_file = Path(training_file)
-    training_data = pd.read_csv(training_file, sep="\t", na_filter=False)
+    model = fit_scoring_model(model, training_file, use_model_store)
 
-    X = training_data["text"]  # "Features"
-    y = training_data["score"]  # Target variable
+    return score_adversarials(model, training_file, adversarial_file, adversarials)
 
-    model.fit(X, y)  # auf ganzem Datenset trainieren
 
+def score_adversarials(
+    model: Pipeline,
+    training_file: str,
+    adversarial_file: str = None,
+    adversarials: Iterable[str] = None,
+    scores_file: str = None,
+) -> Tuple[np.ndarray, float]:
+    """
+    Scores adversarials with a fitted model and saves the scored sentences.
+
+    Args:
+        model (Pipeline): Fitted scoring model pipeline.
+        training_file (str): Path to the training data file, used for the name
+            of the results file.
+        adversarial_file (str, optional): Path to the adversarial data file.
+        adversarials (Iterable[str], optional): The adversarial answers.
+        scores_file (str, optional): The file the scored sentences are saved to
+            (default is arr_sentences_file(training_file)).
+
+    Returns:
+        tuple: Predicted scores for adversarial data and Adversarial Rejection Rate.
+    """
     ##########################################
     # Vorhersagen für Adversarials
 
-    with open(adversarial_file, mode="r", encoding="latin-1") as f:
-        content_burst_text = pd.read_csv(f, delimiter="\t")
-        adversarials = content_burst_text["EssayText"]
+    if adversarials is not None:
+        adversarials = pd.Series(list(adversarials), dtype=object)
+    else:
+        # The burst files are written as UTF-8
+        with open(adversarial_file, mode="r", encoding="utf-8") as f:
+            content_burst_text = pd.read_csv(f, delimiter="\t", na_filter=False)
+            adversarials = content_burst_text["EssayText"]
 
     y_pred = model.predict(adversarials)
 
@@ -130,10 +591,9 @@ def arr_for_trained_model(
     arr = len([pred for pred in y_pred if pred == 0]) / len(y_pred)
 
     # Save ARR Scored results
-    path, file = os.path.split(training_file)
-    file = file.replace("ASAP", "ARR")
-    save_file = f"results/arr_sentences_results/{file}"
-    with open(save_file, mode="w+", encoding="utf-8") as out_file:
+    save_file = scores_file or arr_sentences_file(training_file)
+    os.makedirs(os.path.dirname(save_file), exist_ok=True)
+    with open(save_file, mode="w+", encoding="utf-8", newline="") as out_file:
         csv_writer = csv.writer(out_file, delimiter="\t")
 
         for a, y in zip(adversarials.to_list(), y_pred):
@@ -142,5 +602,373 @@ def arr_for_trained_model(
     return y_pred, arr
 
 
+def arr_sentences_file(
+    training_file: str, random_seed: int = None, chunked: bool = False
+) -> str:
+    """
+    Returns the file the scored adversarials of a training file are saved to.
+
+    Args:
+        training_file (str): Path to the training data file.
+        random_seed (int, optional): The seed of the bursts. The scored bursts of
+            other seeds than CONTENT_BURST_SEED are saved in a subdirectory.
+        chunked (bool, optional): Whether the bursts were scored by the chunked
+            estimation, which may stop early. They are saved in the subdirectory
+            'chunked', so they never replace the complete results.
+
+    Returns:
+        str: The path of the results file.
+    """
+    path, file = os.path.split(training_file)
+    file = file.replace("ASAP", "ARR")
+
+    results_dir = Gp.RESULT_ARR_SENTENCE_RESULTS.value
+    if chunked:
+        results_dir = f"{results_dir}/chunked"
+    if random_seed is not None and random_seed != CONTENT_BURST_SEED:
+        results_dir = f"{results_dir}/seed{random_seed}"
+
+    return f"{results_dir}/{file}"
+
+
+def iter_adversarial_chunks(
+    adversarial_files: List[str], chunk_size: int = PREDICT_CHUNK_SIZE
+) -> Iterator[List[str]]:
+    """
+    Streams the adversarials of burst files in chunks. Compressed (.gz, .xz) and
+    sharded burst files are supported.
+
+    Args:
+        adversarial_files (List[str]): The burst files in the order they are read.
+        chunk_size (int, optional): The number of adversarials per chunk.
+
+    Yields:
+        List[str]: The adversarials of a chunk.
+    """
+    for adversarial_file in adversarial_files:
+        chunks = pd.read_csv(
+            adversarial_file,
+            delimiter="\t",
+            na_filter=False,
+            usecols=["EssayText"],
+            encoding="utf-8",
+            chunksize=chunk_size,
+        )
+
+        for chunk in chunks:
+            yield chunk["EssayText"].to_list()
+
+
+# Das Modell wird nur einmal pro Prozess uebertragen, nicht pro Chunk
+_PREDICTION_MODEL = None
+
+
+def _init_prediction_worker(model: Pipeline) -> None:
+    global _PREDICTION_MODEL
+    _PREDICTION_MODEL = model
+
+
+def _predict_chunk(chunk: List[str]) -> np.ndarray:
+    return _PREDICTION_MODEL.predict(chunk)
+
+
+def predict_in_chunks(
+    model: Pipeline, chunks: Iterable[List[str]], n_jobs: int = PREDICT_WORKERS
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Predicts the scores of adversarials chunk by chunk, optionally in a process
+    pool. At most two chunks per process are in flight, so the memory needed
+    does not depend on the number of adversarials. The chunks keep their order.
+
+    Args:
+        model (Pipeline): Fitted scoring model pipeline.
+        chunks (Iterable[List[str]]): The adversarials in chunks.
+        n_jobs (int, optional): The number of processes. With 1, the chunks are
+            predicted in the current process (default is PREDICT_WORKERS).
+
+    Yields:
+        tuple: The adversarials of a chunk and their predicted scores.
+    """
+    if n_jobs <= 1:
+        for chunk in chunks:
+            yield chunk, model.predict(chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_prediction_worker,
+        initargs=(model,),
+    ) as executor:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_predict_chunk, chunk)))
+
+            if len(pending) >= 2 * n_jobs:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def arr_confidence_interval(
+    rejected: int,
+    total: int,
+    confidence: float = ARR_CONFIDENCE,
+    method: str = ARR_INTERVAL_METHOD,
+) -> Tuple[float, float]:
+    """
+    Returns the confidence interval of an ARR.
+
+    'wilson' is the Wilson score interval, 'clopper_pearson' the exact (and more
+    conservative) interval based on the beta distribution. Both stay within
+    [0, 1] and are valid for an ARR close to 1.
+
+    Args:
+        rejected (int): The number of adversarials with the score 0.
+        total (int): The number of scored adversarials.
+        confidence (float, optional): The confidence level (default is ARR_CONFIDENCE).
+        method (str, optional): 'wilson' or 'clopper_pearson'
+            (default is ARR_INTERVAL_METHOD).
+
+    Returns:
+        tuple: The lower and the upper bound.
+    """
+    if method not in ARR_INTERVAL_METHODS:
+        raise Cem.IntervalMethodError(method, ARR_INTERVAL_METHODS)
+
+    if total == 0:
+        return 0.0, 1.0
+
+    alpha = 1 - confidence
+
+    if method == WILSON_INTERVAL:
+        z = stats.norm.ppf(1 - alpha / 2)
+        share = rejected / total
+        denominator = 1 + z**2 / total
+        centre = (share + z**2 / (2 * total)) / denominator
+        margin = (
+            z
+            * np.sqrt(share * (1 - share) / total + z**2 / (4 * total**2))
+            / denominator
+        )
+        return max(0.0, centre - margin), min(1.0, centre + margin)
+
+    low = stats.beta.ppf(alpha / 2, rejected, total - rejected + 1) if rejected else 0.0
+    high = (
+        stats.beta.ppf(1 - alpha / 2, rejected + 1, total - rejected)
+        if rejected < total
+        else 1.0
+    )
+    return float(low), float(high)
+
+
+def estimate_arr_in_chunks(
+    model: Pipeline,
+    training_file: str,
+    adversarial_chunks: Iterable[List[str]],
+    target_width: float = None,
+    confidence: float = ARR_CONFIDENCE,
+    interval_method: str = ARR_INTERVAL_METHOD,
+    min_adversarials: int = 0,
+    n_jobs: int = PREDICT_WORKERS,
+    save_scores: bool = True,
+    scores_file: str = None,
+) -> dict:
+    """
+    Scores adversarials chunk by chunk and keeps a running ARR with its confidence
+    interval. If a target width is given, no further chunks are generated or
+    scored as soon as the interval is narrower than the target width.
+
+    The scored adversarials are appended to the results file chunk by chunk. As
+    the scoring may stop early, they are not saved to the complete results file
+    of the training file by default.
+
+    Args:
+        model (Pipeline): Fitted scoring model pipeline.
+        training_file (str): Path to the training data file, used for the name
+            of the results file.
+        adversarial_chunks (Iterable[List[str]]): The adversarials in chunks, e.g.
+            from iter_adversarial_chunks or ContentBurstGenerator.iter_burst_chunks.
+        target_width (float, optional): The interval width at which the scoring
+            stops. None scores all adversarials (default is None).
+        confidence (float, optional): The confidence level of the interval.
+        interval_method (str, optional): 'wilson' or 'clopper_pearson'.
+        min_adversarials (int, optional): The number of adversarials which are
+            scored before the scoring may stop (default is 0).
+        n_jobs (int, optional): The number of processes (default is PREDICT_WORKERS).
+        save_scores (bool, optional): Whether the scored adversarials are saved
+            (default is True).
+        scores_file (str, optional): The file the scored adversarials are saved to
+            (default is arr_sentences_file(training_file, chunked=True)).
+
+    Returns:
+        dict: The number of adversarials per predicted score ('SCORES'), the ARR,
+        the interval ('LOW', 'HIGH'), the number of scored adversarials
+        ('ADVERSARIALS') and whether the scoring stopped early ('STOPPED_EARLY').
+    """
+    score_counts = Counter()
+    low, high = 0.0, 1.0
+    stopped_early = False
+    out_file = None
+
+    predictions = predict_in_chunks(model, adversarial_chunks, n_jobs)
+
+    try:
+        if save_scores:
+            save_file = scores_file or arr_sentences_file(training_file, chunked=True)
+            os.makedirs(os.path.dirname(save_file), exist_ok=True)
+            out_file = open(save_file, mode="w+", encoding="utf-8", newline="")
+            csv_writer = csv.writer(out_file, delimiter="\t")
+
+        for chunk, y_pred in predictions:
+            score_counts.update(y_pred.tolist())
+
+            if out_file is not None:
+                csv_writer.writerows(zip(chunk, y_pred))
+
+            total = sum(score_counts.values())
+            low, high = arr_confidence_interval(
+                score_counts.get(0, 0), total, confidence, interval_method
+            )
+
+            if (
+                target_width is not None
+                and total >= min_adversarials
+                and high - low < target_width
+            ):
+                stopped_early = True
+                break
+    finally:
+        # Bei einem Abbruch werden keine neuen Chunks mehr eingereicht; der Pool
+        # wartet beim Schliessen noch auf die Chunks, die schon laufen.
+        predictions.close()
+
+        if out_file is not None:
+            out_file.close()
+
+    total = sum(score_counts.values())
+
+    return {
+        "SCORES": score_counts,
+        "ARR": score_counts.get(0, 0) / total if total else 0.0,
+        "LOW": low,
+        "HIGH": high,
+        "ADVERSARIALS": total,
+        "STOPPED_EARLY": stopped_early,
+    }
+
+
+def score_adversarials_in_chunks(
+    model: Pipeline,
+    training_file: str,
+    adversarial_chunks: Iterable[List[str]],
+    n_jobs: int = PREDICT_WORKERS,
+    save_scores: bool = True,
+    scores_file: str = None,
+) -> Tuple[Counter, float]:
+    """
+    Scores adversarials chunk by chunk and accumulates the ARR incrementally.
+    The scored adversarials are appended to the results file chunk by chunk.
+    All adversarials are scored, so they are saved to the complete results file.
+
+    Args:
+        model (Pipeline): Fitted scoring model pipeline.
+        training_file (str): Path to the training data file, used for the name
+            of the results file.
+        adversarial_chunks (Iterable[List[str]]): The adversarials in chunks, e.g.
+            from iter_adversarial_chunks or ContentBurstGenerator.iter_burst_chunks.
+        n_jobs (int, optional): The number of processes (default is PREDICT_WORKERS).
+        save_scores (bool, optional): Whether the scored adversarials are saved
+            (default is True).
+        scores_file (str, optional): The file the scored adversarials are saved to
+            (default is arr_sentences_file(training_file)).
+
+    Returns:
+        tuple: The number of adversarials per predicted score and the Adversarial
+        Rejection Rate.
+    """
+    estimate = estimate_arr_in_chunks(
+        model,
+        training_file,
+        adversarial_chunks,
+        n_jobs=n_jobs,
+        save_scores=save_scores,
+        scores_file=scores_file or arr_sentences_file(training_file),
+    )
+
+    return estimate.get("SCORES"), estimate.get("ARR")
+
+
+def evaluate_scoring_model(
+    training_file: str,
+    adversarial_file: str = None,
+    adversarials: Iterable[str] = None,
+    n_jobs: int = CV_WORKERS,
+    use_model_store: bool = True,
+    memory: str = None,
+    feature_mode: str = FEATURE_MODE,
+    classifier: str = CLASSIFIER,
+    scores_file: str = None,
+    partial_fit: bool = PARTIAL_FIT,
+) -> dict:
+    """
+    Cross-validates a scoring model, fits it on the full training data and
+    computes the ARR of the adversarials. The training file is read only once
+    and shared by the cross-validation and the final fit.
+
+    Args:
+        training_file (str): Path to the training data file.
+        adversarial_file (str, optional): Path to the adversarial data file.
+        adversarials (Iterable[str], optional): The adversarial answers.
+        n_jobs (int, optional): The number of processes used for the folds.
+        use_model_store (bool, optional): Whether a stored fitted model is used
+            instead of fitting the model again (default is True).
+        memory (str, optional): Directory in which the Pipeline caches the fitted
+            features (default is None).
+        feature_mode (str, optional): 'count' or 'hashing' n-gram features
+            (default is FEATURE_MODE).
+        classifier (str, optional): The classifier of the scoring model
+            (default is CLASSIFIER).
+        scores_file (str, optional): The file the scored adversarials are saved to
+            (default is arr_sentences_file(training_file)).
+        partial_fit (bool, optional): Whether the scoring model is fitted chunk by
+            chunk (default is PARTIAL_FIT).
+
+    Returns:
+        dict: The cross-validation results of cross_validation_folds together with
+        the predicted scores ('Y_PRED') and the ARR ('ARR').
+    """
+    training_data = load_training_data(training_file)
+
+    evaluation = cross_validation_folds(
+        construct_svm_scoring_model(
+            memory, feature_mode, classifier=classifier, partial_fit=partial_fit
+        ),
+        training_file,
+        n_jobs,
+        training_data,
+    )
+
+    model = fit_scoring_model(
+        construct_svm_scoring_model(
+            memory, feature_mode, classifier=classifier, partial_fit=partial_fit
+        ),
+        training_file,
+        use_model_store,
+        training_data,
+    )
+    y_pred, arr = score_adversarials(
+        model, training_file, adversarial_file, adversarials, scores_file
+    )
+
+    evaluation["Y_PRED"] = y_pred
+    evaluation["ARR"] = arr
+
+    return evaluation
+
+
 if __name__ == "__main__":
     pass
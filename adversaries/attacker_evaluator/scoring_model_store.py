@@ -0,0 +1,185 @@
+# Standard
+import hashlib
+import json
+import os
+import tempfile
+
+# Pip
+import joblib
+import sklearn
+
+from sklearn.base import BaseEstimator
+from sklearn.pipeline import Pipeline
+
+# Custom
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import SCORING_MODEL_CACHE_ENABLED
+
+
+def describe_parameter(value):
+    """
+    Returns a stable description of a pipeline parameter.
+
+    Estimators are described by their class, because their own parameters are
+    already part of get_params(deep=True). Functions are described by their
+    module and name instead of their memory address.
+
+    Args:
+        value: The value of the parameter.
+
+    Returns:
+        A JSON serializable description of the value.
+    """
+    if isinstance(value, BaseEstimator):
+        return f"{type(value).__module__}.{type(value).__qualname__}"
+
+    if isinstance(value, (list, tuple)):
+        return [describe_parameter(entry) for entry in value]
+
+    if isinstance(value, dict):
+        return {str(key): describe_parameter(entry) for key, entry in value.items()}
+
+    if callable(value):
+        return f"{value.__module__}.{getattr(value, '__qualname__', repr(value))}"
+
+    return repr(value)
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Returns the sha256 hash of the content of a file.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    sha = hashlib.sha256()
+
+    with open(file_path, mode="rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+class ScoringModelStore:
+    """
+    A persistent store of fitted scoring models.
+
+    Every fitted pipeline is saved as a joblib file. The key is built from the hash
+    of the training file, the hyperparameters of the pipeline and the scikit-learn
+    version, so a model is fitted again as soon as one of them changes.
+
+    Attributes:
+        model_dir (str): The directory where the joblib files are stored.
+        enabled (bool): Whether models are read from and written to the store.
+
+    Methods:
+        cache_key(model, training_file): Returns the key of a model.
+        load(key): Returns a fitted model or None.
+        save(key, model): Writes a fitted model to the store.
+    """
+
+    def __init__(
+        self,
+        model_dir: str = Gp.RESULT_MODELS.value,
+        enabled: bool = SCORING_MODEL_CACHE_ENABLED,
+    ):
+        """
+        Initialize the ScoringModelStore object.
+
+        Args:
+            model_dir (str, optional): The directory where the joblib files are stored.
+            enabled (bool, optional): Whether the store is used at all.
+        """
+        self.model_dir = model_dir
+        self.enabled = enabled
+
+    @staticmethod
+    def cache_key(model: Pipeline, training_file: str) -> str:
+        """
+        Returns the key of an unfitted model and its training file.
+
+        Args:
+            model (Pipeline): The scoring model pipeline.
+            training_file (str): Path to the training data file.
+
+        Returns:
+            str: The hexadecimal key.
+        """
+        # The feature cache of the Pipeline does not change the fitted model
+        params = model.get_params(deep=True)
+        params.pop("memory", None)
+
+        model_description = {
+            "training_file": file_hash(training_file),
+            "model": describe_parameter(model),
+            "params": describe_parameter(params),
+            "sklearn": sklearn.__version__,
+        }
+        serialized = json.dumps(model_description, sort_keys=True)
+
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _model_file(self, key: str) -> str:
+        return os.path.join(self.model_dir, f"{key}.joblib")
+
+    def load(self, key: str):
+        """
+        Loads a fitted model.
+
+        Args:
+            key (str): The key of the model.
+
+        Returns:
+            Pipeline: The fitted model or None if it is not stored.
+        """
+        model_file = self._model_file(key)
+
+        if not self.enabled or not os.path.exists(model_file):
+            return None
+
+        try:
+            return joblib.load(model_file)
+        except Exception:
+            # A broken model file is simply fitted again and overwritten
+            return None
+
+    def save(self, key: str, model: Pipeline) -> None:
+        """
+        Writes a fitted model to the store. The file is replaced atomically, so
+        parallel runs never read a half written file.
+
+        Args:
+            key (str): The key of the model.
+            model (Pipeline): The fitted model.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+
+        os.makedirs(self.model_dir, exist_ok=True)
+
+        file_descriptor, temp_file = tempfile.mkstemp(
+            dir=self.model_dir, suffix=".tmp"
+        )
+        os.close(file_descriptor)
+
+        try:
+            joblib.dump(model, temp_file)
+            os.replace(temp_file, self._model_file(key))
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+# Shared by every scoring run of the process
+SCORING_MODEL_STORE = ScoringModelStore()
+
+
+if __name__ == "__main__":
+    pass
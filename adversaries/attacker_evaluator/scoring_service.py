@@ -0,0 +1,404 @@
+# Standard
+import json
+import queue
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+# Pip
+import numpy as np
+
+from sklearn.pipeline import Pipeline
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator.arr_grid import arr_training_file
+from adversaries.burst_attack.burst_tasks import burst_task
+from adversaries.burst_attack.content_burst_generator import (
+    ContentBurstGenerator as Cbg,
+)
+from adversaries.settings.constants.constant_vars import (
+    CLASSIFIER,
+    FEATURE_MODE,
+    PARTIAL_FIT,
+    SERVE_MAX_BATCH_SIZE,
+    SERVE_MAX_BURSTS,
+    SERVE_MAX_WAIT_MS,
+)
+from adversaries.settings.logger.basic_logger import catch_and_log_error
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+class _ScoringRequest:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.scores = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class PredictionBatcher:
+    """
+    Collects the answers of concurrent requests and predicts them together.
+
+    A background thread waits at most max_wait_ms after the first request for
+    further requests, then the answers of all collected requests are predicted
+    in one call. The predictions do not depend on the batch, so every request gets
+    the same scores as if it was predicted on its own.
+
+    Attributes:
+        model (Pipeline): The fitted scoring model.
+        max_batch_size (int): The number of answers after which a batch is closed.
+        max_wait (float): The seconds a batch waits for further requests.
+
+    Methods:
+        predict(texts): Returns the scores of the answers of one request.
+    """
+
+    def __init__(
+        self,
+        model: Pipeline,
+        max_batch_size: int = SERVE_MAX_BATCH_SIZE,
+        max_wait_ms: float = SERVE_MAX_WAIT_MS,
+    ):
+        """
+        Initialize the PredictionBatcher object and start its thread.
+
+        Args:
+            model (Pipeline): The fitted scoring model.
+            max_batch_size (int, optional): The number of answers after which a
+                batch is closed.
+            max_wait_ms (float, optional): The milliseconds a batch waits for
+                further requests.
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._requests = queue.Queue()
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns the scores of the answers of one request.
+
+        Args:
+            texts (List[str]): The answers.
+
+        Returns:
+            np.ndarray: The predicted scores.
+        """
+        request = _ScoringRequest(list(texts))
+        self._requests.put(request)
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+
+        return request.scores
+
+    def _collect_batch(self) -> List[_ScoringRequest]:
+        batch = [self._requests.get()]
+        batch_size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while batch_size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            batch.append(request)
+            batch_size += len(request.texts)
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            texts = [text for request in batch for text in request.texts]
+
+            try:
+                scores = self.model.predict(texts) if texts else np.array([])
+                offset = 0
+                for request in batch:
+                    request.scores = scores[offset : offset + len(request.texts)]
+                    offset += len(request.texts)
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
+
+
+class ScoringService:
+    """
+    Keeps the fitted scoring models and the burst generators of several language
+    and prompt pairs in memory.
+
+    Attributes:
+        batchers (dict): The PredictionBatcher of every (language, prompt) pair.
+        generators (dict): The ContentBurstGenerator of every pair, created on
+            the first burst request.
+        max_bursts (int): The largest number of bursts of a request.
+
+    Methods:
+        score(language, prompt, texts): Scores answers.
+        generate_bursts(language, prompt, amount): Generates bursts.
+    """
+
+    def __init__(
+        self,
+        models: Dict[Tuple[str, str], Pipeline],
+        max_bursts: int = SERVE_MAX_BURSTS,
+    ):
+        """
+        Initialize the ScoringService object.
+
+        Args:
+            models (dict): The fitted scoring model of every (language, prompt) pair.
+            max_bursts (int, optional): The largest number of bursts of a request
+                (default is SERVE_MAX_BURSTS).
+        """
+        self.batchers = {
+            key: PredictionBatcher(model) for key, model in models.items()
+        }
+        self.generators = dict()
+        self.max_bursts = max_bursts
+        self._generator_locks = dict()
+        self._generator_lock = threading.Lock()
+
+    @staticmethod
+    def model_key(language: str, prompt) -> Tuple[str, str]:
+        return str(language), str(prompt)
+
+    def score(self, language: str, prompt, texts: List[str]) -> dict:
+        """
+        Scores answers with the model of a language and prompt.
+
+        Args:
+            language (str): The language, e.g. 'de' or 'en_orig300'.
+            prompt: The number of the prompt.
+            texts (List[str]): The answers.
+
+        Returns:
+            dict: The scores and the ARR of the answers.
+
+        Raises:
+            Cem.ScoringTextsError: If texts is not a list of strings.
+        """
+        # Ein einzelner String wuerde sonst Zeichen fuer Zeichen bewertet
+        if not isinstance(texts, list) or not all(
+            isinstance(text, str) for text in texts
+        ):
+            raise Cem.ScoringTextsError(texts)
+
+        scores = self.batchers[self.model_key(language, prompt)].predict(texts)
+
+        return {
+            "scores": scores.tolist(),
+            "arr": float(np.mean(scores == 0)) if len(scores) else 0.0,
+        }
+
+    def generate_bursts(self, language: str, prompt, amount: int) -> dict:
+        """
+        Generates bursts with the generator of a language and prompt. The
+        generator keeps its random stream, so every request gets new bursts.
+
+        Args:
+            language (str): The language, e.g. 'de' or 'en_orig300'.
+            prompt: The number of the prompt.
+            amount (int): The number of bursts.
+
+        Returns:
+            dict: The bursts.
+
+        Raises:
+            Cem.BurstAmountError: If amount is not between 1 and max_bursts.
+        """
+        if not 0 < amount <= self.max_bursts:
+            raise Cem.BurstAmountError(amount, self.max_bursts)
+
+        key = self.model_key(language, prompt)
+
+        with self._generator_lock:
+            generator_lock = self._generator_locks.setdefault(key, threading.Lock())
+
+        # Nur Anfragen an denselben Generator warten aufeinander, da sie sich
+        # seinen Zufallsstrom teilen
+        with generator_lock:
+            generator = self.generators.get(key)
+
+            if generator is None:
+                prompt_text, spacy_language, variant = burst_task(language, prompt)
+                generator = Cbg(
+                    prompt_text=prompt_text, language=spacy_language, variant=variant
+                )
+                self.generators[key] = generator
+
+            generator.burst_amount = amount
+            bursts = generator.generate_bursts()
+
+        return {"bursts": bursts}
+
+    def describe(self) -> dict:
+        return {"models": [list(key) for key in self.batchers]}
+
+
+def load_scoring_service(
+    pairs: List[Tuple[str, str]],
+    feature_mode: str = FEATURE_MODE,
+    classifier: str = CLASSIFIER,
+    partial_fit: bool = PARTIAL_FIT,
+) -> ScoringService:
+    """
+    Loads or fits the scoring models of language and prompt pairs, the same
+    models the ARR of multiple is computed with.
+
+    Args:
+        pairs (list): The (language, prompt) pairs, e.g. [('de', '1')].
+        feature_mode (str, optional): The n-gram features of the scoring models.
+        classifier (str, optional): The classifier of the scoring models.
+        partial_fit (bool, optional): Whether the scoring models are fitted chunk
+            by chunk.
+
+    Returns:
+        ScoringService: The service with the fitted models.
+    """
+    models = dict()
+
+    for language, prompt in pairs:
+        models[ScoringService.model_key(language, prompt)] = sf.fit_scoring_model(
+            sf.construct_svm_scoring_model(
+                feature_mode=feature_mode,
+                classifier=classifier,
+                partial_fit=partial_fit,
+            ),
+            arr_training_file(language, prompt),
+        )
+
+    return ScoringService(models)
+
+
+def make_request_handler(service: ScoringService):
+    """
+    Returns the HTTP request handler of a scoring service.
+
+    POST /score   {"language": "de", "prompt": 1, "texts": [...]}
+    POST /bursts  {"language": "de", "prompt": 1, "amount": 100}
+    GET  /health
+
+    Every response contains the latency of the request in milliseconds.
+
+    Args:
+        service (ScoringService): The service which handles the requests.
+
+    Returns:
+        type: The request handler class.
+    """
+
+    class ScoringRequestHandler(BaseHTTPRequestHandler):
+        def _respond(self, status: int, body: dict, start: float) -> None:
+            body["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            payload = json.dumps(body).encode("utf-8")
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            start = time.perf_counter()
+
+            if self.path == "/health":
+                self._respond(200, service.describe(), start)
+            else:
+                self._respond(404, {"error": f"Unknown path: {self.path}"}, start)
+
+        def do_POST(self) -> None:
+            start = time.perf_counter()
+
+            if self.path not in ("/score", "/bursts"):
+                self._respond(404, {"error": f"Unknown path: {self.path}"}, start)
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                language, prompt = request["language"], request["prompt"]
+
+                if self.path == "/score":
+                    arguments = (language, prompt, request["texts"])
+                else:
+                    arguments = (language, prompt, int(request.get("amount", 1000)))
+
+            except KeyError as e:
+                self._respond(400, {"error": f"Missing key: {e}"}, start)
+                return
+            except (ValueError, TypeError) as e:
+                # Kaputtes JSON (json.JSONDecodeError) oder falsche Werte
+                self._respond(400, {"error": f"Invalid request: {e}"}, start)
+                return
+
+            try:
+                if self.path == "/score":
+                    body = service.score(*arguments)
+                else:
+                    body = service.generate_bursts(*arguments)
+
+            except KeyError as e:
+                self._respond(400, {"error": f"Unknown model: {e}"}, start)
+                return
+            except (Cem.BurstAmountError, Cem.ScoringTextsError) as e:
+                self._respond(400, {"error": str(e)}, start)
+                return
+            except Exception as e:
+                catch_and_log_error(e, custom_message=f"Request {self.path} failed")
+                self._respond(500, {"error": str(e)}, start)
+                return
+
+            self._respond(200, body, start)
+
+        def log_message(self, format, *args) -> None:
+            # Tausende Anfragen sollen das Log nicht fluten
+            pass
+
+    return ScoringRequestHandler
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    # Viele gleichzeitige Verbindungen, die sonst abgewiesen wuerden
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def create_scoring_server(
+    service: ScoringService, host: str, port: int
+) -> ScoringHTTPServer:
+    """
+    Creates the HTTP server of a scoring service. Every request is handled in its
+    own thread, so concurrent requests can be batched.
+
+    Args:
+        service (ScoringService): The service which handles the requests.
+        host (str): The host, e.g. '127.0.0.1'.
+        port (int): The port, 0 chooses a free port.
+
+    Returns:
+        ScoringHTTPServer: The server, which is started with serve_forever().
+    """
+    return ScoringHTTPServer((host, port), make_request_handler(service))
+
+
+if __name__ == "__main__":
+    pass
@@ -6,11 +6,19 @@ import typer
 
 # Custom
 from adversaries.settings.constants.natural_order_group import NaturalOrderGroup
+from adversaries.burst_attack.burst_tasks import (
+    all_burst_tasks,
+    generate_bursts_parallel,
+)
 from adversaries.burst_attack.content_burst_generator import (
     ContentBurstGenerator as Cbg,
 )
 
 from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    BURST_CHUNK_SIZE,
+    BURST_WORKERS,
+)
 from adversaries.settings.logger.basic_logger import catch_and_log_info
 from adversaries.settings.messages.message_keys import MessageKeys as Mk
 
@@ -48,31 +56,101 @@ def generate_content_burst(
         content_burst_keys.SPACY_TAGGER_LANG_SHORT.value,
         help=content_burst_keys.SPACY_TAGGER_LANG_HELP.value,
     ),
-) -> None:
+    burst_amount: int = typer.Option(
+        content_burst_keys.BURST_AMOUNT_DEFAULT.value,
+        content_burst_keys.BURST_AMOUNT_LONG.value,
+        content_burst_keys.BURST_AMOUNT_SHORT.value,
+        help=content_burst_keys.BURST_AMOUNT_HELP.value,
+    ),
+    chunk_size: int = typer.Option(
+        BURST_CHUNK_SIZE,
+        content_burst_keys.CHUNK_SIZE_LONG.value,
+        help=content_burst_keys.CHUNK_SIZE_HELP.value,
+    ),
+    compression: str = typer.Option(
+        content_burst_keys.COMPRESSION_DEFAULT.value,
+        content_burst_keys.COMPRESSION_LONG.value,
+        help=content_burst_keys.COMPRESSION_HELP.value,
+    ),
+    shard_size: int = typer.Option(
+        content_burst_keys.SHARD_SIZE_DEFAULT.value,
+        content_burst_keys.SHARD_SIZE_LONG.value,
+        help=content_burst_keys.SHARD_SIZE_HELP.value,
+    ),
+) -> list:
     """Generate content bursts for the respective prompt and language
 
+    The bursts are generated and written chunk by chunk, so the memory needed
+    does not depend on the burst amount.
+
     Args:
         file_name (str): The base text file to generate bursts from.
         extend_file_save_name (str): The name to extend the saved file with.
         spacy_tagger_language (str): The language for the SpaCy tagger.
+        burst_amount (int): The number of bursts to be generated.
+        chunk_size (int): The number of bursts generated and written at once.
+        compression (str): The compression of the burst files.
+        shard_size (int): The maximum number of bursts per file.
 
     Returns:
-        None
+        list: The paths of the written burst files.
     """
     catch_and_log_info(
         custom_message=content_burst_keys.APP_NAME_HELP.value, echo_msg=True
     )
 
     # Generate content bursts
-    generator = Cbg(language=spacy_tagger_language, prompt_text=file_name)
+    generator = Cbg(
+        language=spacy_tagger_language,
+        prompt_text=file_name,
+        burst_amount=burst_amount,
+        variant=extend_file_save_name,
+    )
 
     # Save content bursts
-    bursts = generator.save_bursts(extend_file_save_name=extend_file_save_name)
+    burst_files = generator.stream_bursts(
+        extend_file_save_name=extend_file_save_name,
+        chunk_size=chunk_size,
+        compression=compression,
+        shard_size=shard_size,
+    )
+
+    catch_and_log_info(
+        custom_message=content_burst_keys.BURST_COMPLETE.value, echo_msg=True
+    )
+    return burst_files
+
+
+@app_burst_attack.command(
+    name=content_burst_keys.GENERATE_ALL_BURSTS.value,
+    help=content_burst_keys.GENERATE_ALL_BURSTS_HELP.value,
+)
+def generate_all_content_bursts(
+    workers: int = typer.Option(
+        BURST_WORKERS,
+        content_burst_keys.WORKERS_LONG.value,
+        content_burst_keys.WORKERS_SHORT.value,
+        help=content_burst_keys.WORKERS_HELP.value,
+    ),
+) -> list:
+    """Generate the content bursts of all languages and prompts in a process pool.
+
+    Args:
+        workers (int): The number of worker processes.
+
+    Returns:
+        list: The paths of the saved burst files.
+    """
+    catch_and_log_info(
+        custom_message=content_burst_keys.GENERATE_ALL_BURSTS_HELP.value, echo_msg=True
+    )
+
+    burst_files = generate_bursts_parallel(all_burst_tasks(), workers=workers)
 
     catch_and_log_info(
         custom_message=content_burst_keys.BURST_COMPLETE.value, echo_msg=True
     )
-    return bursts
+    return burst_files
 
 
 if __name__ == "__main__":
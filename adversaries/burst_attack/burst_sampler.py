@@ -0,0 +1,173 @@
+# Standard
+import math
+
+from typing import Iterator, List
+
+# Pip
+import numpy as np
+
+# Custom
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+class BurstSampler:
+    """
+    A vectorized sampler for content bursts.
+
+    The cumulative distribution of the vocabulary is computed once, afterwards
+    the words of many bursts are drawn with a few numpy calls instead of one
+    numpy.random.choice call per word. The bursts follow the rules of the
+    former per-word loop: the first word is drawn uniformly from all grams,
+    every further word is drawn according to the frequencies, single character
+    grams are skipped and words are added until the burst reaches the target
+    length.
+
+    Attributes:
+        grams (np.ndarray): The vocabulary.
+        gram_lengths (np.ndarray): The number of characters of each gram.
+        cdf (np.ndarray): The cumulative distribution of the grams with more than
+            one character.
+
+    Methods:
+        sample_indices(amount, target_length, rng): Draws the grams of the bursts.
+        sample(amount, target_length, rng): Returns the bursts as strings.
+        iter_chunks(amount, target_length, rng, chunk_size): Streams the bursts
+            in chunks.
+        iter_bursts(amount, target_length, rng, chunk_size): Streams the bursts.
+    """
+
+    def __init__(self, grams: List[str], frequency: List[float]):
+        """
+        Initialize the BurstSampler object.
+
+        Args:
+            grams (List[str]): List of grams.
+            frequency (List[float]): Frequency of grams.
+        """
+        self.grams = np.asarray(grams, dtype=object)
+        self.gram_lengths = np.fromiter(
+            (len(gram) for gram in grams), dtype=np.int64, count=len(grams)
+        )
+
+        # Single character grams are never appended, so drawing from the
+        # remaining grams equals drawing from all grams and skipping them.
+        self._word_indices = np.flatnonzero(self.gram_lengths > 1)
+        weights = np.asarray(frequency, dtype=np.float64)[self._word_indices]
+
+        if len(self.grams) == 0 or weights.sum() <= 0:
+            raise Cem.ContentBurstVocabularyError(len(self.grams))
+
+        self.cdf = np.cumsum(weights)
+        self.cdf /= self.cdf[-1]
+
+    def _draw_words(self, shape: tuple, rng: np.random.Generator) -> np.ndarray:
+        positions = np.searchsorted(self.cdf, rng.random(shape), side="right")
+        # Guard against rounding at the upper end of the distribution
+        np.minimum(positions, len(self.cdf) - 1, out=positions)
+        return self._word_indices[positions]
+
+    def sample_indices(
+        self, amount: int, target_length: int, rng: np.random.Generator
+    ) -> List[np.ndarray]:
+        """
+        Draws the gram indices of several bursts at once.
+
+        Args:
+            amount (int): The number of bursts.
+            target_length (int): The minimum number of characters of a burst.
+            rng (np.random.Generator): The random number generator.
+
+        Returns:
+            List[np.ndarray]: The gram indices of every burst.
+        """
+        starts = rng.integers(len(self.grams), size=amount)
+        start_lengths = self.gram_lengths[starts]
+
+        # Every appended word adds at least three characters (space + 2 chars)
+        max_words = max(1, math.ceil(target_length / 3))
+        words = self._draw_words((amount, max_words), rng)
+
+        sentence_lengths = start_lengths[:, None] + np.cumsum(
+            self.gram_lengths[words] + 1, axis=1
+        )
+        word_counts = np.where(
+            start_lengths >= target_length,
+            0,
+            np.argmax(sentence_lengths >= target_length, axis=1) + 1,
+        )
+
+        return [
+            np.concatenate(([start], row[:count]))
+            for start, row, count in zip(starts, words, word_counts)
+        ]
+
+    def sample(
+        self, amount: int, target_length: int, rng: np.random.Generator
+    ) -> List[str]:
+        """
+        Generates several bursts at once.
+
+        Args:
+            amount (int): The number of bursts.
+            target_length (int): The minimum number of characters of a burst.
+            rng (np.random.Generator): The random number generator.
+
+        Returns:
+            List[str]: The generated bursts.
+        """
+        return [
+            " ".join(self.grams[indices]).strip()
+            for indices in self.sample_indices(amount, target_length, rng)
+        ]
+
+    def iter_chunks(
+        self,
+        amount: int,
+        target_length: int,
+        rng: np.random.Generator,
+        chunk_size: int = 10000,
+    ) -> Iterator[List[str]]:
+        """
+        Streams bursts which are generated in chunks, so the memory needed does
+        not grow with the number of bursts. The bursts depend on the chunk size.
+
+        Args:
+            amount (int): The number of bursts.
+            target_length (int): The minimum number of characters of a burst.
+            rng (np.random.Generator): The random number generator.
+            chunk_size (int, optional): The number of bursts generated at once.
+
+        Yields:
+            List[str]: The generated bursts of a chunk.
+        """
+        for chunk_start in range(0, amount, chunk_size):
+            chunk_amount = min(chunk_size, amount - chunk_start)
+            yield self.sample(chunk_amount, target_length, rng)
+
+    def iter_bursts(
+        self,
+        amount: int,
+        target_length: int,
+        rng: np.random.Generator,
+        chunk_size: int = 10000,
+    ) -> Iterator[str]:
+        """
+        Streams the bursts of iter_chunks one by one.
+
+        Args:
+            amount (int): The number of bursts.
+            target_length (int): The minimum number of characters of a burst.
+            rng (np.random.Generator): The random number generator.
+            chunk_size (int, optional): The number of bursts generated at once.
+
+        Yields:
+            str: The generated bursts.
+        """
+        for chunk in self.iter_chunks(amount, target_length, rng, chunk_size):
+            yield from chunk
+
+
+if __name__ == "__main__":
+    pass
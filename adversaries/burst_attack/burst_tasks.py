@@ -0,0 +1,119 @@
+# Standard
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+# Pip
+# None
+
+# Custom
+from adversaries.burst_attack.content_burst_generator import (
+    ContentBurstGenerator as Cbg,
+)
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    BURST_WORKERS,
+    LANGUAGE_CHOICES,
+    PROMPT_CHOICES,
+)
+
+
+def burst_task(language_choice: str, prompt_num) -> Tuple[str, str, str]:
+    """
+    Returns the burst task of a language choice and a prompt number.
+
+    The English variants 'en_orig300' and 'en_orig' use the English prompt and
+    the English SpaCy model, they only differ in the name of the burst file.
+
+    Args:
+        language_choice (str): The language, e.g. 'de' or 'en_orig300'.
+        prompt_num (int): The number of the prompt.
+
+    Returns:
+        tuple: The prompt text file, the SpaCy language and the variant.
+    """
+    language = language_choice[:2]
+    variant = language_choice.replace(f"{language}_", "", 1)
+
+    if variant == language_choice:
+        variant = ""
+
+    prompt_text = f"{Gp.RESULT_PROMPT_TXT.value}/Prompt{prompt_num}_{language}.txt"
+
+    return prompt_text, language, variant
+
+
+def all_burst_tasks(
+    language_choices: list = LANGUAGE_CHOICES, prompt_choices: list = PROMPT_CHOICES
+) -> List[Tuple[str, str, str]]:
+    """
+    Returns the burst tasks of every language and prompt combination.
+
+    Args:
+        language_choices (list, optional): The languages to be used.
+        prompt_choices (list, optional): The prompt numbers to be used.
+
+    Returns:
+        list: The burst tasks.
+    """
+    return [
+        burst_task(language_choice, prompt_num)
+        for prompt_num in prompt_choices
+        for language_choice in language_choices
+    ]
+
+
+def run_burst_task(task: Tuple[str, str, str], burst_amount: int = 1000) -> str:
+    """
+    Generates and saves the bursts of one task.
+
+    Args:
+        task (tuple): The prompt text file, the SpaCy language and the variant.
+        burst_amount (int, optional): The number of bursts (default is 1000).
+
+    Returns:
+        str: The path of the saved burst file.
+    """
+    prompt_text, language, variant = task
+
+    generator = Cbg(
+        prompt_text=prompt_text,
+        language=language,
+        burst_amount=burst_amount,
+        variant=variant,
+    )
+    generator.save_bursts(extend_file_save_name=variant)
+
+    return generator.burst_file_path(variant)
+
+
+def generate_bursts_parallel(
+    tasks: List[Tuple[str, str, str]],
+    workers: int = BURST_WORKERS,
+    burst_amount: int = 1000,
+) -> List[str]:
+    """
+    Generates the bursts of several tasks in a process pool.
+
+    Every task has its own random stream, so the burst files are identical
+    regardless of the number of workers and the order of the tasks.
+
+    Args:
+        tasks (list): The burst tasks.
+        workers (int, optional): The number of processes. With 1, the tasks are
+            run in the current process.
+        burst_amount (int, optional): The number of bursts per task.
+
+    Returns:
+        list: The paths of the saved burst files in the order of the tasks.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [run_burst_task(task, burst_amount) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(run_burst_task, tasks, [burst_amount] * len(tasks))
+        )
+
+
+if __name__ == "__main__":
+    pass
@@ -1,24 +1,219 @@
 # Standard
 import csv
+import gzip
+import hashlib
+import lzma
 import os.path
+import sys
+import threading
+
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Pip
-import nltk
-from numpy.random import choice, seed
-from typing import List, Tuple
+import numpy as np
+
+from numpy.random import SeedSequence, default_rng
+from typing import Iterator, List, Tuple
 
 # Custom
-from adversaries.docs_processor.multilingual_spacy import MultiLingualSpacy
+from adversaries.burst_attack.burst_sampler import BurstSampler
+from adversaries.docs_processor.multilingual_spacy import (
+    MultiLingualSpacy,
+    batch_spacy_multi_tagger,
+)
 from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
-from adversaries.settings.constants.constant_vars import CONTENT_BURST_SEED
+from adversaries.settings.constants.constant_vars import (
+    BURST_CHUNK_SIZE,
+    CONTENT_BURST_SEED,
+    VOCABULARY_INDEX_SIZE,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
 
 """
 Based on the code: 
 https://github.com/catalpa-cl/adversarials/blob/master/content_burst_generator.py
 """
 
-# Fix results
-seed(CONTENT_BURST_SEED)
+# The minimum number of characters of a content burst
+BURST_LENGTH = 44
+
+# Writes the burst files in the background while the bursts are being scored
+BURST_FILE_WRITER = ThreadPoolExecutor(max_workers=2)
+
+BURST_FILE_HEADER = "id", "EssaySet", "eassay_score", "essay_score", "EssayText"
+
+# The openers and file extensions of the supported burst file compressions
+BURST_FILE_COMPRESSIONS = {
+    None: (open, ""),
+    "gzip": (gzip.open, ".gz"),
+    "xz": (lzma.open, ".xz"),
+}
+
+
+def get_burst_file_opener(compression: str = None) -> tuple:
+    """
+    Returns the function which opens a burst file and its file extension.
+
+    Args:
+        compression (str, optional): None, 'none', 'gzip' or 'xz'.
+
+    Returns:
+        tuple: The opener and the file extension.
+    """
+    if compression in ("", "none"):
+        compression = None
+
+    opener = BURST_FILE_COMPRESSIONS.get(compression)
+
+    if opener is None:
+        valid_compressions = [str(key).lower() for key in BURST_FILE_COMPRESSIONS]
+        raise Cem.BurstFileCompressionError(compression, valid_compressions)
+
+    return opener
+
+
+# Vocabulary indices of the prompts, keyed by the prompt file, its language
+# and the state of the file, so that changed prompts are indexed again. Only the
+# VOCABULARY_INDEX_SIZE most recently used indices are kept.
+VOCABULARY_INDEX = OrderedDict()
+VOCABULARY_INDEX_LOCK = threading.Lock()
+
+
+def burst_seed_sequence(
+    random_seed: int, language: str, prompt_text: str, variant: str = ""
+) -> SeedSequence:
+    """
+    Returns the seed sequence of a burst task.
+
+    The random stream only depends on the seed, the language, the prompt and the
+    variant (e.g. 'orig300'), so the bursts do not depend on the order in which
+    the tasks are run or on the process they are run in.
+
+    Args:
+        random_seed (int): The base seed, usually CONTENT_BURST_SEED.
+        language (str): The language of the prompt text.
+        prompt_text (str): The path to the prompt text file.
+        variant (str, optional): The variant of the training data.
+
+    Returns:
+        SeedSequence: The seed sequence of the task.
+    """
+    spawn_key = tuple(
+        int.from_bytes(hashlib.sha256(part.encode("utf-8")).digest()[:4], "little")
+        for part in (language, os.path.basename(prompt_text), variant)
+    )
+    return SeedSequence(entropy=random_seed, spawn_key=spawn_key)
+
+
+def vocabulary_key(prompt_text: str, language: str) -> tuple:
+    """
+    Returns the key of a prompt in the vocabulary index cache.
+
+    Args:
+        prompt_text (str): The path to the prompt text file.
+        language (str): The language of the prompt text.
+
+    Returns:
+        tuple: The absolute path, the language, the modification time and size.
+    """
+    prompt_stat = os.stat(prompt_text)
+    return (
+        os.path.abspath(prompt_text),
+        language,
+        prompt_stat.st_mtime_ns,
+        prompt_stat.st_size,
+    )
+
+
+def lookup_vocabulary_index(key: tuple):
+    """
+    Returns the cached vocabulary index of a prompt and marks it as recently used.
+
+    Args:
+        key (tuple): The key of vocabulary_key.
+
+    Returns:
+        tuple: The nouns and their frequency, or None if they are not cached.
+    """
+    with VOCABULARY_INDEX_LOCK:
+        vocabulary = VOCABULARY_INDEX.get(key)
+        if vocabulary is not None:
+            VOCABULARY_INDEX.move_to_end(key)
+        return vocabulary
+
+
+def store_vocabulary_index(
+    key: tuple, vocabulary: Tuple[np.ndarray, np.ndarray]
+) -> None:
+    """
+    Caches the vocabulary index of a prompt. The index of an older state of the
+    same file is replaced and the least recently used indices are evicted.
+
+    Args:
+        key (tuple): The key of vocabulary_key.
+        vocabulary (tuple): The nouns and their frequency.
+
+    Returns:
+        None
+    """
+    with VOCABULARY_INDEX_LOCK:
+        for cached_key in list(VOCABULARY_INDEX):
+            if cached_key[:2] == key[:2] and cached_key != key:
+                del VOCABULARY_INDEX[cached_key]
+
+        VOCABULARY_INDEX[key] = vocabulary
+        VOCABULARY_INDEX.move_to_end(key)
+
+        while len(VOCABULARY_INDEX) > max(1, VOCABULARY_INDEX_SIZE):
+            VOCABULARY_INDEX.popitem(last=False)
+
+
+def build_vocabulary_index(noun_counts: Counter) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the array-backed vocabulary of a prompt. The counts are normalized
+    once for the whole vocabulary.
+
+    Args:
+        noun_counts (Counter): The nouns and how often they occur.
+
+    Returns:
+        tuple: The interned nouns and their relative frequencies as numpy arrays.
+    """
+    nouns = np.empty(len(noun_counts), dtype=object)
+    nouns[:] = [sys.intern(noun) for noun in noun_counts]
+
+    counts = np.fromiter(
+        noun_counts.values(), dtype=np.float64, count=len(noun_counts)
+    )
+    total = counts.sum()
+    frequency = counts / total if total else counts
+
+    return nouns, frequency
+
+
+def preload_prompt_nouns(prompt_files: dict) -> None:
+    """
+    Tags the given prompts in one batch per language and indexes their nouns,
+    so that the generators of these prompts do not need to tag them again.
+
+    Args:
+        prompt_files (dict): Keys are the paths of the prompt files and values
+            are their languages.
+
+    Returns:
+        None
+    """
+    documents = {
+        vocabulary_key(prompt_text, language): (language, prompt_text)
+        for prompt_text, language in prompt_files.items()
+    }
+    noun_counts = batch_spacy_multi_tagger(documents, return_noun_count=True)
+
+    for key, counts in noun_counts.items():
+        store_vocabulary_index(key, build_vocabulary_index(counts))
 
 
 class ContentBurstGenerator(MultiLingualSpacy):
@@ -27,7 +222,14 @@ class ContentBurstGenerator(MultiLingualSpacy):
     It is extended by the class MultiLingualSpacy
     """
 
-    def __init__(self, prompt_text: str, language: str, burst_amount: int = 1000):
+    def __init__(
+        self,
+        prompt_text: str,
+        language: str,
+        burst_amount: int = 1000,
+        random_seed: int = CONTENT_BURST_SEED,
+        variant: str = "",
+    ):
         """
         Initializes the ContentBurstGenerator object.
 
@@ -36,112 +238,258 @@ class ContentBurstGenerator(MultiLingualSpacy):
             language (str): The language of the prompt text.
             burst_amount (int, optional): The number of burst adversarials to generate
             (default is 1000).
+            random_seed (int, optional): The seed of the random number generator
+            (default is CONTENT_BURST_SEED).
+            variant (str, optional): The variant of the training data, e.g. 'orig300'
+            (default is "").
         """
         super().__init__(language, prompt_text)
         self.prompt_text = prompt_text
         self.burst_amount = burst_amount
+        self.variant = variant
+        self.rng = default_rng(
+            burst_seed_sequence(random_seed, language, prompt_text, variant)
+        )
 
-    @staticmethod
-    def get_text(grams: List[str], frequency: List[float], avg_length: int) -> str:
+    def generate_content_burst(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Generates a content burst based on given grams, frequency, and average length.
+        Generate content burst based on the prompt text.
 
-        Args:
-            grams (List[str]): List of grams.
-            frequency (List[float]): Frequency of grams.
-            avg_length (int): Average length of the burst.
+        The vocabulary index is cached per prompt and language, so further
+        generators of the same prompt reuse it.
 
         Returns:
-            str: Generated content burst.
+            tuple: Tuple containing nouns and their frequency.
         """
-        start = choice(grams)
-        current_sentence = start
-        current_length = len(start)
-        while current_length < avg_length:
-            next_gram = choice(a=grams, size=1, p=frequency)[0]
-            if len(next_gram) == 1:
-                continue
-            current_sentence = (current_sentence + " " + next_gram).strip()
-            current_length = len(current_sentence)
+        key = vocabulary_key(self.prompt_text, self.language)
+
+        vocabulary = lookup_vocabulary_index(key)
+
+        if vocabulary is None:
+            # Every occurrence of a noun is counted, not only its first one
+            noun_counts = self.spacy_multi_tagger(
+                process_document=True, return_noun_count=True
+            )
+            vocabulary = build_vocabulary_index(noun_counts)
+            store_vocabulary_index(key, vocabulary)
 
-        return current_sentence
+        return vocabulary
 
-    def generate_content_burst(self) -> Tuple[List[str], List[float]]:
+    def iter_burst_chunks(
+        self, burst_length: int = BURST_LENGTH, chunk_size: int = BURST_CHUNK_SIZE
+    ) -> Iterator[List[str]]:
         """
-        Generate content burst based on the prompt text.
+        Stream the burst adversarials of the prompt in chunks of a fixed size.
 
-        Returns:
-            tuple: Tuple containing nouns and their frequency.
+        Args:
+            burst_length (int, optional): The minimum number of characters of a burst.
+            chunk_size (int, optional): The number of bursts generated at once.
+
+        Yields:
+            List[str]: The burst adversarials of a chunk.
         """
-        # preprocess_text = self.preprocess_document()
-        bursts = self.spacy_multi_tagger(process_document=True, return_all_nouns=True)
+        nouns, frequency = self.generate_content_burst()
+        sampler = BurstSampler(nouns, frequency)
 
-        freq_dist = nltk.FreqDist(bursts)
-        nouns = []
-        frequency = []
+        yield from sampler.iter_chunks(
+            self.burst_amount, burst_length, self.rng, chunk_size
+        )
 
-        for word, count in freq_dist.items():
-            nouns.append(word)
-            frequency.append(count / sum(freq_dist.values()))
+    def generate_bursts(self, burst_length: int = BURST_LENGTH) -> List[str]:
+        """
+        Generate all burst adversarials of the prompt with the vectorized sampler.
 
-        return nouns, frequency
+        Args:
+            burst_length (int, optional): The minimum number of characters of a burst.
 
-    def save_bursts(self, extend_file_save_name: str = "") -> str:
+        Returns:
+            List[str]: The generated burst adversarials.
         """
-        Generate and save burst adversarials to a tsv file.
+        bursts = list()
+        for chunk in self.iter_burst_chunks(burst_length):
+            bursts.extend(chunk)
+
+        return bursts
+
+    def burst_file_path(
+        self, extend_file_save_name: str = "", shard: int = None, compression=None
+    ) -> str:
+        """
+        Returns the path of the tsv file the bursts are saved to.
 
         Args:
             extend_file_save_name (str, optional): Additional name to append to the
                 saved file name (default is "").
+            shard (int, optional): The number of the shard, if the bursts are
+                split into several files (default is None).
+            compression (str, optional): 'gzip' or 'xz' (default is None).
 
         Returns:
-            str: The first sentence of the generated burst adversarials.
+            str: The path of the burst file.
         """
-
-        nouns, frequency = self.generate_content_burst()
         file_name = os.path.basename(self.prompt_text)
-
-        index = 0
-        os.getcwd()
-
         save_name = file_name.replace(".txt", "")
 
         if extend_file_save_name:
             save_file_path = (
                 f"{Gp.RESULT_BURST_ATTACK_RESULT.value}/"
-                f"{save_name}_{extend_file_save_name}_burst_result.tsv"
+                f"{save_name}_{extend_file_save_name}_burst_result"
             )
         else:
             save_file_path = (
-                f"{Gp.RESULT_BURST_ATTACK_RESULT.value}/{save_name}_burst_result.tsv"
+                f"{Gp.RESULT_BURST_ATTACK_RESULT.value}/{save_name}_burst_result"
             )
 
+        if shard is not None:
+            save_file_path = f"{save_file_path}.part{shard:04}"
+
+        _, extension = get_burst_file_opener(compression)
+
+        return f"{save_file_path}.tsv{extension}"
+
+    def burst_rows(self, bursts: List[str], start_index: int = 0) -> Iterator[list]:
+        """
+        Returns the tsv rows of burst adversarials.
+
+        Args:
+            bursts (List[str]): The burst adversarials.
+            start_index (int, optional): The index of the first burst.
+
+        Yields:
+            list: The row of each burst.
+        """
+        for index, sentence in enumerate(bursts, start=start_index):
+            yield [
+                "10700" + "{0:03}".format(index),
+                self.prompt_text,
+                0,
+                0,
+                sentence,
+            ]
+
+    def write_bursts(self, bursts: List[str], save_file_path: str) -> str:
+        """
+        Write burst adversarials to a tsv file.
+
+        Args:
+            bursts (List[str]): The burst adversarials.
+            save_file_path (str): The path of the tsv file.
+
+        Returns:
+            str: The last sentence of the burst adversarials.
+        """
         with open(
             save_file_path,
             "w+",
             encoding="utf-8",
+            newline="",
         ) as file:
             csv_writer = csv.writer(file, delimiter="\t")
+            csv_writer.writerow(BURST_FILE_HEADER)
+            csv_writer.writerows(self.burst_rows(bursts))
 
-            header = "id", "EssaySet", "eassay_score", "essay_score", "EssayText"
+        return bursts[-1] if bursts else None
 
-            csv_writer.writerow(header)
+    def save_bursts(
+        self,
+        extend_file_save_name: str = "",
+        bursts: List[str] = None,
+        asynchronous: bool = False,
+    ):
+        """
+        Generate and save burst adversarials to a tsv file.
 
-            for i in range(self.burst_amount):
-                sentence = self.get_text(nouns, frequency, 44)
-                data_list = [
-                    "10700" + "{0:03}".format(index),
-                    self.prompt_text,
-                    0,
-                    0,
-                    sentence,
-                ]
+        Args:
+            extend_file_save_name (str, optional): Additional name to append to the
+                saved file name (default is "").
+            bursts (List[str], optional): Bursts which have already been generated.
+                If None, the bursts are generated first.
+            asynchronous (bool, optional): Whether the file is written in a
+                background thread (default is False).
 
-                csv_writer.writerow(data_list)
+        Returns:
+            str: The last sentence of the generated burst adversarials or, if
+            asynchronous, a Future which returns it once the file is written.
+        """
+        if bursts is None:
+            bursts = self.generate_bursts()
 
-                index += 1
+        save_file_path = self.burst_file_path(extend_file_save_name)
+
+        if asynchronous:
+            return BURST_FILE_WRITER.submit(self.write_bursts, bursts, save_file_path)
+
+        return self.write_bursts(bursts, save_file_path)
+
+    def stream_bursts(
+        self,
+        extend_file_save_name: str = "",
+        chunk_size: int = BURST_CHUNK_SIZE,
+        compression: str = None,
+        shard_size: int = 0,
+    ) -> List[str]:
+        """
+        Generate and write burst adversarials chunk by chunk.
+
+        Only one chunk is kept in memory, so the memory needed stays the same
+        regardless of the burst amount. The bursts are identical to the ones of
+        save_bursts as long as the same chunk size is used.
+
+        Args:
+            extend_file_save_name (str, optional): Additional name to append to the
+                saved file name (default is "").
+            chunk_size (int, optional): The number of bursts generated at once.
+            compression (str, optional): 'gzip' or 'xz' (default is None).
+            shard_size (int, optional): The maximum number of bursts per file.
+                0 writes all bursts into one file (default is 0).
+
+        Returns:
+            List[str]: The paths of the written files.
+        """
+        opener, _ = get_burst_file_opener(compression)
+
+        written_files = list()
+        file = csv_writer = None
+        rows_in_file = 0
+        index = 0
 
-        return sentence
+        try:
+            for chunk in self.iter_burst_chunks(chunk_size=chunk_size):
+                position = 0
+
+                while position < len(chunk):
+                    if file is None or (shard_size and rows_in_file >= shard_size):
+                        if file is not None:
+                            file.close()
+
+                        shard = len(written_files) if shard_size else None
+                        save_file_path = self.burst_file_path(
+                            extend_file_save_name, shard, compression
+                        )
+                        file = opener(
+                            save_file_path, "wt", encoding="utf-8", newline=""
+                        )
+                        csv_writer = csv.writer(file, delimiter="\t")
+                        csv_writer.writerow(BURST_FILE_HEADER)
+                        written_files.append(save_file_path)
+                        rows_in_file = 0
+
+                    if shard_size:
+                        end = position + shard_size - rows_in_file
+                    else:
+                        end = len(chunk)
+
+                    part = chunk[position:end]
+                    csv_writer.writerows(self.burst_rows(part, index))
+
+                    position += len(part)
+                    rows_in_file += len(part)
+                    index += len(part)
+        finally:
+            if file is not None:
+                file.close()
+
+        return written_files
 
 
 if __name__ == "__main__":
@@ -3,11 +3,15 @@ import os
 
 # Pip
 import typer
+
+from rich.console import Console
+from rich.table import Table
 from tqdm import tqdm
 
 # Custom
 from adversaries.settings.constants.natural_order_group import NaturalOrderGroup
 from adversaries.docs_processor.docx_prompt_to_text import DocxPromptToText
+from adversaries.docs_processor.spacy_benchmark import benchmark_pipeline_profiles
 from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
 from adversaries.settings.logger.basic_logger import catch_and_log_info
 from adversaries.settings.messages.message_keys import MessageKeys as Mk
@@ -24,6 +28,23 @@ app_docs_processor = typer.Typer(
 )
 
 
+def extract_prompt_file(docx_file: str) -> str:
+    """
+    Extract the text of one .docx prompt file into the prompt text directory.
+
+    Args:
+        docx_file (str): The path of the .docx prompt file.
+
+    Returns:
+        str: The path of the extracted .txt file.
+    """
+    docx_to_text = os.path.basename(docx_file).replace(".docx", ".txt")
+    extracted_text = f"{Gp.RESULT_PROMPT_TXT.value}/{docx_to_text}"
+    DocxPromptToText(docx_file).docx_to_text(save_name=extracted_text)
+
+    return extracted_text
+
+
 @app_docs_processor.command(
     name=doc_processor_keys.EXTRACT_TEXT_FROM_PROMPTS.value,
     help=doc_processor_keys.EXTRACT_TEXT_FROM_PROMPTS_HELP.value,
@@ -53,15 +74,58 @@ def extract_text_from_all_prompts() -> None:
             absolute_file = f"{f_dir}/{docx_file}"
 
             if ".docx" in docx_file:
-                prompt = DocxPromptToText(absolute_file)
-                docx_to_text = docx_file.replace(".docx", ".txt")
-                extracted_text = f"{Gp.RESULT_PROMPT_TXT.value}/{docx_to_text}"
-                prompt.docx_to_text(save_name=extracted_text)
+                extract_prompt_file(absolute_file)
 
     catch_and_log_info(
         custom_message=doc_processor_keys.EXTRACT_TEXT_COMPLETE.value, echo_msg=True
     )
 
 
+@app_docs_processor.command(
+    name=doc_processor_keys.BENCHMARK_SPACY.value,
+    help=doc_processor_keys.BENCHMARK_SPACY_HELP.value,
+)
+def benchmark_spacy_profiles(
+    languages: str = typer.Option(
+        doc_processor_keys.BENCHMARK_LANGUAGES_DEFAULT.value,
+        doc_processor_keys.BENCHMARK_LANGUAGES_LONG.value,
+        doc_processor_keys.BENCHMARK_LANGUAGES_SHORT.value,
+        help=doc_processor_keys.BENCHMARK_LANGUAGES_HELP.value,
+    ),
+    repeats: int = typer.Option(
+        doc_processor_keys.BENCHMARK_REPEATS_DEFAULT.value,
+        doc_processor_keys.BENCHMARK_REPEATS_LONG.value,
+        doc_processor_keys.BENCHMARK_REPEATS_SHORT.value,
+        help=doc_processor_keys.BENCHMARK_REPEATS_HELP.value,
+    ),
+) -> list:
+    """
+    Benchmark the tagging throughput of every SpaCy pipeline profile per language.
+
+    Args:
+        languages (str): Comma separated language codes, e.g. 'de,fr'.
+        repeats (int): How often the prompts of a language are tagged.
+
+    Returns:
+        list: The benchmark results.
+    """
+    catch_and_log_info(
+        custom_message=doc_processor_keys.BENCHMARK_SPACY_HELP.value, echo_msg=True
+    )
+
+    chosen_languages = [lang.strip() for lang in languages.split(",") if lang.strip()]
+    results = benchmark_pipeline_profiles(chosen_languages, repeats=repeats)
+
+    table = Table(*results[0].keys()) if results else Table()
+    for result in results:
+        table.add_row(*[str(value) for value in result.values()])
+    Console().print(table)
+
+    catch_and_log_info(
+        custom_message=doc_processor_keys.BENCHMARK_COMPLETE.value, echo_msg=True
+    )
+    return results
+
+
 if __name__ == "__main__":
     extract_text_from_all_prompts()
@@ -1,10 +1,20 @@
 # Standard
 from collections import Counter
+from typing import Callable, Iterator, Optional, Tuple
 
 # Pip
-import spacy
+import numpy as np
+
+from spacy.attrs import DEP, ORTH, POS
+from spacy.parts_of_speech import IDS as POS_IDS
 
 # Custom
+from adversaries.docs_processor.spacy_doc_cache import SPACY_DOC_CACHE
+from adversaries.docs_processor.spacy_model_registry import SPACY_MODEL_REGISTRY
+from adversaries.settings.constants.constant_vars import (
+    SPACY_BATCH_SIZE,
+    SPACY_N_PROCESS,
+)
 from adversaries.settings.messages.custom_error_messages import (
     CustomErrorMessages as Cem,
 )
@@ -17,9 +27,134 @@ SPACY_MODELS = {
 }
 
 NOUNS = ("NOUN",)
+NOUN_IDS = [POS_IDS[noun] for noun in NOUNS]
 
 VALID_LANGS = list(SPACY_MODELS.keys())
 
+# Pipeline profiles: the components which are not loaded for the respective use case.
+# 'pos' keeps the tagger/morphologizer (and the attribute ruler which maps the
+# English tags to UPOS), 'dep' additionally keeps the dependency parser.
+POS_PROFILE = "pos"
+DEP_PROFILE = "dep"
+FULL_PROFILE = "full"
+
+SPACY_PIPELINE_PROFILES = {
+    POS_PROFILE: ("lemmatizer", "ner", "parser", "senter"),
+    DEP_PROFILE: ("lemmatizer", "ner"),
+    FULL_PROFILE: (),
+}
+
+VALID_PROFILES = list(SPACY_PIPELINE_PROFILES.keys())
+
+
+def get_excluded_components(pipeline_profile: str) -> tuple:
+    """
+    Returns the components which are not loaded for a pipeline profile.
+
+    Args:
+        pipeline_profile (str): One of 'pos', 'dep' or 'full'.
+
+    Returns:
+        tuple: The names of the excluded pipeline components.
+    """
+    excluded = SPACY_PIPELINE_PROFILES.get(pipeline_profile)
+
+    if excluded is None:
+        raise Cem.SpacyPipelineProfileError(pipeline_profile, VALID_PROFILES)
+
+    return excluded
+
+
+def iter_token_records(doc) -> Iterator[Tuple[str, int, int]]:
+    """
+    Streams the tokens of a tagged document as compact records.
+
+    The attributes are read with Doc.to_array, so no Token objects or
+    dictionaries are created per token. Repeated tokens are kept.
+
+    Args:
+        doc (Doc): The tagged SpaCy document.
+
+    Yields:
+        tuple: The text of the token, its POS ID and its dependency label ID.
+        The IDs can be resolved with doc.vocab.strings.
+    """
+    strings = doc.vocab.strings
+
+    for orth_id, pos_id, dep_id in doc.to_array([ORTH, POS, DEP]):
+        yield strings[orth_id], int(pos_id), int(dep_id)
+
+
+def count_pos_tags(doc) -> Counter:
+    """
+    Counts every part-of-speech tag of a tagged document.
+
+    Args:
+        doc (Doc): The tagged SpaCy document.
+
+    Returns:
+        Counter: The POS tags and how often they occur.
+    """
+    strings = doc.vocab.strings
+    return Counter(
+        {strings[pos_id]: count for pos_id, count in doc.count_by(POS).items()}
+    )
+
+
+def count_nouns(doc) -> Counter:
+    """
+    Counts how often each noun occurs in a tagged document. The memory needed
+    grows with the number of distinct nouns, not with the number of tokens.
+
+    Args:
+        doc (Doc): The tagged SpaCy document.
+
+    Returns:
+        Counter: The nouns in order of their first occurrence and their counts.
+    """
+    strings = doc.vocab.strings
+    attributes = doc.to_array([ORTH, POS])
+
+    noun_ids = attributes[np.isin(attributes[:, 1], NOUN_IDS), 0]
+
+    noun_counts = Counter()
+    for orth_id in noun_ids:
+        noun_counts[strings[orth_id]] += 1
+
+    return noun_counts
+
+
+def warm_up_spacy_models(languages=None, pipeline_profile=POS_PROFILE) -> None:
+    """
+    Loads the SpaCy models of the given languages into the shared model registry,
+    so that the first tagging call does not have to pay for loading the model.
+
+    Args:
+        languages (list, optional): The language codes to be loaded.
+            Defaults to all valid languages.
+        pipeline_profile (str, optional): The pipeline profile to be loaded.
+            Defaults to 'pos'.
+
+    Returns:
+        None
+    """
+    if languages is None:
+        languages = VALID_LANGS
+
+    excluded = get_excluded_components(pipeline_profile)
+
+    model_names = list()
+    for language in languages:
+        model_name = SPACY_MODELS.get(language)
+
+        if model_name is None:
+            raise Cem.MultiLingualSpacyError(language, VALID_LANGS)
+
+        if model_name not in model_names:
+            model_names.append(model_name)
+
+    SPACY_MODEL_REGISTRY.warm_up(model_names, exclude=excluded)
+
 
 class MultiLingualSpacy(Cem):
     """
@@ -31,21 +166,29 @@ class MultiLingualSpacy(Cem):
     Attributes:
         language (str): The language code for the SpaCy model to be used.
         incoming_document (str): The path to the incoming document to be processed.
+        pipeline_profile (str): The pipeline profile ('pos', 'dep' or 'full').
+            If None, the smallest profile for the requested results is used.
 
     Methods:
         preprocess_document(): Preprocesses the incoming document.
+        load_pipeline(): Returns the shared SpaCy pipeline for the language.
         spacy_multi_tagger(): Performs multi-tagging using SpaCy.
+        iter_tagged_tokens(): Streams the tagged tokens as compact records.
+        analyse_doc(): Extracts the requested results from a tagged document.
     """
 
-    def __init__(self, language, incoming_document):
+    def __init__(self, language, incoming_document, pipeline_profile=None):
         """Initialize the MultiLingualSpacy object.
 
         Args:
             language (str): The language code for the SpaCy model.
             incoming_document (str): The path to the incoming document.
+            pipeline_profile (str, optional): The pipeline profile to be used.
+                Defaults to None, i.e. it is chosen per call.
         """
         self.language = language
         self.incoming_document = incoming_document
+        self.pipeline_profile = pipeline_profile
 
     def preprocess_document(self):
         """Preprocesses the incoming document.
@@ -60,6 +203,77 @@ class MultiLingualSpacy(Cem):
             doc_sentences = [sentence.strip() for sentence in lines if sentence.strip()]
             return doc_sentences
 
+    def load_pipeline(self, pipeline_profile=None):
+        """Returns the SpaCy pipeline for the language of this object.
+
+        The pipeline is taken from the process-wide model registry, so each model
+        is only loaded once per process and profile.
+
+        Args:
+            pipeline_profile (str, optional): The pipeline profile to be loaded.
+                Defaults to the profile of the object or 'full' if none is set.
+
+        Returns:
+            Language: The SpaCy pipeline.
+        """
+        lang_chosen = SPACY_MODELS.get(self.language)
+
+        if lang_chosen is None:
+            raise self.MultiLingualSpacyError(self.language, VALID_LANGS)
+
+        profile = pipeline_profile or self.pipeline_profile or FULL_PROFILE
+        excluded = get_excluded_components(profile)
+
+        return SPACY_MODEL_REGISTRY.get(lang_chosen, exclude=excluded)
+
+    def tag_text(
+        self, sentence="Hello World", process_document=False, pipeline_profile=None
+    ):
+        """Tags a sentence or the whole document.
+
+        Args:
+            sentence (str): The sentence to process.
+            process_document (bool): Whether to process the entire document.
+            pipeline_profile (str, optional): The pipeline profile to be used.
+                Defaults to the profile of the object or 'pos'.
+
+        Returns:
+            Doc: The tagged SpaCy document.
+        """
+        if process_document:
+            NLP_SPACY_CORPUS = "\n".join(self.preprocess_document())
+        else:
+            NLP_SPACY_CORPUS = sentence
+
+        profile = pipeline_profile or self.pipeline_profile or POS_PROFILE
+        nlp = self.load_pipeline(profile)
+
+        # Only whole documents are worth a cache file, single sentences are
+        # tagged faster than a DocBin is read
+        if process_document:
+            return SPACY_DOC_CACHE.tag(nlp, NLP_SPACY_CORPUS)
+
+        return nlp(NLP_SPACY_CORPUS)
+
+    def iter_tagged_tokens(
+        self, sentence="Hello World", process_document=False, with_dependencies=False
+    ) -> Iterator[Tuple[str, int, int]]:
+        """Streams the tagged tokens as (text, pos_id, dep_id) records.
+
+        Args:
+            sentence (str): The sentence to process.
+            process_document (bool): Whether to process the entire document.
+            with_dependencies (bool): Whether the dependency parser is run.
+                Otherwise, the dep_id of every record is 0.
+
+        Yields:
+            tuple: The text of the token, its POS ID and its dependency label ID.
+        """
+        profile = DEP_PROFILE if with_dependencies else None
+        doc = self.tag_text(sentence, process_document, pipeline_profile=profile)
+
+        yield from iter_token_records(doc)
+
     def spacy_multi_tagger(
         self,
         sentence="Hello World",
@@ -67,7 +281,8 @@ class MultiLingualSpacy(Cem):
         return_spacy_results=False,
         return_only_tags=False,
         return_all_nouns=False,
-        return_pos_count = False
+        return_pos_count = False,
+        return_noun_count=False,
     ) -> None:
         """Performs multi-tagging using Spacy.
 
@@ -78,6 +293,7 @@ class MultiLingualSpacy(Cem):
             return_only_tags (bool): Whether to return only the part-of-speech tags.
             return_all_nouns (bool): Whether to return all identified nouns.
             return_pos_count (bool): Whether to return count of all part of speech tags.
+            return_noun_count (bool): Whether to return how often each noun occurs.
 
         Returns:
             None: Depending on the parameters, returns analysis results,
@@ -92,46 +308,198 @@ class MultiLingualSpacy(Cem):
             raise self.MultiLingualSpacyError(self.language, VALID_LANGS)
 
         else:
-
-            if process_document:
-                NLP_SPACY_CORPUS = "\n".join(self.preprocess_document())
+            # The dependency parser is only needed if the dep labels are returned
+            if return_spacy_results:
+                profile = self.pipeline_profile or DEP_PROFILE
             else:
-                NLP_SPACY_CORPUS = sentence
+                profile = self.pipeline_profile or POS_PROFILE
+
+            doc = self.tag_text(sentence, process_document, pipeline_profile=profile)
+
+            return self.analyse_doc(
+                doc,
+                return_spacy_results=return_spacy_results,
+                return_only_tags=return_only_tags,
+                return_all_nouns=return_all_nouns,
+                return_pos_count=return_pos_count,
+                return_noun_count=return_noun_count,
+            )
+
+    @staticmethod
+    def analyse_doc(
+        doc,
+        return_spacy_results=False,
+        return_only_tags=False,
+        return_all_nouns=False,
+        return_pos_count=False,
+        return_noun_count=False,
+    ):
+        """Extracts the requested results from an already tagged SpaCy Doc.
 
-            nlp = spacy.load(lang_chosen)
-            doc = nlp(NLP_SPACY_CORPUS)
+        Apart from the SpaCy analysis results, which are keyed by the token text,
+        repeated tokens are kept, i.e. every occurrence of a noun is counted.
+
+        Args:
+            doc (Doc): The tagged SpaCy document.
+            return_spacy_results (bool): Whether to return the full SpaCy analysis results.
+            return_only_tags (bool): Whether to return only the part-of-speech tags.
+            return_all_nouns (bool): Whether to return all identified nouns.
+            return_pos_count (bool): Whether to return count of all part of speech tags.
+            return_noun_count (bool): Whether to return how often each noun occurs.
+
+        Returns:
+            None: Depending on the parameters, returns analysis results,
+            part-of-speech tags, count, or nouns.
+        """
+        strings = doc.vocab.strings
+
+        if return_spacy_results:
             spacy_analysis_results = dict()
 
-            for token in doc:
-                spacy_analysis_results[token.text] = {
-                    "pos": token.pos_,
-                    "dep": token.dep_,
+            for text, pos_id, dep_id in iter_token_records(doc):
+                spacy_analysis_results[text] = {
+                    "pos": strings[pos_id],
+                    "dep": strings[dep_id],
                 }
 
-            part_of_speech = list()
+            return spacy_analysis_results
 
-            for token in spacy_analysis_results:
-                pos = spacy_analysis_results.get(token).get("pos")
-                part_of_speech.append((token, pos))
+        elif return_only_tags:
+            return [
+                (text, strings[pos_id]) for text, pos_id, _ in iter_token_records(doc)
+            ]
 
-            if return_spacy_results:
-                return spacy_analysis_results
+        elif return_all_nouns:
+            return [
+                text
+                for text, pos_id, _ in iter_token_records(doc)
+                if pos_id in NOUN_IDS
+            ]
+
+        elif return_pos_count:
+            return count_pos_tags(doc)
 
-            elif return_only_tags:
-                return part_of_speech
+        elif return_noun_count:
+            return count_nouns(doc)
 
-            elif return_all_nouns:
-                nouns = list()
-                for n in part_of_speech:
-                    word, pos = n
-                    if pos in NOUNS:
-                        nouns.append(word)
-                return nouns
 
-            elif return_pos_count:
-                pos_count = [pos_tag[1] for pos_tag in part_of_speech]
+def pipe_documents(
+    documents: dict,
+    pipeline_profile=POS_PROFILE,
+    batch_size=SPACY_BATCH_SIZE,
+    n_process=SPACY_N_PROCESS,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+):
+    """
+    Tags several documents by streaming them through nlp.pipe.
+
+    The documents are grouped by language, so every SpaCy model is used for
+    one batched run instead of one call per document. Documents which have been
+    tagged before are read from the disk cache.
+
+    With on_error, a document which cannot be read (or whose language has no
+    model) is reported with its key and skipped, the others are still tagged.
+    Without it, the error is raised.
+
+    Args:
+        documents (dict): Keys identifying the documents and values are tuples
+            containing the language and the path of the document.
+        pipeline_profile (str, optional): The pipeline profile. Defaults to 'pos'.
+        batch_size (int, optional): The number of texts per batch.
+        n_process (int, optional): The number of processes used for tagging.
+        on_error (callable, optional): Called with the key of a skipped document
+            and its error.
+
+    Yields:
+        tuple: The key of the document and its tagged SpaCy Doc.
+    """
+    documents_by_language = dict()
+
+    for key, (language, file_path) in documents.items():
+        documents_by_language.setdefault(language, list()).append((key, file_path))
+
+    for language, language_documents in documents_by_language.items():
+        try:
+            nlp = MultiLingualSpacy(language, None).load_pipeline(pipeline_profile)
+        except Exception as e:
+            if on_error is None:
+                raise
+            for key, _ in language_documents:
+                on_error(key, e)
+            continue
+
+        keys = list()
+        texts = list()
+
+        # The documents are read before tagging, so one unreadable file does
+        # not stop the batch of its language
+        for key, file_path in language_documents:
+            try:
+                text = "\n".join(
+                    MultiLingualSpacy(language, file_path).preprocess_document()
+                )
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(key, e)
+                continue
+
+            keys.append(key)
+            texts.append(text)
+
+        docs = SPACY_DOC_CACHE.pipe(
+            nlp, texts, batch_size=batch_size, n_process=n_process
+        )
+
+        for key, doc in zip(keys, docs):
+            yield key, doc
+
+
+def batch_spacy_multi_tagger(
+    documents: dict,
+    return_spacy_results=False,
+    return_only_tags=False,
+    return_all_nouns=False,
+    return_pos_count=False,
+    return_noun_count=False,
+    batch_size=SPACY_BATCH_SIZE,
+    n_process=SPACY_N_PROCESS,
+) -> dict:
+    """
+    The batched counterpart of MultiLingualSpacy.spacy_multi_tagger.
+
+    Args:
+        documents (dict): Keys identifying the documents and values are tuples
+            containing the language and the path of the document.
+        return_spacy_results (bool): Whether to return the full SpaCy analysis results.
+        return_only_tags (bool): Whether to return only the part-of-speech tags.
+        return_all_nouns (bool): Whether to return all identified nouns.
+        return_pos_count (bool): Whether to return count of all part of speech tags.
+        return_noun_count (bool): Whether to return how often each noun occurs.
+        batch_size (int, optional): The number of texts per batch.
+        n_process (int, optional): The number of processes used for tagging.
+
+    Returns:
+        dict: The keys of the documents and the requested results for each of them.
+    """
+    # The dependency parser is only needed if the dep labels are returned
+    pipeline_profile = DEP_PROFILE if return_spacy_results else POS_PROFILE
+
+    results = dict()
+    for key, doc in pipe_documents(
+        documents, pipeline_profile, batch_size=batch_size, n_process=n_process
+    ):
+        results[key] = MultiLingualSpacy.analyse_doc(
+            doc,
+            return_spacy_results=return_spacy_results,
+            return_only_tags=return_only_tags,
+            return_all_nouns=return_all_nouns,
+            return_pos_count=return_pos_count,
+            return_noun_count=return_noun_count,
+        )
+
+    return results
 
-                return Counter(pos_count)
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,112 @@
+# Standard
+import time
+
+from glob import glob
+
+# Pip
+# None
+
+# Custom
+from adversaries.docs_processor.multilingual_spacy import (
+    FULL_PROFILE,
+    MultiLingualSpacy as Mls,
+    VALID_LANGS,
+    VALID_PROFILES,
+)
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+
+
+def collect_language_corpus(language: str) -> str:
+    """
+    Joins all prompt texts of a language into one benchmark corpus.
+
+    Args:
+        language (str): The language code of the prompts, e.g. 'de'.
+
+    Returns:
+        str: The text of all prompts of the language.
+    """
+    prompt_files = sorted(glob(f"{Gp.RESULT_PROMPT_TXT.value}/Prompt*_{language}.txt"))
+
+    texts = list()
+    for prompt_file in prompt_files:
+        texts.append("\n".join(Mls(language, prompt_file).preprocess_document()))
+
+    return "\n".join(texts)
+
+
+def benchmark_pipeline_profiles(
+    languages: list = None, profiles: list = None, repeats: int = 5
+) -> list:
+    """
+    Measures the tagging throughput of each language and pipeline profile.
+
+    The models are loaded before the time measurement starts, so only the
+    tagging itself is measured. The load time is reported separately.
+
+    Args:
+        languages (list, optional): The languages to be benchmarked.
+            Defaults to all valid languages.
+        profiles (list, optional): The pipeline profiles to be benchmarked.
+            Defaults to all valid profiles.
+        repeats (int, optional): How often the corpus is tagged. Defaults to 5.
+
+    Returns:
+        list: One dictionary per language and profile containing the load time,
+        the number of tagged tokens, the throughput in tokens per second and the
+        speedup compared to the full pipeline.
+    """
+    languages = languages or VALID_LANGS
+    profiles = profiles or VALID_PROFILES
+
+    results = list()
+
+    for language in languages:
+        corpus = collect_language_corpus(language)
+        tagger = Mls(language, incoming_document=None)
+        language_results = list()
+
+        for profile in profiles:
+            load_start = time.perf_counter()
+            nlp = tagger.load_pipeline(profile)
+            load_time = time.perf_counter() - load_start
+
+            token_count = 0
+            tag_start = time.perf_counter()
+            for _ in range(repeats):
+                token_count += len(nlp(corpus))
+            tag_time = time.perf_counter() - tag_start
+
+            language_results.append(
+                {
+                    "LANGUAGE": language,
+                    "PROFILE": profile,
+                    "COMPONENTS": ",".join(nlp.pipe_names),
+                    "LOAD_SECONDS": round(load_time, 3),
+                    "TOKENS": token_count,
+                    "TOKENS_PER_SECOND": round(token_count / tag_time, 1)
+                    if tag_time
+                    else 0.0,
+                }
+            )
+
+        full_throughput = [
+            result.get("TOKENS_PER_SECOND")
+            for result in language_results
+            if result.get("PROFILE") == FULL_PROFILE
+        ]
+
+        for result in language_results:
+            if full_throughput and full_throughput[0]:
+                speedup = result.get("TOKENS_PER_SECOND") / full_throughput[0]
+                result["SPEEDUP"] = round(speedup, 2)
+            else:
+                result["SPEEDUP"] = None
+
+        results.extend(language_results)
+
+    return results
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,263 @@
+# Standard
+import hashlib
+import json
+import os
+import tempfile
+
+from typing import Iterable, Iterator
+
+# Pip
+import spacy
+
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+
+# Custom
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    SPACY_BATCH_SIZE,
+    SPACY_DOC_CACHE_ENABLED,
+    SPACY_DOC_CACHE_MAX_FILES,
+    SPACY_N_PROCESS,
+)
+
+
+class SpacyDocCache:
+    """
+    A persistent cache of tagged SpaCy documents.
+
+    Every document is stored as a serialized DocBin. The cache key is built from
+    the hash of the text, the SpaCy version, the name and version of the model and
+    the loaded pipeline components, so a document is tagged again as soon as one
+    of them changes. Only the least recently used max_files documents are kept.
+
+    Attributes:
+        cache_dir (str): The directory where the DocBin files are stored.
+        enabled (bool): Whether documents are read from and written to the cache.
+        max_files (int): The number of documents kept, 0 keeps all of them.
+
+    Methods:
+        cache_key(nlp, text): Returns the cache key of a text.
+        tag(nlp, text): Returns the tagged document, using the cache if possible.
+        pipe(nlp, texts, batch_size, n_process): The batched counterpart of tag.
+        prune(): Removes the least recently used documents above max_files.
+        clear(): Removes all cached documents.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = Gp.RESULT_SPACY_DOC_CACHE.value,
+        enabled: bool = SPACY_DOC_CACHE_ENABLED,
+        max_files: int = SPACY_DOC_CACHE_MAX_FILES,
+    ):
+        """
+        Initialize the SpacyDocCache object.
+
+        Args:
+            cache_dir (str, optional): The directory where the DocBin files are stored.
+            enabled (bool, optional): Whether the cache is used at all.
+            max_files (int, optional): The number of documents kept, 0 keeps all
+                of them.
+        """
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.max_files = max_files
+
+    @staticmethod
+    def cache_key(nlp: Language, text: str) -> str:
+        """
+        Returns the cache key of a text for the given pipeline.
+
+        Args:
+            nlp (Language): The SpaCy pipeline used for tagging.
+            text (str): The text to be tagged.
+
+        Returns:
+            str: The hexadecimal cache key.
+        """
+        pipeline_description = {
+            "text": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "spacy": spacy.__version__,
+            "lang": nlp.lang,
+            "model": nlp.meta.get("name"),
+            "model_version": nlp.meta.get("version"),
+            "components": nlp.pipe_names,
+        }
+        serialized = json.dumps(pipeline_description, sort_keys=True)
+
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.spacy")
+
+    def load(self, nlp: Language, key: str):
+        """
+        Loads a cached document.
+
+        Args:
+            nlp (Language): The pipeline whose vocabulary the document is bound to.
+            key (str): The cache key of the document.
+
+        Returns:
+            Doc: The cached document or None if it is not cached.
+        """
+        cache_file = self._cache_file(key)
+
+        if not self.enabled or not os.path.exists(cache_file):
+            return None
+
+        try:
+            doc_bin = DocBin().from_disk(cache_file)
+            doc = next(doc_bin.get_docs(nlp.vocab))
+            # The modification time marks the recently used documents
+            os.utime(cache_file)
+            return doc
+        except Exception:
+            # A broken cache file is simply tagged again and overwritten
+            return None
+
+    def save(self, key: str, doc: Doc) -> None:
+        """
+        Writes a document to the cache. The file is replaced atomically, so
+        parallel runs never read a half written file.
+
+        Args:
+            key (str): The cache key of the document.
+            doc (Doc): The tagged document.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        file_descriptor, temp_file = tempfile.mkstemp(
+            dir=self.cache_dir, suffix=".tmp"
+        )
+        os.close(file_descriptor)
+
+        try:
+            DocBin(docs=[doc]).to_disk(temp_file)
+            os.replace(temp_file, self._cache_file(key))
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def _cache_files(self) -> list:
+        if not os.path.isdir(self.cache_dir):
+            return list()
+
+        return [
+            os.path.join(self.cache_dir, file_name)
+            for file_name in os.listdir(self.cache_dir)
+            if file_name.endswith(".spacy")
+        ]
+
+    def prune(self) -> None:
+        """
+        Removes the least recently used documents, so at most max_files are kept.
+
+        Returns:
+            None
+        """
+        if not self.enabled or not self.max_files:
+            return
+
+        cache_files = self._cache_files()
+
+        if len(cache_files) <= self.max_files:
+            return
+
+        cache_files.sort(key=os.path.getmtime)
+
+        for cache_file in cache_files[: len(cache_files) - self.max_files]:
+            try:
+                os.remove(cache_file)
+            except FileNotFoundError:
+                # A parallel run has already removed the file
+                pass
+
+    def clear(self) -> None:
+        """
+        Removes all cached documents.
+
+        Returns:
+            None
+        """
+        for cache_file in self._cache_files():
+            try:
+                os.remove(cache_file)
+            except FileNotFoundError:
+                pass
+
+    def tag(self, nlp: Language, text: str) -> Doc:
+        """
+        Returns the tagged document of a text, tagging it only if it is not cached.
+
+        Args:
+            nlp (Language): The SpaCy pipeline used for tagging.
+            text (str): The text to be tagged.
+
+        Returns:
+            Doc: The tagged document.
+        """
+        key = self.cache_key(nlp, text)
+        doc = self.load(nlp, key)
+
+        if doc is None:
+            doc = nlp(text)
+            self.save(key, doc)
+            self.prune()
+
+        return doc
+
+    def pipe(
+        self,
+        nlp: Language,
+        texts: Iterable[str],
+        batch_size: int = SPACY_BATCH_SIZE,
+        n_process: int = SPACY_N_PROCESS,
+    ) -> Iterator[Doc]:
+        """
+        Tags several texts with nlp.pipe. Only the texts which are not cached yet
+        are passed to the pipeline. The documents keep the order of the texts.
+
+        Args:
+            nlp (Language): The SpaCy pipeline used for tagging.
+            texts (Iterable[str]): The texts to be tagged.
+            batch_size (int, optional): The number of texts per batch.
+            n_process (int, optional): The number of processes used for tagging.
+
+        Returns:
+            Iterator[Doc]: The tagged documents.
+        """
+        texts = list(texts)
+        keys = [self.cache_key(nlp, text) for text in texts]
+        docs = [self.load(nlp, key) for key in keys]
+
+        missing = [index for index, doc in enumerate(docs) if doc is None]
+
+        if missing:
+            tagged_docs = nlp.pipe(
+                (texts[index] for index in missing),
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+
+            for index, doc in zip(missing, tagged_docs):
+                self.save(keys[index], doc)
+                docs[index] = doc
+
+            self.prune()
+
+        return iter(docs)
+
+
+# Shared by every MultiLingualSpacy instance of the process
+SPACY_DOC_CACHE = SpacyDocCache()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,147 @@
+# Standard
+import threading
+
+from collections import OrderedDict
+from typing import Iterable, Tuple
+
+# Pip
+import spacy
+
+from spacy.language import Language
+
+# Custom
+from adversaries.settings.constants.constant_vars import SPACY_MODEL_CACHE_SIZE
+from adversaries.settings.logger.basic_logger import catch_and_log_info
+from adversaries.settings.messages.message_keys import MessageKeys as Mk
+
+spacy_keys = Mk.SpacyModelRegistry
+
+
+class SpacyModelRegistry:
+    """
+    A process-wide, thread-safe store for loaded SpaCy pipelines.
+
+    Loading a SpaCy model is by far the most expensive step of tagging a prompt,
+    so every model is loaded once per process and then shared. The number of
+    pipelines kept in memory is bounded; the least recently used one is evicted
+    once the bound is exceeded. A pipeline is identified by its model name and the
+    components that were excluded when loading it.
+
+    Attributes:
+        max_models (int): The maximum number of pipelines kept in memory.
+
+    Methods:
+        get(model_name, exclude): Returns the pipeline, loading it if necessary.
+        warm_up(model_names, exclude): Loads the given pipelines ahead of time.
+        clear(): Removes all loaded pipelines.
+    """
+
+    def __init__(self, max_models: int = SPACY_MODEL_CACHE_SIZE):
+        """
+        Initialize the SpacyModelRegistry object.
+
+        Args:
+            max_models (int, optional): The maximum number of pipelines kept in memory.
+        """
+        self.max_models = max(1, int(max_models))
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = dict()
+
+    def __contains__(self, model_name: str) -> bool:
+        with self._lock:
+            return any(name == model_name for name, _ in self._models)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def _load_lock(self, key: Tuple[str, tuple]) -> threading.Lock:
+        """
+        Returns the lock guarding the loading of a single pipeline, so that two
+        threads never load the same pipeline twice while different ones load in
+        parallel.
+        """
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: Tuple[str, tuple]):
+        with self._lock:
+            nlp = self._models.get(key)
+            if nlp is not None:
+                self._models.move_to_end(key)
+            return nlp
+
+    def _store(self, key: Tuple[str, tuple], nlp: Language) -> None:
+        with self._lock:
+            self._models[key] = nlp
+            self._models.move_to_end(key)
+
+            while len(self._models) > self.max_models:
+                evicted, _ = self._models.popitem(last=False)
+                catch_and_log_info(
+                    custom_message=f"{spacy_keys.MODEL_EVICTED.value} {evicted}"
+                )
+
+    def get(self, model_name: str, exclude: Iterable[str] = ()) -> Language:
+        """
+        Returns the SpaCy pipeline for the given model, loading it on first use.
+
+        Args:
+            model_name (str): The name of the SpaCy model, e.g. 'de_core_news_sm'.
+            exclude (Iterable[str], optional): Pipeline components that are not
+                loaded at all, e.g. ('parser', 'ner').
+
+        Returns:
+            Language: The loaded SpaCy pipeline.
+        """
+        key = model_name, tuple(sorted(exclude))
+
+        nlp = self._lookup(key)
+        if nlp is not None:
+            return nlp
+
+        with self._load_lock(key):
+            # Another thread may have loaded the model in the meantime
+            nlp = self._lookup(key)
+            if nlp is None:
+                nlp = spacy.load(model_name, exclude=list(key[1]))
+                self._store(key, nlp)
+                catch_and_log_info(
+                    custom_message=f"{spacy_keys.MODEL_LOADED.value} {key}"
+                )
+
+        return nlp
+
+    def warm_up(self, model_names: Iterable[str], exclude: Iterable[str] = ()) -> None:
+        """
+        Loads the given pipelines ahead of time.
+
+        Args:
+            model_names (Iterable[str]): The names of the SpaCy models to be loaded.
+            exclude (Iterable[str], optional): Pipeline components that are not loaded.
+
+        Returns:
+            None
+        """
+        exclude = tuple(exclude)
+        for model_name in model_names:
+            self.get(model_name, exclude=exclude)
+
+    def clear(self) -> None:
+        """
+        Removes all loaded pipelines from the registry.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._models.clear()
+
+
+# Shared by every MultiLingualSpacy instance of the process
+SPACY_MODEL_REGISTRY = SpacyModelRegistry()
+
+
+if __name__ == "__main__":
+    pass
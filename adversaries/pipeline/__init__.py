@@ -0,0 +1,15 @@
+# Standard
+# None
+
+# Pip
+# None
+
+# Custom
+# None
+
+"""
+Main Body
+"""
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,312 @@
+# Standard
+import os
+
+from functools import partial
+from glob import glob
+from typing import Dict, List
+
+# Pip
+# None
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator.app_attacker_evaluator import generate_excerpts
+from adversaries.attacker_evaluator.arr_grid import (
+    ArrCombo,
+    arr_combo_name,
+    arr_training_file,
+    combo_fingerprint,
+    combo_result_file,
+    load_combo_result,
+    pivoted_results_file,
+    run_arr_combo,
+    save_combo_result,
+    select_arr_combos,
+)
+from adversaries.attacker_evaluator.results_store import ResultsStore
+from adversaries.burst_attack.burst_tasks import burst_task
+from adversaries.docs_processor.app_docs_processor import extract_prompt_file
+from adversaries.pipeline.stage_runner import Stage, StageManifest, run_stages
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.constants.constant_vars import (
+    CLASSIFIER,
+    CONTENT_BURST_SEED,
+    CV_WORKERS,
+    FEATURE_MODE,
+    GRID_LANGUAGES,
+    GRID_PROMPTS,
+    GRID_WORKERS,
+    PARTIAL_FIT,
+)
+from adversaries.settings.logger.basic_logger import catch_and_log_info
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+from adversaries.settings.messages.message_keys import MessageKeys as Mk
+
+pipeline_keys = Mk.AnalysisPipeline
+
+EXCERPTS_STAGE = "generate_excerpts"
+MULTI_ARR_STAGE = "multi_arr_results"
+
+
+def extract_prompt_files(docx_files: List[str]) -> None:
+    for docx_file in docx_files:
+        extract_prompt_file(docx_file)
+
+
+def evaluate_and_save_combo(combo: ArrCombo, options: dict) -> None:
+    save_combo_result(
+        combo, run_arr_combo(combo, options), combo_fingerprint(combo, options)
+    )
+
+
+def write_saved_multi_arr_results(combos: List[ArrCombo], options: dict) -> None:
+    """
+    Records the saved results of the combinations as a new run of the results
+    database and exports the ARR result files of the run.
+
+    Args:
+        combos (list): The (language, prompt number) combinations.
+        options (dict): The keyword arguments of evaluate_arr_combo.
+
+    Returns:
+        None
+
+    Raises:
+        Cem.ComboResultMissingError: If the saved result of a combination is
+            missing or broken.
+    """
+    # Erst alle Ergebnisse laden, damit kein unvollstaendiger Lauf entsteht
+    results = dict()
+    for combo in combos:
+        results[combo] = load_combo_result(combo)
+
+        if results[combo] is None:
+            raise Cem.ComboResultMissingError(
+                arr_combo_name(*combo), combo_result_file(combo)
+            )
+
+    with ResultsStore() as results_store:
+        run_id = results_store.start_run(MULTI_ARR_STAGE, options)
+
+        for combo in combos:
+            results_store.record_combo(
+                run_id,
+                combo,
+                results[combo],
+                fingerprint=combo_fingerprint(combo, options),
+                scores_file=sf.arr_sentences_file(arr_training_file(*combo)),
+            )
+
+        results_store.export_multi_arr_results(run_id=run_id)
+
+
+def extraction_stages(prompt_dir: str = Gp.PROMPT_DIR.value) -> List[Stage]:
+    """
+    Returns one extraction stage per language folder of the prompt directory, so
+    a changed prompt only invalidates the stages of its language.
+
+    Args:
+        prompt_dir (str, optional): The directory with one folder per language.
+
+    Returns:
+        list: The extraction stages.
+    """
+    stages = list()
+
+    for folder in sorted(os.listdir(prompt_dir)):
+        folder_dir = os.path.join(prompt_dir, folder)
+        if not os.path.isdir(folder_dir):
+            continue
+
+        docx_files = sorted(
+            os.path.join(folder_dir, file)
+            for file in os.listdir(folder_dir)
+            if file.endswith(".docx")
+        )
+        if not docx_files:
+            continue
+
+        stages.append(
+            Stage(
+                name=f"extract_prompts_{folder.lower()}",
+                run=partial(extract_prompt_files, docx_files),
+                inputs=docx_files,
+                outputs=[
+                    f"{Gp.RESULT_PROMPT_TXT.value}/"
+                    + os.path.basename(docx_file).replace(".docx", ".txt")
+                    for docx_file in docx_files
+                ],
+            )
+        )
+
+    return stages
+
+
+def arr_combo_stages(
+    combos: List[ArrCombo], options: dict, prompt_stages: Dict[str, str]
+) -> List[Stage]:
+    """
+    Returns one stage per language and prompt combination, which generates the
+    bursts, evaluates the scoring model and saves the result of the combination.
+
+    Args:
+        combos (list): The (language, prompt number) combinations.
+        options (dict): The keyword arguments of evaluate_arr_combo.
+        prompt_stages (dict): The name of the stage which writes each prompt text.
+
+    Returns:
+        list: The combination stages.
+    """
+    # Die Anzahl der Prozesse aendert das Ergebnis nicht
+    params = {key: value for key, value in options.items() if key != "cv_workers"}
+    params["seed"] = CONTENT_BURST_SEED
+
+    stages = list()
+
+    for combo in combos:
+        prompt_text, _, _ = burst_task(*combo)
+        training_file = arr_training_file(*combo)
+
+        stages.append(
+            Stage(
+                name=f"arr_{arr_combo_name(*combo)}",
+                run=partial(evaluate_and_save_combo, combo, options),
+                inputs=[prompt_text, training_file],
+                outputs=[combo_result_file(combo), sf.arr_sentences_file(training_file)],
+                params=params,
+                depends_on=[prompt_stages[prompt_text]]
+                if prompt_text in prompt_stages
+                else [],
+                cost=os.path.getsize(training_file)
+                if os.path.exists(training_file)
+                else 0,
+            )
+        )
+
+    return stages
+
+
+def build_analysis_stages(
+    options: dict, languages=GRID_LANGUAGES, prompts=GRID_PROMPTS
+) -> List[Stage]:
+    """
+    Returns the stages of the analysis: prompt extraction, one ARR stage per
+    combination, the ARR result files and the excerpts.
+
+    The combinations are discovered from the training files and the prompt texts,
+    including the prompt texts the extraction stages will write.
+
+    Args:
+        options (dict): The keyword arguments of evaluate_arr_combo.
+        languages (optional): The languages, e.g. 'de,fr'. Empty keeps all.
+        prompts (optional): The prompt numbers, e.g. '1,10'. Empty keeps all.
+
+    Returns:
+        list: The stages of the pipeline.
+    """
+    prompt_stages = {
+        prompt_text: stage
+        for stage in extraction_stages()
+        for prompt_text in stage.outputs
+    }
+    combos = select_arr_combos(
+        languages,
+        prompts,
+        prompt_texts=set(prompt_stages)
+        | set(glob(f"{Gp.RESULT_PROMPT_TXT.value}/Prompt*_*.txt")),
+    )
+
+    combo_stages = arr_combo_stages(
+        combos, options, {path: stage.name for path, stage in prompt_stages.items()}
+    )
+
+    # Nur die Sprachen extrahieren, die auch ausgewertet werden
+    needed_stages = {name for stage in combo_stages for name in stage.depends_on}
+    stages = [
+        stage
+        for stage in {stage.name: stage for stage in prompt_stages.values()}.values()
+        if stage.name in needed_stages
+    ]
+    stages.extend(combo_stages)
+
+    stages.append(
+        Stage(
+            name=MULTI_ARR_STAGE,
+            run=partial(write_saved_multi_arr_results, combos, options),
+            inputs=[combo_result_file(combo) for combo in combos],
+            outputs=[Gp.RESULT_MULTI_ARR_SAVE.value, pivoted_results_file()],
+            depends_on=[stage.name for stage in combo_stages],
+        )
+    )
+
+    stages.append(
+        Stage(
+            name=EXCERPTS_STAGE,
+            run=generate_excerpts,
+            inputs=[stage.outputs[1] for stage in combo_stages],
+            outputs=[
+                f"{Gp.RESULT_ARR_SENTENCE_RESULT_EXCERPT.value}/arr_excerpt_score_{score}.csv"
+                for score in range(4)
+            ],
+            # Die Auszuege werden aus der Datenbank gelesen
+            depends_on=[MULTI_ARR_STAGE],
+        )
+    )
+
+    return stages
+
+
+def run_analysis_pipeline(
+    cv_workers: int = CV_WORKERS,
+    feature_mode: str = FEATURE_MODE,
+    classifier: str = CLASSIFIER,
+    partial_fit: bool = PARTIAL_FIT,
+    workers: int = GRID_WORKERS,
+    force: bool = False,
+    languages=GRID_LANGUAGES,
+    prompts=GRID_PROMPTS,
+) -> Dict[str, str]:
+    """
+    Runs the analysis of quick_analysis and skips every stage whose inputs did not
+    change since the last run.
+
+    Args:
+        cv_workers (int, optional): The number of processes for the folds.
+        feature_mode (str, optional): The n-gram features of the scoring model.
+        classifier (str, optional): The classifier of the scoring model.
+        partial_fit (bool, optional): Whether the scoring model is fitted chunk by
+            chunk.
+        workers (int, optional): The number of processes for independent stages.
+        force (bool, optional): Run every stage regardless of the manifest.
+        languages (optional): The languages, e.g. 'de,fr'. Empty keeps all.
+        prompts (optional): The prompt numbers, e.g. '1,10'. Empty keeps all.
+
+    Returns:
+        dict: 'run' or 'skipped' for the name of every stage.
+    """
+    options = {
+        "save_burst_file": True,
+        "cv_workers": cv_workers,
+        "feature_mode": feature_mode,
+        "classifier": classifier,
+        "partial_fit": partial_fit,
+    }
+
+    status = run_stages(
+        build_analysis_stages(options, languages, prompts),
+        StageManifest(),
+        workers=workers,
+        force=force,
+    )
+
+    catch_and_log_info(
+        custom_message=pipeline_keys.PIPELINE_COMPLETE.value, echo_msg=True
+    )
+
+    return status
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,264 @@
+# Standard
+import hashlib
+import json
+import os
+import tempfile
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+# Pip
+# None
+
+# Custom
+from adversaries.attacker_evaluator.scoring_model_store import file_hash
+from adversaries.settings.constants.constant_paths import GeneralPaths as Gp
+from adversaries.settings.logger.basic_logger import catch_and_log_info
+from adversaries.settings.messages.message_keys import MessageKeys as Mk
+
+pipeline_keys = Mk.AnalysisPipeline
+
+STAGE_RUN = "run"
+STAGE_SKIPPED = "skipped"
+
+# Hash einer Datei, die (noch) nicht existiert
+MISSING_FILE = "missing"
+
+
+class Stage:
+    """
+    A stage of the analysis pipeline.
+
+    A stage is skipped if the content of its input files and its parameters did
+    not change since its last run and its output files are still unchanged.
+
+    Attributes:
+        name (str): The unique name of the stage.
+        run (Callable): Runs the stage, it must be picklable to run in a worker.
+        inputs (list): The files the stage reads.
+        outputs (list): The files the stage writes.
+        params (dict): Further values the outputs depend on, e.g. the classifier.
+        depends_on (list): The names of the stages which write the inputs.
+        cost (float): The expected effort, expensive stages are started first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], object],
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        params: Optional[dict] = None,
+        depends_on: Optional[List[str]] = None,
+        cost: float = 0,
+    ):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.params = params or dict()
+        self.depends_on = list(depends_on or [])
+        self.cost = cost
+
+    def fingerprint(self) -> dict:
+        """
+        Returns the hashes of the current inputs and the parameters of the stage.
+
+        Returns:
+            dict: The hash of every input file and the hash of the parameters.
+        """
+        return {
+            "inputs": {path: hash_file_or_missing(path) for path in self.inputs},
+            "params": hashlib.sha256(
+                json.dumps(self.params, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest(),
+        }
+
+
+def hash_file_or_missing(path: str) -> str:
+    return file_hash(path) if os.path.exists(path) else MISSING_FILE
+
+
+class StageManifest:
+    """
+    The record of the inputs and outputs of every stage of the last run.
+
+    Attributes:
+        manifest_file (str): The JSON file of the manifest.
+        entries (dict): The fingerprint and the output hashes of every stage.
+
+    Methods:
+        is_up_to_date(stage, fingerprint): Whether a stage can be skipped.
+        record(stage, fingerprint): Records a finished stage and saves the manifest.
+    """
+
+    def __init__(self, manifest_file: str = Gp.RESULT_PIPELINE_MANIFEST.value):
+        """
+        Initialize the StageManifest object and load the manifest file.
+
+        Args:
+            manifest_file (str, optional): The JSON file of the manifest.
+        """
+        self.manifest_file = manifest_file
+        self.entries = dict()
+
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file, mode="r", encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            except ValueError:
+                # Ein kaputtes Manifest fuehrt nur dazu, dass alles neu laeuft
+                self.entries = dict()
+
+    def is_up_to_date(self, stage: Stage, fingerprint: dict) -> bool:
+        """
+        Whether the inputs and parameters of a stage are unchanged and its outputs
+        still exist with the recorded content.
+
+        Args:
+            stage (Stage): The stage.
+            fingerprint (dict): The current fingerprint of the stage.
+
+        Returns:
+            bool: True if the stage can be skipped.
+        """
+        entry = self.entries.get(stage.name)
+
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+
+        recorded_outputs = entry.get("outputs", dict())
+
+        return all(
+            recorded_outputs.get(path) == hash_file_or_missing(path)
+            and os.path.exists(path)
+            for path in stage.outputs
+        )
+
+    def record(self, stage: Stage, fingerprint: dict) -> None:
+        """
+        Records the fingerprint and the output hashes of a finished stage. The
+        manifest is saved after every stage, so a crash keeps the finished stages.
+
+        Args:
+            stage (Stage): The finished stage.
+            fingerprint (dict): The fingerprint of the stage before it ran.
+
+        Returns:
+            None
+        """
+        self.entries[stage.name] = {
+            "fingerprint": fingerprint,
+            "outputs": {path: hash_file_or_missing(path) for path in stage.outputs},
+        }
+
+        manifest_dir = os.path.dirname(self.manifest_file) or "."
+        os.makedirs(manifest_dir, exist_ok=True)
+        file_descriptor, temp_file = tempfile.mkstemp(dir=manifest_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, mode="w", encoding="utf-8") as file:
+                json.dump(self.entries, file, indent=2, sort_keys=True)
+            os.replace(temp_file, self.manifest_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+def _run_stage(run: Callable[[], object]) -> None:
+    run()
+
+
+def run_stages(
+    stages: List[Stage],
+    manifest: Optional[StageManifest] = None,
+    workers: int = 1,
+    force: bool = False,
+) -> Dict[str, str]:
+    """
+    Runs the stages in the order of their dependencies and skips every stage
+    whose inputs, parameters and outputs did not change.
+
+    A stage is judged by the content of its inputs, not by whether the stage
+    before it ran, so a stage which writes the same outputs again does not
+    invalidate the stages after it. Stages whose dependencies are finished run
+    side by side in a process pool with several workers.
+
+    Args:
+        stages (list): The stages of the pipeline.
+        manifest (StageManifest, optional): The manifest of the last run.
+        workers (int, optional): The number of processes for independent stages.
+        force (bool, optional): Run every stage regardless of the manifest.
+
+    Returns:
+        dict: 'run' or 'skipped' for the name of every stage.
+    """
+    manifest = manifest or StageManifest()
+    stages_by_name = {stage.name: stage for stage in stages}
+    waiting = {
+        stage.name: set(stage.depends_on) & set(stages_by_name) for stage in stages
+    }
+    status = dict()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    running = dict()
+
+    def finish(stage: Stage, fingerprint: dict, stage_status: str) -> None:
+        if stage_status == STAGE_RUN:
+            manifest.record(stage, fingerprint)
+        status[stage.name] = stage_status
+
+        for dependencies in waiting.values():
+            dependencies.discard(stage.name)
+
+    try:
+        while waiting or running:
+            ready = sorted(
+                (stages_by_name[name] for name, deps in waiting.items() if not deps),
+                key=lambda stage: -stage.cost,
+            )
+
+            if not ready and not running:
+                raise ValueError(
+                    f"Cyclic or missing stage dependencies: {sorted(waiting)}"
+                )
+
+            for stage in ready:
+                del waiting[stage.name]
+                fingerprint = stage.fingerprint()
+
+                if not force and manifest.is_up_to_date(stage, fingerprint):
+                    skipped_msg = f"{pipeline_keys.STAGE_SKIPPED.value} {stage.name}"
+                    catch_and_log_info(custom_message=skipped_msg, echo_msg=True)
+                    finish(stage, fingerprint, STAGE_SKIPPED)
+                    continue
+
+                catch_and_log_info(
+                    custom_message=f"{pipeline_keys.STAGE_RUN.value} {stage.name}",
+                    echo_msg=True,
+                )
+
+                if executor is None:
+                    _run_stage(stage.run)
+                    finish(stage, fingerprint, STAGE_RUN)
+                else:
+                    future = executor.submit(_run_stage, stage.run)
+                    running[future] = (stage, fingerprint)
+
+            # Skipped or serial stages may have unblocked further stages
+            if running and not any(not deps for deps in waiting.values()):
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage, fingerprint = running.pop(future)
+                    future.result()
+                    finish(stage, fingerprint, STAGE_RUN)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return status
+
+
+if __name__ == "__main__":
+    pass
@@ -20,6 +20,7 @@ class GeneralPaths(Enum):
 
     LOG_DIR = "log"
     PROMPT_DIR = "resources/data/Prompts/"
+    ASAP_TRAINING_DATA_DIR = "resources/data/monolingual_ASAP_data_with_scores"
 
     # results
     RESULT_PROMPT_TXT = "results/prompt_txt"
@@ -31,6 +32,13 @@ class GeneralPaths(Enum):
     RESULT_BURST_ATTACK_RESULT = f"results/burst_attack_txt"
     RESULT_ARR_HEADER = "results/adversarial_rejection_rates/arr.csv"
     RESULT_NOUN_NONE_DIST = "results/noun_none_noun_distribution"
+    RESULT_SPACY_DOC_CACHE = "results/spacy_doc_cache"
+    RESULT_MODELS = "results/models"
+    RESULT_PIPELINE_CACHE = "results/pipeline_cache"
+    RESULT_ARR_COMBOS = "results/adversarial_rejection_rates/combos"
+    RESULT_PIPELINE_MANIFEST = "results/pipeline_manifest.json"
+    RESULT_ARR_QUEUE = "results/arr_queue"
+    RESULT_DATABASE = "results/adversarial_results.sqlite"
 
 
     RESULT_SINGLE_ARR_SAVE = "results/adversarial_rejection_rates/single_save_file.csv"
@@ -12,6 +12,46 @@ Hier sind Konstanten, die von anderen Funktionen verwendet werden.
 """
 CONTENT_BURST_SEED = get_config_data().get("CONTENT_BURST_SEED")
 TEST_TESSERACT_IMG = get_config_data().get("TEST_TESSERACT_IMG")
+SPACY_MODEL_CACHE_SIZE = get_config_data().get("SPACY_MODEL_CACHE_SIZE", 8)
+SPACY_BATCH_SIZE = get_config_data().get("SPACY_BATCH_SIZE", 16)
+SPACY_N_PROCESS = get_config_data().get("SPACY_N_PROCESS", 1)
+SPACY_DOC_CACHE_ENABLED = get_config_data().get("SPACY_DOC_CACHE", True)
+SPACY_DOC_CACHE_MAX_FILES = get_config_data().get("SPACY_DOC_CACHE_MAX_FILES", 1000)
+BURST_WORKERS = get_config_data().get("BURST_WORKERS", 1)
+BURST_CHUNK_SIZE = get_config_data().get("BURST_CHUNK_SIZE", 10000)
+VOCABULARY_INDEX_SIZE = get_config_data().get("VOCABULARY_INDEX_SIZE", 64)
+SCORING_MODEL_CACHE_ENABLED = get_config_data().get("SCORING_MODEL_CACHE", True)
+CV_WORKERS = get_config_data().get("CV_WORKERS", 1)
+SCORING_PIPELINE_MEMORY = get_config_data().get("SCORING_PIPELINE_MEMORY", False)
+FEATURE_MODE = get_config_data().get("FEATURE_MODE", "count")
+HASHING_N_FEATURES = get_config_data().get("HASHING_N_FEATURES", 2**20)
+FEATURE_CHUNK_SIZE = get_config_data().get("FEATURE_CHUNK_SIZE", 10000)
+FEATURE_WORKERS = get_config_data().get("FEATURE_WORKERS", 1)
+PARTIAL_FIT = get_config_data().get("PARTIAL_FIT", False)
+CLASSIFIER = get_config_data().get("CLASSIFIER", "svc")
+NYSTROEM_COMPONENTS = get_config_data().get("NYSTROEM_COMPONENTS", 300)
+PREDICT_CHUNK_SIZE = get_config_data().get("PREDICT_CHUNK_SIZE", 10000)
+PREDICT_WORKERS = get_config_data().get("PREDICT_WORKERS", 1)
+SERVE_HOST = get_config_data().get("SERVE_HOST", "127.0.0.1")
+SERVE_PORT = get_config_data().get("SERVE_PORT", 8765)
+SERVE_MAX_BATCH_SIZE = get_config_data().get("SERVE_MAX_BATCH_SIZE", 256)
+SERVE_MAX_WAIT_MS = get_config_data().get("SERVE_MAX_WAIT_MS", 5)
+SERVE_MAX_BURSTS = get_config_data().get("SERVE_MAX_BURSTS", 10000)
+ARR_CONFIDENCE = get_config_data().get("ARR_CONFIDENCE", 0.95)
+ARR_INTERVAL_METHOD = get_config_data().get("ARR_INTERVAL_METHOD", "wilson")
+GRID_WORKERS = get_config_data().get("GRID_WORKERS", 1)
+# Komma-getrennte Filter des Grids, leer fuer alle gefundenen Kombinationen
+GRID_LANGUAGES = get_config_data().get("GRID_LANGUAGES", "")
+GRID_PROMPTS = get_config_data().get("GRID_PROMPTS", "")
+# Arbeitswarteschlange fuer mehrere Rechner: Heartbeat, Zeit bis zur Neuvergabe
+QUEUE_HEARTBEAT_SECONDS = get_config_data().get("QUEUE_HEARTBEAT_SECONDS", 30)
+QUEUE_STALE_SECONDS = get_config_data().get("QUEUE_STALE_SECONDS", 300)
+QUEUE_MAX_ATTEMPTS = get_config_data().get("QUEUE_MAX_ATTEMPTS", 3)
+
+# Die Sprachen und Prompts, die ausgewertet werden.
+# orig300 und orig sind Varianten der englischen Daten.
+LANGUAGE_CHOICES = ["en", "en_orig300", "en_orig", "es", "fr", "de"]
+PROMPT_CHOICES = [1, 2, 10]
 current_datetime = datetime.datetime.now()
 TIMESTAMP = current_datetime.strftime("%Y_%m_%d_%H_%M_%S")
 SIMPLE_TIMESTAMP = current_datetime.strftime("%Y_%m_%d")
@@ -16,3 +16,187 @@ class CustomErrorMessages:
                 f"The following languages are valid: {', '.join(self.valid_langs)}"
             )
             super().__init__(message)
+
+    class SpacyPipelineProfileError(Exception):
+        """
+        Exception raised for unknown Spacy pipeline profiles.
+        """
+
+        def __init__(self, profile, valid_profiles):
+            self.profile = profile
+            self.valid_profiles = valid_profiles
+            message = (
+                f"'{self.profile}' is not a valid pipeline profile. "
+                f"The following profiles are valid: {', '.join(self.valid_profiles)}"
+            )
+            super().__init__(message)
+
+    class ContentBurstVocabularyError(Exception):
+        """
+        Exception raised if no content bursts can be built from a vocabulary.
+        """
+
+        def __init__(self, vocabulary_size):
+            self.vocabulary_size = vocabulary_size
+            message = (
+                f"No content bursts can be generated from the {self.vocabulary_size} "
+                "grams found. At least one gram with more than one character is needed."
+            )
+            super().__init__(message)
+
+    class BurstFileCompressionError(Exception):
+        """
+        Exception raised for unsupported burst file compressions.
+        """
+
+        def __init__(self, compression, valid_compressions):
+            self.compression = compression
+            self.valid_compressions = valid_compressions
+            message = (
+                f"'{self.compression}' is not a supported compression. "
+                f"The following compressions are valid: {', '.join(self.valid_compressions)}"
+            )
+            super().__init__(message)
+
+    class FeatureModeError(Exception):
+        """
+        Exception raised for unknown feature modes of the scoring model.
+        """
+
+        def __init__(self, feature_mode, valid_modes):
+            self.feature_mode = feature_mode
+            self.valid_modes = valid_modes
+            message = (
+                f"'{self.feature_mode}' is not a valid feature mode. "
+                f"The following modes are valid: {', '.join(self.valid_modes)}"
+            )
+            super().__init__(message)
+
+    class ClassifierError(Exception):
+        """
+        Exception raised for unknown classifiers of the scoring model.
+        """
+
+        def __init__(self, classifier, valid_classifiers):
+            self.classifier = classifier
+            self.valid_classifiers = valid_classifiers
+            message = (
+                f"'{self.classifier}' is not a valid classifier. "
+                f"The following classifiers are valid: {', '.join(self.valid_classifiers)}"
+            )
+            super().__init__(message)
+
+    class PartialFitError(Exception):
+        """
+        Exception raised if a scoring model cannot be fitted chunk by chunk.
+        """
+
+        def __init__(self, vectorizer, classifier):
+            self.vectorizer = vectorizer
+            self.classifier = classifier
+            message = (
+                f"A scoring model with a {self.vectorizer} and a {self.classifier} "
+                "cannot be fitted chunk by chunk. The 'hashing' feature mode and "
+                "the 'sgd' classifier are needed."
+            )
+            super().__init__(message)
+
+    class IntervalMethodError(Exception):
+        """
+        Exception raised for unknown confidence interval methods of the ARR.
+        """
+
+        def __init__(self, method, valid_methods):
+            self.method = method
+            self.valid_methods = valid_methods
+            message = (
+                f"'{self.method}' is not a valid interval method. "
+                f"The following methods are valid: {', '.join(self.valid_methods)}"
+            )
+            super().__init__(message)
+
+    class BurstAmountError(Exception):
+        """
+        Exception raised if a request asks for too many or too few bursts.
+        """
+
+        def __init__(self, amount, max_amount):
+            self.amount = amount
+            self.max_amount = max_amount
+            message = (
+                f"'{self.amount}' is not a valid number of bursts. "
+                f"Between 1 and {self.max_amount} bursts can be requested."
+            )
+            super().__init__(message)
+
+    class ScoringTextsError(Exception):
+        """
+        Exception raised if the answers of a scoring request are not a list of strings.
+        """
+
+        def __init__(self, texts):
+            self.texts = texts
+            message = (
+                f"'texts' must be a list of strings, not {type(self.texts).__name__}."
+            )
+            super().__init__(message)
+
+    class ArrGridFilterError(Exception):
+        """
+        Exception raised if no language and prompt combination matches the filters.
+        """
+
+        def __init__(self, languages, prompts, valid_combos):
+            self.languages = languages
+            self.prompts = prompts
+            self.valid_combos = valid_combos
+            message = (
+                f"No combination matches the languages '{', '.join(self.languages)}' "
+                f"and the prompts '{', '.join(self.prompts)}'. "
+                f"The following combinations are available: {', '.join(self.valid_combos)}"
+            )
+            super().__init__(message)
+
+    class ArrComboError(Exception):
+        """
+        Exception raised if the bursts of a language and prompt cannot be generated.
+        """
+
+        def __init__(self, language_choice, prompt_num, valid_combos):
+            self.language_choice = language_choice
+            self.prompt_num = prompt_num
+            self.valid_combos = valid_combos
+            message = (
+                f"The combination lang: '{self.language_choice}' prompt_num: "
+                f"'{self.prompt_num}' could not be evaluated. "
+                f"The following combinations are available: {', '.join(self.valid_combos)}. "
+                "If it is listed, check the encoding of its prompt files."
+            )
+            super().__init__(message)
+
+    class ComboResultMissingError(Exception):
+        """
+        Exception raised if the saved result of a language and prompt is missing.
+        """
+
+        def __init__(self, combo_name, result_file):
+            self.combo_name = combo_name
+            self.result_file = result_file
+            message = (
+                f"The result of '{self.combo_name}' is missing or broken: "
+                f"'{self.result_file}'. Run its ARR stage again."
+            )
+            super().__init__(message)
+
+    class ResultsStoreEmptyError(Exception):
+        """
+        Exception raised if the results database has no results yet.
+        """
+
+        def __init__(self, db_file):
+            self.db_file = db_file
+            message = (
+                f"The results database '{self.db_file}' has no results yet. "
+                f"Generate the ARR with 'multiple' or 'collect' first."
+            )
+            super().__init__(message)
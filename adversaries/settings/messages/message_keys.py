@@ -85,6 +85,81 @@ class MessageKeys:
         SINGULAR_ARR_PROMPT_NUM_SHORT = "-pn"
         SINGULAR_ARR_PROMPT_NUM_HELP = "The prompt text to be evaluated."
 
+        SAVE_BURST_FILE_DEFAULT = True
+        SAVE_BURST_FILE_LONG = "--save_burst_file/--no_save_burst_file"
+        SAVE_BURST_FILE_HELP = "Also write the generated bursts to a TSV file."
+
+        CV_WORKERS_LONG = "--cv_workers"
+        CV_WORKERS_HELP = (
+            "The number of processes for the cross-validation folds, -1 for all cores."
+        )
+        CROSS_VALIDATION_FOLDS = "Cross-validation folds (QWK, fit time, predict time):"
+
+        FEATURE_MODE_LONG = "--feature_mode"
+        FEATURE_MODE_HELP = "The n-gram features of the scoring model: count or hashing."
+
+        CLASSIFIER_LONG = "--classifier"
+        CLASSIFIER_HELP = (
+            "The classifier of the scoring model: svc, linear_svc, sgd or nystroem."
+        )
+
+        PARTIAL_FIT_LONG = "--partial_fit/--full_fit"
+        PARTIAL_FIT_HELP = (
+            "Fit the scoring model chunk by chunk, needs hashing features and sgd."
+        )
+
+        BENCHMARK_SCORING_NAME = "benchmark_scoring"
+        BENCHMARK_SCORING_HELP = (
+            "Compare QWK, ARR and speed of the scoring model configurations"
+        )
+        BENCHMARK_FEATURE_MODES_DEFAULT = "count,hashing"
+        BENCHMARK_FEATURE_MODES_LONG = "--feature_modes"
+        BENCHMARK_FEATURE_MODES_HELP = "Comma separated feature modes to be compared."
+        BENCHMARK_CLASSIFIERS_DEFAULT = "svc,linear_svc,sgd,nystroem"
+        BENCHMARK_CLASSIFIERS_LONG = "--classifiers"
+        BENCHMARK_CLASSIFIERS_HELP = "Comma separated classifiers to be compared."
+        BENCHMARK_SCORING_COMPLETE = "The scoring benchmark is complete."
+
+        CHUNKED_ARR_NAME = "chunked"
+        CHUNKED_ARR_HELP = (
+            "Generate the ARR of many bursts for a language with bounded memory"
+        )
+        BURST_FILES_DEFAULT = ""
+        BURST_FILES_LONG = "--burst_files"
+        BURST_FILES_HELP = (
+            "Glob pattern of burst files to be scored. "
+            "If empty, the bursts are generated on the fly."
+        )
+        PREDICT_CHUNK_SIZE_LONG = "--chunk_size"
+        PREDICT_CHUNK_SIZE_HELP = "The number of bursts scored at once."
+        PREDICT_WORKERS_LONG = "--workers"
+        PREDICT_WORKERS_SHORT = "-w"
+        PREDICT_WORKERS_HELP = "The number of processes which score the chunks."
+
+        TARGET_WIDTH_DEFAULT = 0.0
+        TARGET_WIDTH_LONG = "--target_width"
+        TARGET_WIDTH_HELP = (
+            "Stop scoring once the confidence interval of the ARR is narrower, "
+            "0 scores all bursts."
+        )
+        CONFIDENCE_LONG = "--confidence"
+        CONFIDENCE_HELP = "The confidence level of the ARR interval."
+        INTERVAL_METHOD_LONG = "--interval_method"
+        INTERVAL_METHOD_HELP = "The ARR interval: wilson or clopper_pearson."
+
+        SERVE_NAME = "serve"
+        SERVE_HELP = "Serve scoring and burst generation over a local HTTP endpoint"
+        SERVE_LANGUAGES_LONG = "--languages"
+        SERVE_LANGUAGES_HELP = "Comma separated languages whose models are served."
+        SERVE_PROMPTS_LONG = "--prompts"
+        SERVE_PROMPTS_HELP = "Comma separated prompt numbers whose models are served."
+        SERVE_HOST_LONG = "--host"
+        SERVE_HOST_HELP = "The host the service listens on."
+        SERVE_PORT_LONG = "--port"
+        SERVE_PORT_HELP = "The port the service listens on."
+        SERVE_READY = "The scoring service is listening on"
+        SERVE_STOPPED = "The scoring service has been stopped."
+
         RATE_ATTACK = "Rate adversarial attack"
         SAVE_ATTACK = "Save adversarial attack results"
         SAVE_ARR = "The ARR rate has been generated and saved."
@@ -95,6 +170,56 @@ class MessageKeys:
 
         MULTI_ARR_NAME = "multiple"
         MULTI_ARR_HELP = "Generate ARR for all languages"
+        GRID_WORKERS_LONG = "--workers"
+        GRID_WORKERS_SHORT = "-w"
+        GRID_WORKERS_HELP = (
+            "The number of processes which evaluate the language and prompt "
+            "combinations, the largest first."
+        )
+        GRID_LANGUAGES_LONG = "--languages"
+        GRID_LANGUAGES_HELP = (
+            "Comma separated languages to be evaluated, e.g. 'de,fr'. "
+            "Empty evaluates every language with training data and a prompt."
+        )
+        GRID_PROMPTS_LONG = "--prompts"
+        GRID_PROMPTS_HELP = (
+            "Comma separated prompt numbers to be evaluated, e.g. '1,10'. "
+            "Empty evaluates every prompt."
+        )
+        RESUME_LONG = "--resume/--no_resume"
+        RESUME_HELP = (
+            "Skip the combinations whose checkpoint was computed from the same inputs."
+        )
+        COMBO_RESUMED = "Resumed from the checkpoint:"
+        COMBO_FAILED = "The evaluation of the combination failed:"
+
+        QUEUE_ENQUEUE_NAME = "enqueue"
+        QUEUE_ENQUEUE_HELP = (
+            "Add the language, prompt and seed tasks of the grid to a shared queue"
+        )
+        QUEUE_WORKER_NAME = "worker"
+        QUEUE_WORKER_HELP = (
+            "Claim and evaluate tasks of a shared queue until it is empty"
+        )
+        QUEUE_COLLECT_NAME = "collect"
+        QUEUE_COLLECT_HELP = (
+            "Merge the results of a shared queue into the standard ARR files"
+        )
+        QUEUE_DIR_LONG = "--queue_dir"
+        QUEUE_DIR_HELP = (
+            "The queue directory, it must be on a filesystem all workers share."
+        )
+        QUEUE_SEEDS_LONG = "--seeds"
+        QUEUE_SEEDS_HELP = (
+            "Comma separated seeds of the bursts, e.g. '42,43'. "
+            "Several seeds are averaged by collect."
+        )
+        QUEUE_PROCESSES_HELP = "The number of worker processes on this machine."
+        QUEUE_TASKS_ADDED = "Tasks added to the queue:"
+        QUEUE_TASK_CLAIMED = "Claimed the task:"
+        QUEUE_TASK_FAILED = "The task failed:"
+        QUEUE_WORKER_DONE = "The queue is empty, completed tasks:"
+        QUEUE_UNFINISHED = "The queue still has unfinished tasks:"
 
         VISUALIZE_ARR_NAME = "visualize"
         VISUALIZE_ARR_HELP = "Generate ARR, QWK and Noun distribution visualization for all languages"
@@ -150,6 +275,39 @@ class MessageKeys:
 
         BURST_COMPLETE = "The adversarial bursts have been generated and saved."
 
+        BURST_AMOUNT_DEFAULT = 1000
+        BURST_AMOUNT_LONG = "--burst_amount"
+        BURST_AMOUNT_SHORT = "-n"
+        BURST_AMOUNT_HELP = "The number of bursts to be generated."
+
+        CHUNK_SIZE_LONG = "--chunk_size"
+        CHUNK_SIZE_HELP = "The number of bursts generated and written at once."
+
+        COMPRESSION_DEFAULT = "none"
+        COMPRESSION_LONG = "--compression"
+        COMPRESSION_HELP = "Compress the burst files: none, gzip or xz."
+
+        SHARD_SIZE_DEFAULT = 0
+        SHARD_SIZE_LONG = "--shard_size"
+        SHARD_SIZE_HELP = "The maximum number of bursts per file, 0 for a single file."
+
+        GENERATE_ALL_BURSTS = "generate_all_bursts"
+        GENERATE_ALL_BURSTS_HELP = (
+            "Generate the bursts of all languages and prompts in parallel"
+        )
+        WORKERS_LONG = "--workers"
+        WORKERS_SHORT = "-w"
+        WORKERS_HELP = "The number of worker processes."
+
+    class AnalysisPipeline(Enum):
+        STAGE_RUN = "Running stage:"
+        STAGE_SKIPPED = "Stage is up to date, skipped:"
+        PIPELINE_COMPLETE = "The analysis pipeline is complete."
+
+    class SpacyModelRegistry(Enum):
+        MODEL_LOADED = "SpaCy model loaded:"
+        MODEL_EVICTED = "SpaCy model evicted from the registry:"
+
     class DocProcessor(Enum):
         APP_NAME = "docs_processor"
         APP_NAME_HELP = "Process documents in order to extract prompts"
@@ -158,3 +316,17 @@ class MessageKeys:
         EXTRACT_TEXT_COMPLETE = (
             "The text from the prompts has been extracted and saved."
         )
+
+        BENCHMARK_SPACY = "benchmark_spacy"
+        BENCHMARK_SPACY_HELP = (
+            "Measure the tagging throughput of the SpaCy pipeline profiles"
+        )
+        BENCHMARK_LANGUAGES_DEFAULT = "de,en,es,fr"
+        BENCHMARK_LANGUAGES_LONG = "--languages"
+        BENCHMARK_LANGUAGES_SHORT = "-lns"
+        BENCHMARK_LANGUAGES_HELP = "Comma separated languages to be benchmarked."
+        BENCHMARK_REPEATS_DEFAULT = 5
+        BENCHMARK_REPEATS_LONG = "--repeats"
+        BENCHMARK_REPEATS_SHORT = "-r"
+        BENCHMARK_REPEATS_HELP = "How often the prompts of a language are tagged."
+        BENCHMARK_COMPLETE = "The SpaCy benchmark is complete."
@@ -0,0 +1,37 @@
+# Standard
+# None
+
+# Pip
+import pytest
+
+# Custom
+# None
+
+ANSWERS = [
+    ("Essig und Wasser in den Behälter", 1),
+    ("Wie viel Essig soll eingefüllt werden?", 2),
+    ("keine Ahnung", 0),
+    ("Welche Essigsorte soll verwendet werden?", 2),
+    ("Die Proben in Essig legen", 1),
+    ("None", 0),
+] * 4
+
+
+@pytest.fixture
+def training_answers():
+    return [text for text, _ in ANSWERS]
+
+
+@pytest.fixture
+def training_file(tmp_path):
+    training_file = tmp_path / "ASAP_de_prompt1.tsv"
+    rows = ["id\tprompt\tscore\ttext"] + [
+        f"de_{index:06}\t1\t{score}\t{text}"
+        for index, (text, score) in enumerate(ANSWERS)
+    ]
+    training_file.write_text("\n".join(rows), encoding="utf-8")
+    return str(training_file)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,169 @@
+# Standard
+import csv
+
+# Pip
+import pytest
+
+# Custom
+from adversaries.attacker_evaluator import arr_grid
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+def fake_evaluate_arr_combo(language_choice, prompt_num, **options):
+    arr = round(len(language_choice) / 10 + prompt_num / 100, 3)
+    arr_data_results = {
+        "METHOD": "CONTENT_BURST",
+        "PROMPT": f"ASAP_{language_choice}_prompt{prompt_num}",
+        "PROMPT_NUMBER": prompt_num,
+        "LANGUAGE": language_choice[:2],
+        "ARR": arr,
+    }
+    return arr_data_results, {"QWK": 1 - arr, "ARR": arr}
+
+
+@pytest.fixture
+def fake_grid(monkeypatch, tmp_path):
+    # Die Worker werden geforkt und uebernehmen die ersetzte Funktion
+    monkeypatch.setattr(arr_grid, "evaluate_arr_combo", fake_evaluate_arr_combo)
+    monkeypatch.setattr(
+        arr_grid,
+        "combo_result_file",
+        lambda combo: str(tmp_path / f"{arr_grid.arr_combo_name(*combo)}.json"),
+    )
+
+
+def test_combos_are_discovered_from_training_files_and_prompts(tmp_path):
+    for training_file in (
+        "ASAP_it_prompt3.tsv",
+        "ASAP_en_orig_prompt3.tsv",
+        "ASAP_de_prompt3.tsv",
+        "ASAP_en_prompt12.tsv",
+        "notes.txt",
+    ):
+        (tmp_path / training_file).write_text("")
+
+    combos = arr_grid.discover_arr_combos(
+        str(tmp_path),
+        prompt_texts=["out/Prompt3_it.txt", "out/Prompt3_en.txt", "Prompt12_en.txt"],
+    )
+
+    # de hat keinen Prompt-Text, neue Sprachen kommen nach den bekannten
+    assert combos == [("en_orig", 3), ("it", 3), ("en", 12)]
+
+
+def test_the_grid_is_filtered_by_language_and_prompt():
+    combos = arr_grid.discover_arr_combos()
+
+    assert combos == arr_grid.arr_combos()
+    assert arr_grid.filter_arr_combos(combos, "de, fr", "1,10") == [
+        ("fr", 1),
+        ("de", 1),
+        ("fr", 10),
+        ("de", 10),
+    ]
+    assert arr_grid.filter_arr_combos(combos, ["en_orig"], "") == [
+        ("en_orig", 1),
+        ("en_orig", 2),
+        ("en_orig", 10),
+    ]
+
+    with pytest.raises(Cem.ArrGridFilterError):
+        arr_grid.filter_arr_combos(combos, "it", "")
+
+
+def test_largest_training_files_come_first():
+    combos = arr_grid.arr_combos(["de", "en_orig", "fr"], [1, 10])
+    ordered = arr_grid.order_largest_first(combos)
+
+    assert sorted(ordered) == sorted(combos)
+    assert [language for language, _ in ordered[:2]] == ["en_orig", "en_orig"]
+
+
+def test_pool_results_equal_the_serial_results(fake_grid):
+    combos = arr_grid.arr_combos()
+    finished = list()
+
+    serial = arr_grid.run_arr_grid(combos, workers=1)
+    pooled = arr_grid.run_arr_grid(
+        combos, workers=3, on_result=lambda combo, result: finished.append(combo)
+    )
+
+    assert list(pooled) == combos
+    assert pooled == serial
+    assert sorted(finished) == sorted(combos)
+
+
+def test_multi_arr_results_keep_the_grid_order(fake_grid, tmp_path):
+    combos = arr_grid.arr_combos(["en", "de"], [1, 10])
+    results = arr_grid.run_arr_grid(combos, workers=1)
+
+    file_standard, file_pivoted = arr_grid.write_multi_arr_results(
+        results, str(tmp_path / "content_bursts_arr_results.csv")
+    )
+
+    with open(file_standard, newline="") as standard:
+        header, arr_row, qwk_row = list(csv.reader(standard))
+    with open(file_pivoted, newline="") as pivoted:
+        pivoted_rows = list(csv.reader(pivoted))
+
+    assert header == [
+        "EVALUATION METRIC",
+        "en_prompt1",
+        "de_prompt1",
+        "en_prompt10",
+        "de_prompt10",
+    ]
+    assert arr_row[1:] == ["0.21", "0.21", "0.3", "0.3"]
+    assert qwk_row[1:] == ["0.79", "0.79", "0.7", "0.7"]
+    assert pivoted_rows[0] == ["Language Prompt", "ARR", "QWK"]
+    assert pivoted_rows[1] == ["en prompt1", "0.21", "0.79"]
+
+
+def test_resume_only_reruns_failed_or_changed_combos(fake_grid, monkeypatch):
+    combos = arr_grid.arr_combos(["en", "fr"], [1, 10])
+    evaluated = list()
+    broken = {("fr", 10)}
+
+    def evaluate(language_choice, prompt_num, **options):
+        evaluated.append((language_choice, prompt_num))
+        if (language_choice, prompt_num) in broken:
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        return fake_evaluate_arr_combo(language_choice, prompt_num, **options)
+
+    monkeypatch.setattr(arr_grid, "evaluate_arr_combo", evaluate)
+
+    # Die anderen Kombinationen werden trotzdem ausgewertet und gespeichert
+    with pytest.raises(UnicodeDecodeError):
+        arr_grid.run_arr_grid(combos, workers=1)
+    assert evaluated == combos
+
+    broken.clear()
+    evaluated.clear()
+    resumed = arr_grid.run_arr_grid(combos, workers=1, resume=True)
+
+    assert evaluated == [("fr", 10)]
+    assert resumed == arr_grid.run_arr_grid(combos, workers=1)
+
+    # Andere Optionen passen nicht mehr zu den Checkpoints
+    evaluated.clear()
+    arr_grid.run_arr_grid(
+        combos, workers=1, options={"classifier": "nystroem"}, resume=True
+    )
+    assert evaluated == combos
+
+
+def test_invalid_combos_name_the_discovered_grid(monkeypatch):
+    monkeypatch.setattr(
+        arr_grid, "discover_arr_combos", lambda: arr_grid.arr_combos(["de"], [1, 10])
+    )
+
+    with pytest.raises(Cem.ArrComboError) as combo_error:
+        arr_grid.evaluate_arr_combo("xx", 3, save_burst_file=False)
+
+    assert "de_prompt1, de_prompt10" in str(combo_error.value)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,147 @@
+# Standard
+import csv
+import os
+
+# Pip
+import pytest
+
+# Custom
+from adversaries.attacker_evaluator import arr_grid
+from adversaries.attacker_evaluator.arr_queue import (
+    CLAIMED,
+    DONE,
+    FAILED,
+    PENDING,
+    ArrTaskQueue,
+    collect_queue_results,
+    run_local_queue_workers,
+)
+
+OPTIONS = {"save_burst_file": True, "feature_mode": "word", "classifier": "svc"}
+
+
+def fake_evaluate_arr_combo(language_choice, prompt_num, random_seed=42, **options):
+    arr = round(len(language_choice) / 10 + prompt_num / 100 + random_seed / 1000, 3)
+    arr_data_results = {
+        "METHOD": "CONTENT_BURST",
+        "PROMPT": f"ASAP_{language_choice}_prompt{prompt_num}",
+        "PROMPT_NUMBER": prompt_num,
+        "LANGUAGE": language_choice[:2],
+        "ARR": arr,
+    }
+    return arr_data_results, {"QWK": 1 - arr, "ARR": arr}
+
+
+@pytest.fixture
+def fake_queue(monkeypatch, tmp_path):
+    # Die Worker werden geforkt und uebernehmen die ersetzte Funktion
+    monkeypatch.setattr(arr_grid, "evaluate_arr_combo", fake_evaluate_arr_combo)
+    return str(tmp_path / "queue")
+
+
+def run_workers(queue_dir, processes):
+    return run_local_queue_workers(
+        queue_dir, processes, heartbeat_seconds=0.05, stale_seconds=60
+    )
+
+
+def read_rows(csv_file):
+    with open(csv_file, newline="") as saved_file:
+        return list(csv.reader(saved_file))
+
+
+def test_every_task_is_enqueued_and_claimed_once(fake_queue):
+    queue = ArrTaskQueue(fake_queue)
+    combos = arr_grid.arr_combos(["en", "de"], [1, 10])
+
+    assert len(queue.enqueue(combos, [42, 43], OPTIONS)) == 8
+    assert queue.enqueue(combos, [42, 43], OPTIONS) == list()
+
+    claimed = list()
+    while (task := queue.claim()) is not None:
+        claimed.append(task[1])
+
+    assert len({task["TASK"] for task in claimed}) == 8
+    assert queue.counts() == {PENDING: 0, CLAIMED: 8, DONE: 0, FAILED: 0}
+    # Die Burst-Datei wird nur fuer den Standard-Seed geschrieben
+    assert {
+        task["SEED"] for task in claimed if task["OPTIONS"]["save_burst_file"]
+    } == {arr_grid.CONTENT_BURST_SEED}
+
+
+def test_stale_tasks_are_retried_and_finally_failed(fake_queue):
+    queue = ArrTaskQueue(fake_queue)
+    queue.enqueue([("de", 1)], [42], OPTIONS)
+
+    for attempt in (1, 2):
+        claimed_file, _ = queue.claim()
+        assert claimed_file.endswith(f".attempt{attempt}.json")
+
+        # Ohne Heartbeat wird die Aufgabe von anderen Workern neu vergeben
+        os.utime(os.path.join(fake_queue, CLAIMED, claimed_file), (0, 0))
+        assert queue.requeue_stale(stale_seconds=60, max_attempts=2) == [claimed_file]
+
+    assert queue.counts() == {PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 1}
+
+
+def test_long_pending_tasks_are_not_stale_when_claimed(fake_queue, monkeypatch):
+    queue = ArrTaskQueue(fake_queue)
+    queue.enqueue([("de", 1)], [42], OPTIONS)
+    # Die Zeit bis zum ersten Heartbeat des Workers
+    monkeypatch.setattr(queue, "heartbeat", lambda claimed_file: True)
+
+    # Die Aufgabe hat lange gewartet, bevor ein Worker frei wurde
+    pending_dir = os.path.join(fake_queue, PENDING)
+    for pending_file in os.listdir(pending_dir):
+        os.utime(os.path.join(pending_dir, pending_file), (0, 0))
+
+    assert queue.claim() is not None
+    assert queue.requeue_stale(stale_seconds=60) == list()
+    assert queue.counts()[CLAIMED] == 1
+
+
+def test_local_workers_equal_a_single_worker(fake_queue, tmp_path):
+    combos = arr_grid.arr_combos(["en", "de", "fr"], [1, 10])
+    csv_files = list()
+
+    for processes in (1, 3):
+        queue_dir = f"{fake_queue}_{processes}"
+        ArrTaskQueue(queue_dir).enqueue(combos, [42, 44], OPTIONS)
+
+        assert run_workers(queue_dir, processes) == 12
+        assert ArrTaskQueue(queue_dir).counts()[DONE] == 12
+
+        csv_file = str(tmp_path / f"arr_results_{processes}.csv")
+        results = collect_queue_results(
+            queue_dir, csv_file, str(tmp_path / "results.sqlite")
+        )
+        csv_files.append(csv_file)
+
+    assert list(results) == sorted(combos, key=arr_grid.grid_order)
+    # Der Mittelwert ueber beide Seeds
+    assert results[("de", 1)][0]["ARR"] == 0.253
+    assert read_rows(csv_files[0]) == read_rows(csv_files[1])
+
+
+def test_failing_tasks_do_not_stop_the_workers(fake_queue, monkeypatch, tmp_path):
+    def evaluate(language_choice, prompt_num, **options):
+        if language_choice == "fr":
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        return fake_evaluate_arr_combo(language_choice, prompt_num, **options)
+
+    monkeypatch.setattr(arr_grid, "evaluate_arr_combo", evaluate)
+
+    queue = ArrTaskQueue(fake_queue)
+    queue.enqueue(arr_grid.arr_combos(["de", "fr"], [1]), [42], OPTIONS)
+
+    assert run_workers(fake_queue, 1) == 1
+    assert queue.counts() == {PENDING: 0, CLAIMED: 0, DONE: 1, FAILED: 1}
+
+    results = collect_queue_results(
+        fake_queue, str(tmp_path / "arr_results.csv"), str(tmp_path / "results.sqlite")
+    )
+    assert list(results) == [("de", 1)]
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,169 @@
+# Standard
+import csv
+import gzip
+
+from collections import Counter, OrderedDict
+
+# Pip
+import numpy as np
+import pytest
+
+# Custom
+from adversaries.burst_attack import content_burst_generator
+from adversaries.burst_attack.burst_sampler import BurstSampler
+from adversaries.burst_attack.burst_tasks import burst_task
+from adversaries.burst_attack.content_burst_generator import (
+    ContentBurstGenerator,
+    build_vocabulary_index,
+    burst_seed_sequence,
+    lookup_vocabulary_index,
+    store_vocabulary_index,
+    vocabulary_key,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+GRAMS = ["Hund", "Katze", "a", "Baum", "Wasserflasche"]
+FREQUENCY = [0.4, 0.2, 0.2, 0.1, 0.1]
+
+
+def test_sampler_is_seed_reproducible():
+    sampler = BurstSampler(GRAMS, FREQUENCY)
+
+    first = sampler.sample(200, 44, np.random.default_rng(42))
+    second = sampler.sample(200, 44, np.random.default_rng(42))
+
+    assert first == second
+
+
+def test_sampler_follows_the_burst_rules():
+    sampler = BurstSampler(GRAMS, FREQUENCY)
+
+    for burst in sampler.sample(500, 44, np.random.default_rng(1)):
+        words = burst.split(" ")
+
+        assert len(burst) >= 44
+        # The burst ends as soon as the target length is reached
+        assert len(" ".join(words[:-1])) < 44 or len(words) == 1
+        # Single character grams may only be the first word
+        assert all(len(word) > 1 for word in words[1:])
+
+
+def test_sampler_streams_chunks():
+    sampler = BurstSampler(GRAMS, FREQUENCY)
+    bursts = list(sampler.iter_bursts(25, 44, np.random.default_rng(3), chunk_size=7))
+
+    assert len(bursts) == 25
+
+
+def test_sampler_needs_words_with_more_than_one_character():
+    with pytest.raises(Cem.ContentBurstVocabularyError):
+        BurstSampler(["a", "b"], [0.5, 0.5])
+
+
+def test_vocabulary_index_is_normalized_once():
+    nouns, frequency = build_vocabulary_index(Counter({"Hund": 3, "Katze": 1}))
+
+    assert list(nouns) == ["Hund", "Katze"]
+    assert frequency.tolist() == [0.75, 0.25]
+    assert BurstSampler(nouns, frequency).sample(3, 20, np.random.default_rng(0))
+
+
+def test_vocabulary_indices_are_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(content_burst_generator, "VOCABULARY_INDEX", OrderedDict())
+    monkeypatch.setattr(content_burst_generator, "VOCABULARY_INDEX_SIZE", 2)
+    vocabulary = build_vocabulary_index(Counter({"Hund": 1}))
+
+    prompt_file = tmp_path / "Prompt1_de.txt"
+    prompt_file.write_text("Der Hund", encoding="utf-8")
+    old_key = vocabulary_key(str(prompt_file), "de")
+    store_vocabulary_index(old_key, vocabulary)
+
+    # Eine geaenderte Datei ersetzt den alten Eintrag
+    prompt_file.write_text("Der Hund bellt", encoding="utf-8")
+    new_key = vocabulary_key(str(prompt_file), "de")
+    store_vocabulary_index(new_key, vocabulary)
+
+    assert lookup_vocabulary_index(old_key) is None
+    assert lookup_vocabulary_index(new_key) is vocabulary
+
+    other_keys = [(f"Prompt{num}_de.txt", "de", 0, 0) for num in (2, 10)]
+    store_vocabulary_index(other_keys[0], vocabulary)
+    lookup_vocabulary_index(new_key)
+    store_vocabulary_index(other_keys[1], vocabulary)
+
+    # Der am laengsten nicht verwendete Eintrag wird verdraengt
+    assert list(content_burst_generator.VOCABULARY_INDEX) == [new_key, other_keys[1]]
+
+
+def test_burst_streams_only_depend_on_the_task():
+    def draws(*key):
+        return np.random.default_rng(burst_seed_sequence(42, *key)).random(5)
+
+    first = draws("en", "results/prompt_txt/Prompt1_en.txt", "orig300")
+    other_dir = draws("en", "/elsewhere/Prompt1_en.txt", "orig300")
+    other_variant = draws("en", "results/prompt_txt/Prompt1_en.txt", "orig")
+
+    assert first.tolist() == other_dir.tolist()
+    assert first.tolist() != other_variant.tolist()
+
+
+def test_burst_task_of_english_variants():
+    assert burst_task("en_orig300", 2) == (
+        "results/prompt_txt/Prompt2_en.txt",
+        "en",
+        "orig300",
+    )
+    assert burst_task("fr", 10) == ("results/prompt_txt/Prompt10_fr.txt", "fr", "")
+
+
+@pytest.fixture
+def burst_generator(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results" / "burst_attack_txt").mkdir(parents=True)
+    monkeypatch.setattr(
+        ContentBurstGenerator,
+        "generate_content_burst",
+        lambda self: (np.asarray(GRAMS, dtype=object), np.asarray(FREQUENCY)),
+    )
+
+    def build(burst_amount):
+        return ContentBurstGenerator("Prompt1_de.txt", "de", burst_amount)
+
+    return build
+
+
+def read_burst_file(path, opener=open):
+    with opener(path, "rt", encoding="utf-8", newline="") as file:
+        return list(csv.reader(file, delimiter="\t"))
+
+
+def test_streamed_bursts_equal_the_saved_bursts(burst_generator):
+    saved = burst_generator(25).generate_bursts()
+    paths = burst_generator(25).stream_bursts(shard_size=10)
+
+    assert [path.rsplit("/", 1)[-1] for path in paths] == [
+        f"Prompt1_de_burst_result.part{shard:04}.tsv" for shard in range(3)
+    ]
+
+    rows = [row for path in paths for row in read_burst_file(path)[1:]]
+    assert [row[4] for row in rows] == saved
+    assert [row[0] for row in rows] == ["10700" + f"{i:03}" for i in range(25)]
+
+
+def test_streamed_bursts_are_compressed(burst_generator):
+    (path,) = burst_generator(5).stream_bursts(compression="gzip")
+
+    assert path.endswith("Prompt1_de_burst_result.tsv.gz")
+    assert len(read_burst_file(path, gzip.open)) == 6
+
+    small_chunks = burst_generator(25).stream_bursts(chunk_size=7, shard_size=10)
+    assert sum(len(read_burst_file(path)) - 1 for path in small_chunks) == 25
+
+    with pytest.raises(Cem.BurstFileCompressionError):
+        burst_generator(5).stream_bursts(compression="zip")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,177 @@
+# Standard
+import os
+
+# Pip
+import pytest
+import spacy
+
+# Custom
+from adversaries.docs_processor import spacy_model_registry
+from adversaries.docs_processor.multilingual_spacy import (
+    MultiLingualSpacy,
+    count_nouns,
+    count_pos_tags,
+    get_excluded_components,
+    iter_token_records,
+    pipe_documents,
+)
+from adversaries.docs_processor.spacy_doc_cache import SPACY_DOC_CACHE, SpacyDocCache
+from adversaries.docs_processor.spacy_model_registry import SPACY_MODEL_REGISTRY
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+@pytest.fixture
+def blank_models(monkeypatch, tmp_path):
+    def load(model_name, **kwargs):
+        return spacy.blank(model_name[:2])
+
+    monkeypatch.setattr(spacy_model_registry.spacy, "load", load)
+    monkeypatch.setattr(SPACY_DOC_CACHE, "cache_dir", str(tmp_path / "doc_cache"))
+    SPACY_MODEL_REGISTRY.clear()
+    yield
+    SPACY_MODEL_REGISTRY.clear()
+
+
+def test_unknown_pipeline_profile():
+    with pytest.raises(Cem.SpacyPipelineProfileError):
+        get_excluded_components("unknown")
+
+
+def test_unknown_language():
+    with pytest.raises(Cem.MultiLingualSpacyError):
+        MultiLingualSpacy("xx", None).load_pipeline()
+
+
+def test_pipe_documents_groups_by_language(blank_models, tmp_path):
+    documents = dict()
+    for name, language, text in [
+        ("Prompt1_de.txt", "de", "Der Hund\n\nbellt"),
+        ("Prompt1_en.txt", "en", "The dog barks"),
+        ("Prompt2_de.txt", "de", "Die Katze schläft"),
+    ]:
+        prompt_file = tmp_path / name
+        prompt_file.write_text(text, encoding="utf-8")
+        documents[name] = language, str(prompt_file)
+
+    docs = dict(pipe_documents(documents, batch_size=2))
+
+    assert sorted(docs) == sorted(documents)
+    assert docs["Prompt1_de.txt"].text == "Der Hund\nbellt"
+    assert docs["Prompt1_en.txt"].lang_ == "en"
+    assert docs["Prompt2_de.txt"].lang_ == "de"
+
+
+def test_unreadable_documents_do_not_stop_the_batch(blank_models, tmp_path):
+    prompt_file = tmp_path / "Prompt2_de.txt"
+    prompt_file.write_text("Die Katze schläft", encoding="utf-8")
+    documents = {
+        "Prompt1_de.txt": ("de", str(tmp_path / "missing.txt")),
+        "Prompt2_de.txt": ("de", str(prompt_file)),
+        "Prompt1_xx.txt": ("xx", str(prompt_file)),
+    }
+
+    with pytest.raises(FileNotFoundError):
+        dict(pipe_documents(documents))
+
+    errors = dict()
+    docs = dict(
+        pipe_documents(
+            documents, on_error=lambda key, error: errors.setdefault(key, error)
+        )
+    )
+
+    assert list(docs) == ["Prompt2_de.txt"]
+    assert isinstance(errors["Prompt1_de.txt"], FileNotFoundError)
+    assert isinstance(errors["Prompt1_xx.txt"], Cem.MultiLingualSpacyError)
+
+
+def tagged_doc():
+    doc = spacy.blank("de")("Hund beißt Hund und Katze")
+    for token, pos in zip(doc, ["NOUN", "VERB", "NOUN", "CCONJ", "NOUN"]):
+        token.pos_ = pos
+    return doc
+
+
+def test_token_records_keep_duplicates():
+    doc = tagged_doc()
+    records = list(iter_token_records(doc))
+
+    assert [text for text, _, _ in records] == [token.text for token in doc]
+    assert [doc.vocab.strings[pos_id] for _, pos_id, _ in records][:3] == [
+        "NOUN",
+        "VERB",
+        "NOUN",
+    ]
+
+
+def test_counts_include_every_occurrence():
+    doc = tagged_doc()
+
+    assert count_nouns(doc) == {"Hund": 2, "Katze": 1}
+    assert list(count_nouns(doc)) == ["Hund", "Katze"]
+    assert count_pos_tags(doc) == {"NOUN": 3, "VERB": 1, "CCONJ": 1}
+    assert MultiLingualSpacy.analyse_doc(doc, return_all_nouns=True) == [
+        "Hund",
+        "Hund",
+        "Katze",
+    ]
+    assert count_nouns(spacy.blank("de")("")) == {}
+
+
+def test_doc_cache_skips_tagging_of_known_texts(tmp_path):
+    nlp = spacy.blank("de")
+    cache = SpacyDocCache(cache_dir=str(tmp_path), enabled=True)
+
+    first = cache.tag(nlp, "Der Hund bellt")
+    cached = cache.load(nlp, cache.cache_key(nlp, "Der Hund bellt"))
+
+    assert cached is not None
+    assert [token.text for token in cached] == [token.text for token in first]
+    assert cache.cache_key(nlp, "Der Hund bellt") != cache.cache_key(
+        spacy.blank("en"), "Der Hund bellt"
+    )
+
+    docs = list(cache.pipe(nlp, ["Der Hund bellt", "Die Katze"], n_process=1))
+    assert [doc.text for doc in docs] == ["Der Hund bellt", "Die Katze"]
+    assert len(list(tmp_path.glob("*.spacy"))) == 2
+
+
+def test_doc_cache_keeps_the_recently_used_documents(tmp_path):
+    nlp = spacy.blank("de")
+    cache = SpacyDocCache(cache_dir=str(tmp_path), enabled=True, max_files=2)
+
+    def cache_file(text):
+        return tmp_path / f"{cache.cache_key(nlp, text)}.spacy"
+
+    for mtime, text in enumerate(["Der Hund", "Die Katze"], start=1):
+        cache.tag(nlp, text)
+        os.utime(cache_file(text), (mtime, mtime))
+
+    # Reading a document marks it as recently used
+    assert cache.load(nlp, cache.cache_key(nlp, "Der Hund")) is not None
+    cache.tag(nlp, "Die Maus")
+
+    assert sorted(tmp_path.glob("*.spacy")) == sorted(
+        [cache_file("Der Hund"), cache_file("Die Maus")]
+    )
+
+    cache.clear()
+    assert list(tmp_path.glob("*.spacy")) == list()
+
+
+def test_only_documents_are_cached(blank_models, tmp_path):
+    prompt_file = tmp_path / "Prompt1_de.txt"
+    prompt_file.write_text("Der Hund bellt", encoding="utf-8")
+    tagger = MultiLingualSpacy("de", str(prompt_file))
+
+    tagger.tag_text("Die Katze")
+    assert not (tmp_path / "doc_cache").exists()
+
+    tagger.tag_text(process_document=True)
+    assert len(list((tmp_path / "doc_cache").glob("*.spacy"))) == 1
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,116 @@
+# Standard
+import csv
+import sqlite3
+
+# Pip
+import pytest
+
+# Custom
+from adversaries.attacker_evaluator.arr_score_processor import process_scored_sentences
+from adversaries.attacker_evaluator.results_store import ResultsStore
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+def arr_result(language_choice, prompt_num, arr):
+    return {
+        "METHOD": "CONTENT_BURST",
+        "PROMPT": f"ASAP_{language_choice}_prompt{prompt_num}",
+        "PROMPT_NUMBER": prompt_num,
+        "LANGUAGE": language_choice[:2],
+        "ARR": arr,
+    }
+
+
+@pytest.fixture
+def results_store(tmp_path):
+    with ResultsStore(str(tmp_path / "results.sqlite")) as store:
+        yield store
+
+
+def test_the_latest_evaluation_of_every_combination_is_exported(
+    results_store, tmp_path
+):
+    with pytest.raises(Cem.ResultsStoreEmptyError):
+        results_store.multi_arr_results()
+
+    first_run = results_store.start_run("multiple", {"classifier": "svc"})
+    for combo, arr in ((("de", 10), 0.9), (("en", 1), 0.8), (("de", 1), 0.7)):
+        results_store.record_combo(first_run, combo, (arr_result(*combo, arr), 0.5))
+
+    second_run = results_store.start_run("single")
+    results_store.record_combo(second_run, ("de", 1), (arr_result("de", 1, 0.75), 0.6))
+
+    latest = results_store.multi_arr_results()
+    assert list(latest) == [("en", 1), ("de", 1), ("de", 10)]
+    assert latest[("de", 1)] == (arr_result("de", 1, 0.75), 0.6)
+    assert list(results_store.multi_arr_results(second_run)) == [("de", 1)]
+
+    file_standard, _ = results_store.export_multi_arr_results(
+        str(tmp_path / "content_bursts_arr_results.csv"), first_run
+    )
+    with open(file_standard, newline="") as standard:
+        assert list(csv.reader(standard)) == [
+            ["EVALUATION METRIC", "en_prompt1", "de_prompt1", "de_prompt10"],
+            ["ARR", "0.8", "0.7", "0.9"],
+            ["QWK", "0.5", "0.5", "0.5"],
+        ]
+
+
+def test_seeds_are_averaged(results_store):
+    run_id = results_store.start_run("collect")
+
+    for seed, arr, qwk in ((42, 0.7, 0.5), (43, 0.8, 0.6)):
+        results_store.record_combo(
+            run_id, ("fr", 2), (arr_result("fr", 2, arr), qwk), seed=seed
+        )
+
+    arr_data_results, qwk = results_store.multi_arr_results(run_id)[("fr", 2)]
+    assert arr_data_results["ARR"] == 0.75
+    assert qwk == pytest.approx(0.55)
+
+
+def test_scored_sentences_are_stored_in_batches(results_store, tmp_path):
+    scores_file = tmp_path / "ARR_de_prompt1.tsv"
+    scores_file.write_text("Haus Garten\t0\nDas Auto\t2\nEnde.\t0\nBaum\t0\n")
+
+    run_id = results_store.start_run("multiple")
+    results_store.record_combo(
+        run_id,
+        ("de", 1),
+        (arr_result("de", 1, 0.75), 0.5),
+        scores_file=str(scores_file),
+        batch_size=3,
+    )
+
+    scored_sentences = results_store.sentence_scores()
+    assert scored_sentences == {
+        str(scores_file): [
+            ("Haus Garten", 0),
+            ("Das Auto", 2),
+            ("Ende.", 0),
+            ("Baum", 0),
+        ]
+    }
+
+    prompt_results, count_results = process_scored_sentences(scored_sentences)
+    assert prompt_results[str(scores_file)]["0"] == ["Haus Garten", "Baum"]
+    assert len(count_results[str(scores_file)]["0"]) == 3
+
+
+def test_results_cannot_be_changed(results_store):
+    run_id = results_store.start_run("multiple")
+    results_store.record_combo(run_id, ("en", 1), (arr_result("en", 1, 0.8), 0.5))
+
+    with pytest.raises(sqlite3.DatabaseError):
+        with results_store.connection:
+            results_store.connection.execute("UPDATE metrics SET value = 1")
+
+    with pytest.raises(sqlite3.DatabaseError):
+        with results_store.connection:
+            results_store.connection.execute("DELETE FROM runs")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,347 @@
+# Standard
+# None
+
+# Pip
+import numpy as np
+import pandas as pd
+import pytest
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator.scoring_benchmark import benchmark_scoring_models
+from adversaries.attacker_evaluator.scoring_model_store import (
+    SCORING_MODEL_STORE,
+    ScoringModelStore,
+)
+from adversaries.settings.messages.custom_error_messages import (
+    CustomErrorMessages as Cem,
+)
+
+
+@pytest.fixture
+def model_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(SCORING_MODEL_STORE, "model_dir", str(tmp_path / "models"))
+    monkeypatch.setattr(SCORING_MODEL_STORE, "enabled", True)
+    return SCORING_MODEL_STORE
+
+
+def test_model_key_depends_on_data_and_hyperparameters(training_file, tmp_path):
+    model = sf.construct_svm_scoring_model()
+    key = ScoringModelStore.cache_key(model, training_file)
+
+    assert key == ScoringModelStore.cache_key(
+        sf.construct_svm_scoring_model(), training_file
+    )
+
+    model.set_params(clf__C=2.0)
+    assert key != ScoringModelStore.cache_key(model, training_file)
+
+    other_file = tmp_path / "other.tsv"
+    other_file.write_text(open(training_file, encoding="utf-8").read() + "\n")
+    assert key != ScoringModelStore.cache_key(
+        sf.construct_svm_scoring_model(), str(other_file)
+    )
+
+
+def test_fitted_model_is_loaded_from_the_store(
+    training_file, training_answers, model_store
+):
+    fitted = sf.fit_scoring_model(sf.construct_svm_scoring_model(), training_file)
+    loaded = sf.fit_scoring_model(sf.construct_svm_scoring_model(), training_file)
+
+    assert loaded is not fitted
+    assert (
+        loaded.predict(training_answers).tolist()
+        == fitted.predict(training_answers).tolist()
+    )
+
+
+def test_parallel_folds_equal_serial_folds(training_file):
+    serial = sf.cross_validation_folds(
+        sf.construct_svm_scoring_model(), training_file, n_jobs=1
+    )
+    parallel = sf.cross_validation_folds(
+        sf.construct_svm_scoring_model(), training_file, n_jobs=2
+    )
+
+    # Folds with a single predicted score have an undefined QWK (nan)
+    np.testing.assert_array_equal(parallel["FOLD_QWK"], serial["FOLD_QWK"])
+    assert len(parallel["FIT_TIME"]) == len(parallel["PREDICT_TIME"]) == 10
+    np.testing.assert_equal(serial["QWK"], np.mean(serial["FOLD_QWK"]))
+
+
+def test_evaluation_reads_the_training_file_once(
+    training_file, model_store, monkeypatch, tmp_path
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results" / "arr_sentences_results").mkdir(parents=True)
+
+    calls = list()
+    load_training_data = sf.load_training_data
+
+    def counting_load(file):
+        calls.append(file)
+        return load_training_data(file)
+
+    monkeypatch.setattr(sf, "load_training_data", counting_load)
+
+    evaluation = sf.evaluate_scoring_model(
+        training_file,
+        adversarials=["Essig Wasser Essig", "Behälter Proben"],
+        memory=str(tmp_path / "pipeline_cache"),
+    )
+
+    assert len(calls) == 1
+    assert len(evaluation["FOLD_QWK"]) == 10
+    assert len(evaluation["Y_PRED"]) == 2
+    assert 0 <= evaluation["ARR"] <= 1
+
+
+def test_hashing_features_are_stateless_and_chunkable(training_answers):
+    char_hashing, _ = sf.construct_ngram_vectorizers(sf.HASHING_FEATURES, 2**10)
+    answers = training_answers
+
+    whole = char_hashing.transform(answers)
+    chunked = sf.transform_in_chunks(char_hashing, answers, chunk_size=5, n_jobs=2)
+
+    assert whole.shape == (len(answers), 2**10)
+    assert (whole != chunked).nnz == 0
+
+    with pytest.raises(Cem.FeatureModeError):
+        sf.construct_ngram_vectorizers("tfidf")
+
+
+def test_benchmark_compares_feature_modes(training_file):
+    results = benchmark_scoring_models(
+        training_file,
+        ["Essig Wasser Essig", "Behälter Proben"],
+        {mode: {"feature_mode": mode} for mode in sf.FEATURE_MODES},
+        n_jobs=1,
+    )
+
+    assert [result["MODEL"] for result in results] == list(sf.FEATURE_MODES)
+    assert results[0]["AGREEMENT"] == 1.0
+
+
+@pytest.mark.parametrize("classifier", sf.CLASSIFIERS)
+def test_every_classifier_can_be_fitted(training_file, classifier):
+    model = sf.construct_svm_scoring_model(
+        feature_mode=sf.HASHING_FEATURES, n_features=2**10, classifier=classifier
+    )
+    if classifier == sf.NYSTROEM_CLASSIFIER:
+        model.set_params(clf__kernel__n_components=10)
+
+    fitted = sf.fit_scoring_model(model, training_file, use_model_store=False)
+
+    assert len(fitted.predict(["Essig Wasser"])) == 1
+
+
+def test_partial_fit_needs_hashing_features_and_sgd(training_file):
+    training_data = sf.load_training_data(training_file)
+    model = sf.construct_svm_scoring_model(
+        feature_mode=sf.HASHING_FEATURES, n_features=2**10, classifier=sf.SGD_CLASSIFIER
+    )
+
+    fitted = sf.partial_fit_scoring_model(model, training_data, chunk_size=5)
+    assert len(fitted.predict(["Essig Wasser"])) == 1
+
+    # Die Merkmale mehrerer Chunks parallel zu berechnen aendert das Modell nicht
+    parallel = sf.partial_fit_scoring_model(
+        sf.construct_svm_scoring_model(
+            feature_mode=sf.HASHING_FEATURES,
+            n_features=2**10,
+            classifier=sf.SGD_CLASSIFIER,
+        ),
+        training_data,
+        chunk_size=5,
+        n_jobs=2,
+    )
+    assert np.array_equal(parallel["clf"].coef_, fitted["clf"].coef_)
+
+    with pytest.raises(Cem.PartialFitError):
+        sf.partial_fit_scoring_model(
+            sf.construct_svm_scoring_model(feature_mode=sf.COUNT_FEATURES),
+            training_data,
+        )
+
+    with pytest.raises(Cem.ClassifierError):
+        sf.construct_classifier("random_forest")
+
+
+def test_partial_fit_scales_lengths_with_all_answers():
+    # Der erste Chunk enthaelt nur kurze Antworten
+    answers = ["Essig", "Wasser", "Essig Wasser " * 20, "Behälter Proben " * 40]
+    model = sf.construct_svm_scoring_model(
+        feature_mode=sf.HASHING_FEATURES, n_features=2**10, classifier=sf.SGD_CLASSIFIER
+    )
+
+    fitted = sf.partial_fit_scoring_model(
+        model, (pd.Series(answers), pd.Series([0, 0, 1, 2])), chunk_size=2
+    )
+    lengths = fitted["features"].get_params()["answer_length"].transform(answers)
+
+    assert lengths.min() == 0.0
+    assert lengths.max() == 1.0
+
+
+def test_partial_fit_models_are_cross_validated_and_stored(
+    training_file, training_answers, model_store
+):
+    model = sf.construct_svm_scoring_model(
+        feature_mode=sf.HASHING_FEATURES,
+        n_features=2**10,
+        classifier=sf.SGD_CLASSIFIER,
+        partial_fit=True,
+    )
+    model.set_params(chunk_size=5)
+
+    assert isinstance(model, sf.ChunkedFitPipeline)
+    assert len(sf.cross_validation_folds(model, training_file)["FOLD_QWK"]) == 10
+
+    fitted = sf.fit_scoring_model(model, training_file)
+    loaded = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(
+            feature_mode=sf.HASHING_FEATURES,
+            n_features=2**10,
+            classifier=sf.SGD_CLASSIFIER,
+            partial_fit=True,
+        ).set_params(chunk_size=5),
+        training_file,
+    )
+    assert loaded is not fitted
+    assert (
+        loaded.predict(training_answers).tolist()
+        == fitted.predict(training_answers).tolist()
+    )
+
+    with pytest.raises(Cem.PartialFitError):
+        sf.construct_svm_scoring_model(
+            feature_mode=sf.COUNT_FEATURES,
+            classifier=sf.SGD_CLASSIFIER,
+            partial_fit=True,
+        )
+
+
+def test_chunked_scoring_streams_burst_files(training_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results" / "arr_sentences_results").mkdir(parents=True)
+
+    burst_files = list()
+    for shard in range(2):
+        burst_file = tmp_path / f"Prompt1_de_burst_result.part{shard:04}.tsv"
+        rows = ["id\tEssaySet\teassay_score\tessay_score\tEssayText"] + [
+            f"10700{index:03}\tPrompt1_de.txt\t0\t0\tEssig Wasser {index}"
+            for index in range(7)
+        ]
+        burst_file.write_text("\n".join(rows), encoding="utf-8")
+        burst_files.append(str(burst_file))
+
+    chunks = list(sf.iter_adversarial_chunks(burst_files, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1, 3, 3, 1]
+
+    model = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(), training_file, use_model_store=False
+    )
+    score_counts, arr = sf.score_adversarials_in_chunks(
+        model, training_file, chunks, n_jobs=2
+    )
+
+    assert sum(score_counts.values()) == 14
+    assert arr == score_counts.get(0, 0) / 14
+    scored = (tmp_path / "results/arr_sentences_results/ARR_de_prompt1.tsv").read_text(
+        encoding="utf-8"
+    )
+    assert scored.splitlines()[0].startswith("Essig Wasser 0\t")
+
+
+def test_answer_length_is_scaled_with_the_training_range():
+    scaler = sf.AnswerLengthScaler().fit(["ab", "abcdef"])
+
+    assert scaler.transform(["abcd"]).tolist() == [[0.5]]
+    assert scaler.transform(["abcd", "abcdefghij"]).tolist() == [[0.5], [2.0]]
+
+
+def test_predictions_do_not_depend_on_the_batch(training_file):
+    model = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(), training_file, use_model_store=False
+    )
+    adversarials = [f"Essig {'Wasser ' * index}" for index in range(12)]
+
+    whole = model.predict(adversarials).tolist()
+    chunked = [
+        score
+        for _, y_pred in sf.predict_in_chunks(
+            model, [adversarials[:5], adversarials[5:6], adversarials[6:]], n_jobs=1
+        )
+        for score in y_pred.tolist()
+    ]
+
+    assert chunked == whole
+
+
+def test_arr_confidence_intervals():
+    wilson = sf.arr_confidence_interval(95, 100, 0.95, sf.WILSON_INTERVAL)
+    exact = sf.arr_confidence_interval(95, 100, 0.95, sf.CLOPPER_PEARSON_INTERVAL)
+
+    assert wilson == pytest.approx((0.8883, 0.9785), abs=1e-4)
+    assert exact == pytest.approx((0.8872, 0.9836), abs=1e-4)
+    assert sf.arr_confidence_interval(100, 100, 0.95, "clopper_pearson")[1] == 1.0
+
+    with pytest.raises(Cem.IntervalMethodError):
+        sf.arr_confidence_interval(1, 2, 0.95, "normal")
+
+
+def test_sequential_estimation_stops_at_the_target_width():
+    class RejectingModel:
+        def predict(self, texts):
+            return np.zeros(len(texts), dtype=int)
+
+    consumed = list()
+
+    def chunks():
+        for index in range(100):
+            consumed.append(index)
+            yield ["Essig"] * 50
+
+    estimate = sf.estimate_arr_in_chunks(
+        RejectingModel(),
+        "ASAP_de_prompt1.tsv",
+        chunks(),
+        target_width=0.05,
+        min_adversarials=100,
+        n_jobs=1,
+        save_scores=False,
+    )
+
+    assert estimate["STOPPED_EARLY"]
+    assert estimate["ARR"] == 1.0
+    assert estimate["ADVERSARIALS"] == 100
+    assert estimate["HIGH"] - estimate["LOW"] < 0.05
+    assert len(consumed) == 2
+
+
+def test_early_stopped_estimates_do_not_replace_the_sentence_file(
+    training_file, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    sentences_file = tmp_path / sf.arr_sentences_file("ASAP_de_prompt1.tsv")
+    sentences_file.parent.mkdir(parents=True)
+    sentences_file.write_text("Essig\t0\n", encoding="utf-8")
+
+    model = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(), training_file, use_model_store=False
+    )
+    sf.estimate_arr_in_chunks(
+        model, "ASAP_de_prompt1.tsv", [["Essig Wasser"] * 3], target_width=1.0, n_jobs=1
+    )
+
+    assert sentences_file.read_text(encoding="utf-8") == "Essig\t0\n"
+    chunked_file = tmp_path / sf.arr_sentences_file("ASAP_de_prompt1.tsv", chunked=True)
+    assert len(chunked_file.read_text(encoding="utf-8").splitlines()) == 3
+    assert sf.arr_sentences_file("ASAP_de_prompt1.tsv", 7, chunked=True).endswith(
+        "arr_sentences_results/chunked/seed7/ARR_de_prompt1.tsv"
+    )
+
+
+if __name__ == "__main__":
+    pass
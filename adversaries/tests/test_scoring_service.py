@@ -0,0 +1,154 @@
+# Standard
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Pip
+import pytest
+
+# Custom
+from adversaries.attacker_evaluator import scoring_functions as sf
+from adversaries.attacker_evaluator import scoring_service
+from adversaries.attacker_evaluator.scoring_service import (
+    PredictionBatcher,
+    ScoringService,
+    create_scoring_server,
+    load_scoring_service,
+)
+from adversaries.attacker_evaluator.scoring_model_store import SCORING_MODEL_STORE
+
+
+@pytest.fixture
+def scoring_server(training_file):
+    model = sf.fit_scoring_model(
+        sf.construct_svm_scoring_model(), training_file, use_model_store=False
+    )
+    server = create_scoring_server(ScoringService({("de", "1"): model}), "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield model, f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode("utf-8"), method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_concurrent_requests_get_their_own_scores(scoring_server, training_answers):
+    model, url = scoring_server
+    requests = [training_answers[index : index + 3] for index in range(6)]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        responses = list(
+            executor.map(
+                lambda texts: post(
+                    f"{url}/score", {"language": "de", "prompt": 1, "texts": texts}
+                ),
+                requests,
+            )
+        )
+
+    for texts, response in zip(requests, responses):
+        assert response["scores"] == model.predict(texts).tolist()
+        assert response["latency_ms"] >= 0
+
+
+def test_unknown_model_is_a_bad_request(scoring_server):
+    _, url = scoring_server
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(f"{url}/score", {"language": "fr", "prompt": 1, "texts": ["a"]})
+
+    assert error.value.code == 400
+
+
+def test_batcher_passes_prediction_errors_on():
+    class BrokenModel:
+        def predict(self, texts):
+            raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        PredictionBatcher(BrokenModel()).predict(["a"])
+
+
+def test_malformed_requests_are_bad_requests(scoring_server):
+    _, url = scoring_server
+    malformed = [
+        ("score", b"{not json"),
+        ("score", ["de", 1]),
+        ("score", {"language": "de", "prompt": 1, "texts": "Essig"}),
+        ("score", {"language": "de", "prompt": 1, "texts": [1, 2]}),
+        ("bursts", {"language": "de", "prompt": 1, "amount": "viele"}),
+    ]
+
+    for path, body in malformed:
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        request = urllib.request.Request(f"{url}/{path}", data=data, method="POST")
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+
+        assert error.value.code == 400
+
+
+def test_burst_requests_are_capped(scoring_server):
+    _, url = scoring_server
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(f"{url}/bursts", {"language": "de", "prompt": 1, "amount": 10**9})
+
+    assert error.value.code == 400
+
+
+def test_burst_generators_do_not_block_each_other():
+    release = threading.Event()
+
+    class FakeGenerator:
+        def __init__(self, blocking):
+            self.blocking = blocking
+            self.burst_amount = 0
+
+        def generate_bursts(self):
+            if self.blocking:
+                release.wait(timeout=10)
+            return ["Essig Wasser"] * self.burst_amount
+
+    service = ScoringService(dict(), max_bursts=5)
+    service.generators[("de", "1")] = FakeGenerator(blocking=True)
+    service.generators[("fr", "1")] = FakeGenerator(blocking=False)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        blocked = executor.submit(service.generate_bursts, "de", 1, 2)
+        # Die andere Sprache wartet nicht auf den blockierten Generator
+        assert service.generate_bursts("fr", 1, 3) == {"bursts": ["Essig Wasser"] * 3}
+        assert not blocked.done()
+
+        release.set()
+        assert blocked.result(timeout=10) == {"bursts": ["Essig Wasser"] * 2}
+
+
+def test_the_service_uses_the_configured_model(training_file, monkeypatch):
+    monkeypatch.setattr(SCORING_MODEL_STORE, "enabled", False)
+    monkeypatch.setattr(
+        scoring_service, "arr_training_file", lambda language, prompt: training_file
+    )
+
+    service = load_scoring_service(
+        [("de", "1")], feature_mode=sf.HASHING_FEATURES, classifier=sf.SGD_CLASSIFIER
+    )
+    model = service.batchers[("de", "1")].model
+
+    assert isinstance(model["clf"], sf.SGDClassifier)
+    assert isinstance(model["features"].get_params()["char"], sf.HashingVectorizer)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,66 @@
+# Standard
+import threading
+
+# Pip
+import spacy
+
+# Custom
+from adversaries.docs_processor import spacy_model_registry
+from adversaries.docs_processor.spacy_model_registry import SpacyModelRegistry
+
+
+def blank_loader(calls):
+    def load(model_name, **kwargs):
+        calls.append(model_name)
+        return spacy.blank(model_name[:2])
+
+    return load
+
+
+def test_registry_loads_each_model_once(monkeypatch):
+    calls = list()
+    monkeypatch.setattr(spacy_model_registry.spacy, "load", blank_loader(calls))
+    registry = SpacyModelRegistry(max_models=4)
+
+    threads = [
+        threading.Thread(target=registry.get, args=("de_core_news_sm",))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.get("de_core_news_sm") is registry.get("de_core_news_sm")
+    assert calls == ["de_core_news_sm"]
+
+
+def test_registry_evicts_least_recently_used(monkeypatch):
+    calls = list()
+    monkeypatch.setattr(spacy_model_registry.spacy, "load", blank_loader(calls))
+    registry = SpacyModelRegistry(max_models=2)
+
+    registry.warm_up(["de_core_news_sm", "en_core_web_sm"])
+    registry.get("de_core_news_sm")
+    registry.get("fr_core_news_sm")
+
+    assert "de_core_news_sm" in registry
+    assert "en_core_web_sm" not in registry
+    assert len(registry) == 2
+
+
+def test_registry_keys_pipelines_by_excluded_components(monkeypatch):
+    calls = list()
+    monkeypatch.setattr(spacy_model_registry.spacy, "load", blank_loader(calls))
+    registry = SpacyModelRegistry(max_models=4)
+
+    full = registry.get("en_core_web_sm")
+    pos_only = registry.get("en_core_web_sm", exclude=("parser", "ner"))
+
+    assert full is not pos_only
+    assert pos_only is registry.get("en_core_web_sm", exclude=("ner", "parser"))
+    assert calls == ["en_core_web_sm", "en_core_web_sm"]
+
+
+if __name__ == "__main__":
+    pass
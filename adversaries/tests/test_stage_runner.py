@@ -0,0 +1,121 @@
+# Standard
+from functools import partial
+
+# Pip
+import pytest
+
+# Custom
+from adversaries.pipeline.stage_runner import (
+    STAGE_RUN,
+    STAGE_SKIPPED,
+    Stage,
+    StageManifest,
+    run_stages,
+)
+
+
+def upper_case(source, target):
+    with open(source, encoding="utf-8") as file:
+        text = file.read()
+    with open(target, mode="w", encoding="utf-8") as file:
+        file.write(text.upper())
+
+
+def join_files(sources, target):
+    texts = list()
+    for source in sources:
+        with open(source, encoding="utf-8") as file:
+            texts.append(file.read())
+    with open(target, mode="w", encoding="utf-8") as file:
+        file.write("\n".join(texts))
+
+
+@pytest.fixture
+def language_pipeline(tmp_path):
+    for language in ("de", "fr"):
+        (tmp_path / f"prompt_{language}.txt").write_text(f"prompt {language}")
+
+    def build():
+        stages = [
+            Stage(
+                name=f"upper_{language}",
+                run=partial(
+                    upper_case,
+                    str(tmp_path / f"prompt_{language}.txt"),
+                    str(tmp_path / f"upper_{language}.txt"),
+                ),
+                inputs=[str(tmp_path / f"prompt_{language}.txt")],
+                outputs=[str(tmp_path / f"upper_{language}.txt")],
+            )
+            for language in ("de", "fr")
+        ]
+        upper_files = [stage.outputs[0] for stage in stages]
+        stages.append(
+            Stage(
+                name="join",
+                run=partial(join_files, upper_files, str(tmp_path / "joined.txt")),
+                inputs=upper_files,
+                outputs=[str(tmp_path / "joined.txt")],
+                depends_on=[stage.name for stage in stages],
+            )
+        )
+        return stages
+
+    def run(workers=1):
+        manifest = StageManifest(str(tmp_path / "manifest.json"))
+        return run_stages(build(), manifest, workers=workers)
+
+    return tmp_path, run
+
+
+def test_unchanged_stages_are_skipped(language_pipeline):
+    tmp_path, run = language_pipeline
+
+    assert set(run().values()) == {STAGE_RUN}
+    assert set(run().values()) == {STAGE_SKIPPED}
+
+    (tmp_path / "prompt_fr.txt").write_text("neuer prompt fr")
+    assert run() == {
+        "upper_de": STAGE_SKIPPED,
+        "upper_fr": STAGE_RUN,
+        "join": STAGE_RUN,
+    }
+    assert (tmp_path / "joined.txt").read_text() == "PROMPT DE\nNEUER PROMPT FR"
+
+
+def test_same_outputs_do_not_invalidate_later_stages(language_pipeline):
+    tmp_path, run = language_pipeline
+    run()
+
+    # Andere Eingabe, aber die gleiche Ausgabe
+    (tmp_path / "prompt_de.txt").write_text("PROMPT de")
+    assert run() == {
+        "upper_de": STAGE_RUN,
+        "upper_fr": STAGE_SKIPPED,
+        "join": STAGE_SKIPPED,
+    }
+
+    (tmp_path / "joined.txt").unlink()
+    assert run()["join"] == STAGE_RUN
+
+
+def test_stages_run_in_worker_processes(language_pipeline):
+    tmp_path, run = language_pipeline
+
+    assert set(run(workers=2).values()) == {STAGE_RUN}
+    assert (tmp_path / "joined.txt").read_text() == "PROMPT DE\nPROMPT FR"
+    assert set(run(workers=2).values()) == {STAGE_SKIPPED}
+
+
+def test_cyclic_stages_are_rejected(tmp_path):
+    stages = [
+        Stage(name="a", run=print, depends_on=["b"]),
+        Stage(name="b", run=print, depends_on=["a"]),
+    ]
+
+    with pytest.raises(ValueError):
+        run_stages(stages, StageManifest(str(tmp_path / "manifest.json")))
+
+
+if __name__ == "__main__":
+    pass
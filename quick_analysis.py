@@ -5,15 +5,28 @@
 # None
 
 # Custom
-from adversaries.docs_processor.app_docs_processor import extract_text_from_all_prompts
-from adversaries.attacker_evaluator.app_attacker_evaluator import (
-    generate_multi_arr,
-    generate_excerpts,
+from adversaries.pipeline.analysis_pipeline import run_analysis_pipeline
+from adversaries.settings.constants.constant_vars import (
+    CLASSIFIER,
+    CV_WORKERS,
+    FEATURE_MODE,
+    GRID_LANGUAGES,
+    GRID_PROMPTS,
+    GRID_WORKERS,
+    PARTIAL_FIT,
 )
 
-extract_text_from_all_prompts()  # Create text files from the .docx prompt
-generate_multi_arr()  # generate the adversarials and score them
-generate_excerpts()  # Generate excerpts from the content burst files
+# Extract the prompt texts, generate and score the adversarials and generate the
+# excerpts. Stages whose inputs did not change since the last run are skipped.
+run_analysis_pipeline(
+    cv_workers=CV_WORKERS,
+    feature_mode=FEATURE_MODE,
+    classifier=CLASSIFIER,
+    partial_fit=PARTIAL_FIT,
+    workers=GRID_WORKERS,
+    languages=GRID_LANGUAGES,
+    prompts=GRID_PROMPTS,
+)
 
 if __name__ == "__main__":
     pass